@@ -0,0 +1,98 @@
+"""Benchmark: single-flight obnova a společný rate limit proti lokálnímu falešnému FPL API
+
+Spuštění z kořene repozitáře:
+    python benchmarks/bench_fetch.py --threads 32 --rate 100
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_fake_api(bootstrap, latency):
+    """Falešné FPL API na volném portu; vrací (server, počty požadavků podle cesty)"""
+    hits = {}
+    lock = threading.Lock()
+    bodies = {'/bootstrap-static/': json.dumps(bootstrap).encode(), '/fixtures/': b'[]'}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                hits[self.path] = hits.get(self.path, 0) + 1
+            time.sleep(latency)
+            body = bodies.get(self.path, b'{"history": [], "history_past": []}')
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, hits
+
+
+def run_threads(n, target):
+    barrier = threading.Barrier(n)
+
+    def worker():
+        barrier.wait()
+        target()
+
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=32, help="souběžných session")
+    parser.add_argument('--rate', type=float, default=100.0, help="limit požadavků za sekundu")
+    parser.add_argument('--latency', type=float, default=0.1, help="odezva falešného API v sekundách")
+    args = parser.parse_args()
+
+    # Limit procesu se čte při importu modulu fetch
+    os.environ['FPL_REQUESTS_PER_SECOND'] = str(args.rate)
+    from bench_players import synthetic_bootstrap
+    from fpl_predictor.fetch import BackgroundRefresher, fetch_element_summaries
+    from fpl_predictor.snapshots import SnapshotStore, KIND_BOOTSTRAP
+
+    server, hits = start_fake_api(synthetic_bootstrap(1), args.latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    with tempfile.TemporaryDirectory() as root:
+        refresher = BackgroundRefresher(SnapshotStore(root), base_url=base_url)
+        # Studený start - všechny session chtějí data najednou a žádná ještě nejsou
+        elapsed = run_threads(args.threads, lambda: refresher.get(KIND_BOOTSTRAP))
+        print(f"{args.threads} session při studeném startu: {hits.get('/bootstrap-static/', 0)} požadavek "
+              f"na bootstrap-static, {elapsed:.2f} s")
+
+        hits.clear()
+        elapsed = run_threads(args.threads, lambda: refresher.refresh(KIND_BOOTSTRAP))
+        print(f"{args.threads} souběžných obnov: {hits.get('/bootstrap-static/', 0)} požadavek, {elapsed:.2f} s")
+
+    # Dvě nezávislá hromadná stahování se dělí o jeden limit procesu
+    hits.clear()
+    n_ids = int(args.rate)
+    elapsed = run_threads(2, lambda: fetch_element_summaries(range(n_ids), base_url=base_url))
+    total = sum(hits.values())
+    print(f"2x {n_ids} element-summary souběžně: {total} požadavků za {elapsed:.2f} s = "
+          f"{total / elapsed:.0f} req/s (limit {args.rate:.0f}/s, burst {int(args.rate)})")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""Benchmark: sloupcové zpracování hráčů vs. původní smyčka přes řádky
+
+Spuštění z kořene repozitáře:
+    python benchmarks/bench_players.py --scale 50
+
+Syntetický bootstrap má 700 hráčů násobených parametrem --scale.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fpl_predictor.players import process_players_data  # noqa: E402
+
+
+def legacy_process_players_data(fpl_data):
+    """Původní implementace (smyčka přes hráče, list slovníků) pro srovnání"""
+    if not fpl_data:
+        return pd.DataFrame()
+
+    players = []
+    teams = {team['id']: team['name'] for team in fpl_data['teams']}
+    positions = {pos['id']: pos['singular_name'] for pos in fpl_data['element_types']}
+
+    for player in fpl_data['elements']:
+        form_score = float(player['form']) if player['form'] else 0
+        price_factor = (player['now_cost'] / 10.0) / 15.0
+        predicted_points = form_score + (price_factor * 3)
+
+        players.append({
+            'id': player['id'],
+            'name': f"{player['first_name']} {player['second_name']}",
+            'web_name': player['web_name'],
+            'team': teams.get(player['team'], 'Unknown'),
+            'team_code': player['team_code'],
+            'position': positions.get(player['element_type'], 'Unknown'),
+            'price': player['now_cost'] / 10.0,
+            'form': form_score,
+            'selected_by_percent': float(player['selected_by_percent']),
+            'predicted_points': predicted_points,
+            'minutes': player['minutes'],
+            'news': player['news'] if player['news'] else '',
+            'chance_of_playing_this_round': player['chance_of_playing_this_round'],
+            'chance_of_playing_next_round': player['chance_of_playing_next_round'],
+            'transfers_in': player['transfers_in'],
+            'transfers_out': player['transfers_out'],
+            'status': player['status'],
+            'goals_scored': player['goals_scored'],
+            'assists': player['assists'],
+            'clean_sheets': player['clean_sheets'],
+            'bonus': player['bonus'],
+            'total_points': player['total_points']
+        })
+
+    return pd.DataFrame(players)
+
+
+def synthetic_bootstrap(n_players, seed=0):
+    """Bootstrap-static se stejnou strukturou jako FPL API, ale vymyšlenými hráči"""
+    rng = random.Random(seed)
+    teams = [{'id': i, 'name': f"Team {i}", 'code': 100 + i} for i in range(1, 21)]
+    element_types = [
+        {'id': 1, 'singular_name': 'Goalkeeper'},
+        {'id': 2, 'singular_name': 'Defender'},
+        {'id': 3, 'singular_name': 'Midfielder'},
+        {'id': 4, 'singular_name': 'Forward'}
+    ]
+
+    elements = []
+    for pid in range(1, n_players + 1):
+        team = rng.randint(1, 20)
+        status = rng.choice('aaaaaaaadis')
+        chance = None if status == 'a' else rng.choice([0, 25, 50, 75])
+        elements.append({
+            'id': pid,
+            'first_name': f"First{pid}",
+            'second_name': f"Second{pid}",
+            'web_name': f"Player{pid}",
+            'team': team,
+            'team_code': 100 + team,
+            'element_type': rng.randint(1, 4),
+            'now_cost': rng.randint(40, 150),
+            'form': f"{rng.random() * 8:.1f}" if rng.random() > 0.1 else '',
+            'selected_by_percent': f"{rng.random() * 50:.1f}",
+            'minutes': rng.randint(0, 3420),
+            'news': '' if status == 'a' else 'Knock - 75% chance of playing',
+            'chance_of_playing_this_round': chance,
+            'chance_of_playing_next_round': chance,
+            'transfers_in': rng.randint(0, 3_000_000),
+            'transfers_out': rng.randint(0, 3_000_000),
+            'status': status,
+            'goals_scored': rng.randint(0, 30),
+            'assists': rng.randint(0, 20),
+            'clean_sheets': rng.randint(0, 20),
+            'bonus': rng.randint(0, 40),
+            'total_points': rng.randint(0, 300)
+        })
+    return {'teams': teams, 'element_types': element_types, 'elements': elements}
+
+
+def best_time(fn, arg, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(arg)
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=int, default=50, help="násobek 700 hráčů")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    fpl_data = synthetic_bootstrap(700 * args.scale)
+    print(f"Hráčů: {len(fpl_data['elements']):,}")
+
+    results = []
+    for label, fn in [('původní smyčka', legacy_process_players_data), ('sloupcově', process_players_data)]:
+        seconds = best_time(fn, fpl_data, args.repeat)
+        memory = fn(fpl_data).memory_usage(deep=True).sum()
+        results.append((label, seconds, memory))
+        print(f"{label:>15}: {seconds * 1000:8.1f} ms  {memory / 2**20:7.2f} MiB")
+
+    (_, legacy_s, legacy_mem), (_, new_s, new_mem) = results
+    print(f"Zrychlení: {legacy_s / new_s:.1f}x, paměť: {new_mem / legacy_mem:.0%} původní")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark: vyhledávací index hráčů vs. str.contains přes celý DataFrame
+
+Spuštění z kořene repozitáře:
+    python benchmarks/bench_search.py --scale 1
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_players import synthetic_bootstrap  # noqa: E402
+from fpl_predictor.players import process_players_data  # noqa: E402
+from fpl_predictor.search import PlayerSearchIndex  # noqa: E402
+
+QUERIES = ['Pla', 'Player12', 'player 7', 'Secnd1', 'First33 Second33']
+
+
+def per_call_ms(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=int, default=1, help="násobek 700 hráčů")
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    players_df = process_players_data(synthetic_bootstrap(700 * args.scale))
+    started = time.perf_counter()
+    index = PlayerSearchIndex(players_df['id'], players_df['name'], players_df['web_name'])
+    print(f"Hráčů: {len(players_df):,}, stavba indexu {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    for query in QUERIES:
+        def scan():
+            return players_df[
+                players_df['name'].str.contains(query, case=False) |
+                players_df['web_name'].str.contains(query, case=False)
+            ]['id']
+
+        scan_ms = per_call_ms(scan, args.repeat)
+        index_ms = per_call_ms(lambda: index.search(query), args.repeat)
+        print(f"{query!r:>20}: str.contains {scan_ms:6.3f} ms ({len(scan())} výsledků)  "
+              f"index {index_ms:6.3f} ms ({len(index.search(query))} výsledků)")
+
+
+if __name__ == '__main__':
+    main()
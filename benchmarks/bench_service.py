@@ -0,0 +1,83 @@
+"""Benchmark: propustnost JSON služby a slučování stejných souběžných požadavků
+
+Spustí službu v procesu nad uloženým snapshotem a pustí na ni souběžné
+keep-alive klienty. Spuštění z kořene repozitáře:
+    python benchmarks/bench_service.py --snapshot-dir .fpl_snapshots --clients 32 --requests 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fpl_predictor.service import PredictorService  # noqa: E402
+from fpl_predictor.snapshots import SnapshotStore  # noqa: E402
+
+PATHS = ['/players?limit=20', '/players?position=MID&max_price=8', '/fixtures?from_gw=5&to_gw=10', '/squad']
+
+
+async def get(reader, writer, path):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    head = await reader.readuntil(b'\r\n\r\n')
+    length = int(head.split(b'Content-Length: ')[1].split(b'\r\n')[0])
+    status = int(head.split(b' ', 2)[1])
+    return status, await reader.readexactly(length)
+
+
+async def client(port, paths, n_requests, latencies):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for i in range(n_requests):
+        started = time.perf_counter()
+        status, _ = await get(reader, writer, paths[i % len(paths)])
+        latencies.append(time.perf_counter() - started)
+        assert status == 200, status
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run(args):
+    service = PredictorService(SnapshotStore(args.snapshot_dir), 'latest')
+    server = await service.start('127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+
+    # Slučování: stejný drahý dotaz najednou z mnoha spojení = jeden výpočet
+    squad_path = '/squad?budget=98.5'
+    started = time.perf_counter()
+    await asyncio.gather(*(client(port, [squad_path], 1, []) for _ in range(args.clients)))
+    print(f"{args.clients}x {squad_path} současně: {time.perf_counter() - started:.2f} s, "
+          f"výpočtů {service.stats['computed']}, sloučeno {service.stats['coalesced']}")
+
+    # Zahřátí cache, pak propustnost nad hotovými odpověďmi
+    await client(port, PATHS, len(PATHS), [])
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(client(port, PATHS, args.requests, latencies) for _ in range(args.clients)))
+    elapsed = time.perf_counter() - started
+    ms = np.array(latencies) * 1000
+    print(f"{len(latencies)} požadavků, {args.clients} klientů: {len(latencies) / elapsed:,.0f} req/s, "
+          f"p50 {np.percentile(ms, 50):.2f} ms, p99 {np.percentile(ms, 99):.2f} ms")
+
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    print(json.loads((await get(reader, writer, '/health'))[1])['cache'])
+    writer.close()
+    await writer.wait_closed()
+    service.stop()
+    server.close()
+    await server.wait_closed()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--snapshot-dir')
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=200, help="požadavků na klienta")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Benchmark: Monte Carlo simulace bodů kádru a volby kapitána
+
+Spuštění z kořene repozitáře:
+    python benchmarks/bench_simulation.py --sims 10000 100000 1000000
+
+Kádr se vybere optimalizací nad syntetickým bootstrapem (700 hráčů, bez
+fixtures - každý tým hraje jeden zápas s FDR 3).
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_players import synthetic_bootstrap  # noqa: E402
+from fpl_predictor.core import create_ai_team  # noqa: E402
+from fpl_predictor.fixtures import build_fixture_matrix  # noqa: E402
+from fpl_predictor.players import add_player_scores, process_players_data  # noqa: E402
+from fpl_predictor.simulation import simulate_ai_team  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sims', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3, help="opakování, bere se nejlepší čas")
+    args = parser.parse_args()
+
+    players_df = add_player_scores(process_players_data(synthetic_bootstrap(700)))
+    fixture_matrix = build_fixture_matrix([])
+    ai_team = create_ai_team(players_df, fixture_matrix, 1)
+
+    for n_sims in args.sims:
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            result = simulate_ai_team(ai_team, fixture_matrix, 1, n_sims)
+            timings.append(time.perf_counter() - started)
+        best = min(timings)
+        summary = result['squad']
+        print(f"{n_sims:>9,} simulací: {best * 1000:7.1f} ms ({n_sims / best:,.0f} scénářů/s), "
+              f"kádr ⌀ {summary['mean']:.1f} b., P10-P90 {summary['p10']:.0f}-{summary['p90']:.0f}")
+
+    captains = result['captains']
+    print(captains[['web_name', 'position', 'team_mean', 'captain_mean', 'p_best']].head(5).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
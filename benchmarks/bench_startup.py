@@ -0,0 +1,65 @@
+"""Benchmark: studený start aplikace (čas do prvního vykreslení v novém procesu)
+
+Spuštění z kořene repozitáře (potřebuje uložený snapshot, viz FPL_SNAPSHOT_DIR):
+    python benchmarks/bench_startup.py --runs 5
+
+Každé měření je nový interpret Pythonu, který přes streamlit.testing
+spustí aplikaci v režimu přehrání posledního snapshotu. Měří se import
+Streamlitu (start serveru) a první běh skriptu až po vykreslení.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+streamlit_ready = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=300)
+at.run()
+done = time.perf_counter()
+heavy = [m for m in ('plotly.express', 'scipy.optimize', 'requests', 'matplotlib', 'seaborn') if m in sys.modules]
+print(json.dumps({
+    'streamlit_s': streamlit_ready - started,
+    'first_run_s': done - streamlit_ready,
+    'total_s': done - started,
+    'exception': bool(at.exception),
+    'heavy_modules': heavy
+}))
+"""
+
+
+def measure(app_path, env):
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD, app_path], env=env, cwd=ROOT,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--app', default=os.path.join(ROOT, 'streamlit_app.py'))
+    args = parser.parse_args()
+
+    env = dict(os.environ, FPL_REPLAY=os.environ.get('FPL_REPLAY', 'latest'))
+    results = [measure(args.app, env) for _ in range(args.runs)]
+
+    for key in ('streamlit_s', 'first_run_s', 'total_s'):
+        values = [r[key] for r in results]
+        print(f"{key:>12}: medián {statistics.median(values) * 1000:7.0f} ms  "
+              f"(min {min(values) * 1000:.0f}, max {max(values) * 1000:.0f})")
+    print(f"Těžké moduly po prvním vykreslení: {', '.join(results[-1]['heavy_modules']) or 'žádné'}")
+    if any(r['exception'] for r in results):
+        print("Pozor: aplikace při běhu vyhodila výjimku")
+
+
+if __name__ == '__main__':
+    main()
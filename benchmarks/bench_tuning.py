@@ -0,0 +1,59 @@
+"""Benchmark: ladění vah value skóre (tuning.tune_weights)
+
+Spuštění z kořene repozitáře:
+    python benchmarks/bench_tuning.py --samples 1000 5000 20000
+
+Data jsou vymyšlená - 700 hráčů ve 38 GW jako jedna sezóna z
+tuning.training_data, skutečné body závisí hlavně na predikci a formě.
+Měří se jen ladění, příprava dat ze snapshotů se neměří.
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fpl_predictor.players import SCORE_FEATURES  # noqa: E402
+from fpl_predictor.tables import PRICE_CATEGORIES  # noqa: E402
+from fpl_predictor.tuning import tune_weights  # noqa: E402
+
+
+def synthetic_data(n_players, n_gameweeks, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = n_players * n_gameweeks
+    features = {
+        'predicted_points': rng.gamma(2.0, 1.5, rows),
+        'form': rng.gamma(1.5, 2.0, rows),
+        'price': rng.uniform(4.0, 14.5, rows),
+        'differential': rng.uniform(0.5, 1.0, rows),
+        'transfer_trend': rng.exponential(5.0, rows)
+    }
+    outcome = 0.6 * features['predicted_points'] + 0.2 * features['form'] + rng.normal(0, 2.5, rows)
+    return pd.DataFrame({name: features[name].astype('float32') for name in SCORE_FEATURES}).assign(
+        season='2025',
+        gw=np.repeat(np.arange(1, n_gameweeks + 1), n_players),
+        price_category=rng.choice([label for label, _, _ in PRICE_CATEGORIES], rows),
+        outcome=np.maximum(outcome, 0).astype('float32')
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=700)
+    parser.add_argument('--gameweeks', type=int, default=38)
+    parser.add_argument('--samples', type=int, nargs='+', default=[1000, 5000, 20000])
+    args = parser.parse_args()
+
+    data = synthetic_data(args.players, args.gameweeks)
+    for n_samples in args.samples:
+        result = tune_weights(data, 'value_score', n_samples)
+        low, high = result['uplift_ci']
+        print(f"{n_samples:>6,} vektorů x {result['gameweeks']} GW: {result['tune_time']:6.2f} s, "
+              f"zlepšení {low:+.3f} až {high:+.3f}, váhy {result['weights']}")
+
+
+if __name__ == '__main__':
+    main()
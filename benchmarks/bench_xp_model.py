@@ -0,0 +1,108 @@
+"""Benchmark: trénink a predikce modelu očekávaných bodů (xp_model)
+
+Spuštění z kořene repozitáře:
+    python benchmarks/bench_xp_model.py --rounds 10 38
+
+Historie je vymyšlená - 700 hráčů, 20 týmů, každý tým jeden zápas v kole.
+Měří se trénink od začátku, doučení jednoho nového kola (jako při dalším
+snapshotu) a projekce všech hráčů na 6 GW jedním voláním.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_players import synthetic_bootstrap  # noqa: E402
+from fpl_predictor.fixtures import build_fixture_matrix  # noqa: E402
+from fpl_predictor.players import process_players_data  # noqa: E402
+from fpl_predictor.xp_model import XPModel, history_frame  # noqa: E402
+
+
+def synthetic_season(bootstrap, n_rounds, seed=0):
+    """Fixtures celé sezóny a historie hráčů pro prvních n_rounds kol"""
+    rng = np.random.default_rng(seed)
+    fixtures = []
+    for gw in range(1, 39):
+        teams = rng.permutation(20) + 1
+        for home, away in zip(teams[::2], teams[1::2]):
+            fixtures.append({
+                'id': len(fixtures) + 1, 'event': gw, 'team_h': int(home), 'team_a': int(away),
+                'team_h_difficulty': int(rng.integers(2, 6)), 'team_a_difficulty': int(rng.integers(2, 6)),
+                'finished': gw <= n_rounds, 'kickoff_time': f"2025-08-{gw:02d}T15:00:00Z"
+            })
+
+    history = {}
+    for player in bootstrap['elements']:
+        rows = []
+        for f in fixtures:
+            if not f['finished'] or player['team'] not in (f['team_h'], f['team_a']):
+                continue
+            minutes = int(rng.choice([0, 30, 90]))
+            goals, assists = int(rng.poisson(0.15)), int(rng.poisson(0.1))
+            rows.append({
+                'element': player['id'], 'fixture': f['id'], 'round': f['event'], 'minutes': minutes,
+                'total_points': int(rng.integers(0, 12)), 'goals_scored': goals, 'assists': assists,
+                'clean_sheets': int(rng.random() < 0.3), 'bonus': int(rng.integers(0, 4)),
+                'was_home': player['team'] == f['team_h'], 'value': player['now_cost'],
+                'expected_goals': f"{rng.random() * 0.5:.2f}", 'expected_assists': f"{rng.random() * 0.3:.2f}"
+            })
+        history[str(player['id'])] = {'history': rows}
+    return fixtures, history
+
+
+def best_time(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=700)
+    parser.add_argument('--rounds', type=int, nargs='+', default=[10, 38])
+    parser.add_argument('--repeat', type=int, default=3, help="opakování, bere se nejlepší čas")
+    args = parser.parse_args()
+
+    bootstrap = synthetic_bootstrap(args.players)
+    players_df = process_players_data(bootstrap)
+    positions_by_id = players_df.set_index('id')['position'].astype(str)
+
+    for n_rounds in args.rounds:
+        fixtures, history = synthetic_season(bootstrap, n_rounds)
+        frame = history_frame(history, fixtures)
+        rounds = set(range(1, n_rounds + 1))
+
+        def full():
+            model = XPModel('2025')
+            model.update(frame, positions_by_id, rounds)
+            return model
+
+        def incremental():
+            model = XPModel('2025')
+            model.update(frame, positions_by_id, rounds - {n_rounds})
+            started = time.perf_counter()
+            model.update(frame, positions_by_id, rounds)
+            return time.perf_counter() - started
+
+        full_time, model = best_time(full, args.repeat)
+        increment = min(incremental() for _ in range(args.repeat))
+        matrix = build_fixture_matrix(fixtures)
+        from_gw = min(n_rounds + 1, 33)
+        project_time, (points, gameweeks) = best_time(
+            lambda: model.project(players_df, matrix, from_gw, 6), args.repeat * 10
+        )
+        print(f"{n_rounds:>2} kol ({len(frame):>6,} řádků): trénink {full_time * 1000:7.1f} ms, "
+              f"nové kolo {increment * 1000:6.1f} ms, projekce {points.shape[0]}x{len(gameweeks)} "
+              f"{project_time * 1000:5.2f} ms, průběžné RMSE {model.rmse:.2f}")
+
+
+if __name__ == '__main__':
+    main()
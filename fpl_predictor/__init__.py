@@ -0,0 +1 @@
+"""Jádro FPL Predictoru - logika nezávislá na Streamlit UI"""
@@ -0,0 +1,6 @@
+"""python -m fpl_predictor - dávkový export (viz fpl_predictor.cli)"""
+import sys
+
+from fpl_predictor.cli import main
+
+sys.exit(main())
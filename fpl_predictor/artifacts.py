@@ -0,0 +1,98 @@
+"""Cache odvozených dat (DataFrame hráčů, matice zápasů, AI tým, ...) podle snapshotu
+
+Klíč je n-tice z názvu artefaktu, id snapshotů, ze kterých vznikl, a
+parametrů výpočtu. Nový snapshot tedy znamená nové klíče a staré položky
+postupně vypadnou. Velikost cache je omezená počtem bajtů, vyřazuje se
+nejdéle nepoužitá položka (LRU). Hodnoty sdílí všechny session, volající
+je nesmí měnit (DataFrame před úpravou zkopírovat).
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+
+def artifact_size(value):
+    """Přibližná velikost hodnoty v paměti v bajtech"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True, index=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    # Plotly figura - velikost serializované specifikace, kterou Streamlit posílá
+    if hasattr(value, 'to_plotly_json'):
+        return len(value.to_json())
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(artifact_size(k) + artifact_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(artifact_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class ArtifactCache:
+    """LRU cache omezená celkovou velikostí uložených hodnot"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, compute):
+        """Hodnota pro klíč; při chybějící položce ji spočítá `compute()` a uloží"""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key][0]
+            self.misses += 1
+
+        # Výpočet běží mimo zámek, souběžný výpočet stejného klíče jen zbytečně proběhne dvakrát
+        value = compute()
+        size = artifact_size(value)
+
+        with self._lock:
+            if key in self._items:
+                return self._items[key][0]
+            # Položka větší než celá cache se jen vrátí
+            if size > self.max_bytes:
+                return value
+            self._items[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+        return value
+
+    def lookup(self, key, default=None):
+        """Hodnota pro klíč, pokud už je v cache (nic nepočítá)"""
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return self._items[key][0]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'items': len(self._items),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
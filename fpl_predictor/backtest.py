@@ -0,0 +1,376 @@
+"""Backtest - přehrání uložených snapshotů sezóny GW po GW
+
+Spuštění z kořene repozitáře:
+    python -m fpl_predictor.backtest --snapshot-dir seasons/2024 seasons/2025
+    python -m fpl_predictor.backtest --snapshot-dir seasons/2025 \\
+        --params '{"horizon": 3}' '{"horizon": 5, "use_model": false}' --workers 4 --out backtest/
+
+Jedna sezóna = jeden adresář snapshotů. Pro každý GW se vezme poslední
+bootstrap stažený před jeho deadlinem (a fixtures a historie hráčů, jak
+vypadaly v tu chvíli) a projde stejnou cestou jako dashboard: predikce,
+v prvním GW kádr z optimalizace, potom transfer plán, ze kterého se
+provede jen první krok. Sestava a kapitán se vyberou podle predikce na
+daný GW. Bez snapshotu před deadlinem zůstane kádr i sestava beze změny
+(manažer se nepřihlásil). Stejně se přehraje GW, ve kterém hráč kádru
+v bootstrapu chybí, a GW s neúplným počátečním kádrem se přeskočí - oba
+případy se zapíšou do `skipped` místo pádu celé úlohy. Chipy se nehrají.
+
+Skutečné body jsou z poslední historie hráčů (element-summary) v úložišti,
+průměr a maximum manažerů z událostí posledního bootstrapu. Výsledek má
+přesnost predikcí (MAE, RMSE, odchylka, pořadová korelace) a body týmu po
+automatických střídáních proti průměrnému manažerovi - kumulativní náskok
+je náhrada za celkové pořadí, které bez přihlášení nezjistíme.
+
+Sezóny a sady parametrů (viz DEFAULT_PARAMS) běží v poolu procesů, každá
+úloha s vlastní cache a vlastním souborem modelu xp_model.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from fpl_predictor import core
+from fpl_predictor.optimizer import SQUAD_POSITIONS
+from fpl_predictor.planner import FT_TOPUP, HIT_COST, MAX_FREE_TRANSFERS, MAX_TRANSFERS_PER_GW, next_free_transfers
+from fpl_predictor.projection import project_points
+from fpl_predictor.simulation import auto_subs
+from fpl_predictor.snapshots import SnapshotStore, KIND_BOOTSTRAP, KIND_FIXTURES, KIND_ELEMENT_SUMMARY
+from fpl_predictor.xp_model import history_frame, season_of
+
+# Parametry jedné úlohy; sada parametrů z příkazové řádky přepisuje jen uvedené
+DEFAULT_PARAMS = {
+    'budget': 100.0,
+    'horizon': 4,                        # GW transfer plánu
+    'max_transfers': MAX_TRANSFERS_PER_GW,
+    'use_model': True,                   # predikce z modelu xp_model (jinak forma a cena)
+    # Štědrý limit řešiče - s limitem dashboardu by kádr závisel na vytížení procesů v poolu
+    'time_limit': 10.0
+}
+# Minimum sestavy podle pozic, zbytek doplní nejlepší hráči v poli
+LINEUP_MINIMUM = [('Goalkeeper', 1), ('Defender', 3), ('Midfielder', 2), ('Forward', 1)]
+XI_SIZE = 11
+
+
+def decision_snapshots(store, events):
+    """{GW: záznam bootstrapu} - poslední snapshot stažený mezi předchozím a tímto deadlinem"""
+    entries = store.entries(KIND_BOOTSTRAP)
+    schedule = {}
+    previous = ''
+    for event in sorted(events, key=lambda e: e['id']):
+        deadline = event.get('deadline_time')
+        if not deadline:
+            continue
+        before = [entry for entry in entries if previous < entry['fetched_at'] < deadline]
+        if before:
+            schedule[event['id']] = before[-1]
+        previous = deadline
+    return schedule
+
+
+def actual_points(store):
+    """Skutečné body a minuty hráčů po kolech z poslední historie - DataFrame [hráč, GW]"""
+    entry = store.latest(KIND_ELEMENT_SUMMARY)
+    if not entry:
+        raise core.SnapshotNotFound(f"V {store.root} chybí historie hráčů (element-summary) se skutečnými body")
+    frame = history_frame(store.load(KIND_ELEMENT_SUMMARY, entry['id']))
+    table = frame.pivot_table(
+        index='element', columns='round', values=['total_points', 'minutes'], aggfunc='sum', fill_value=0
+    )
+    return table['total_points'], table['minutes']
+
+
+def season_label(store):
+    """Sezóna podle posledních fixtures, jinak název adresáře snapshotů"""
+    fixtures_snapshot = core.load_snapshot(store, KIND_FIXTURES)
+    season = season_of(fixtures_snapshot['data']) if fixtures_snapshot else None
+    return season or os.path.basename(os.path.normpath(store.root))
+
+
+def snapshot_records(store, entry, use_history):
+    """Bootstrap, fixtures a historie tak, jak byly v okamžiku stažení bootstrapu"""
+    def record(kind):
+        found = store.latest(kind, at=entry['fetched_at'])
+        return dict(found, data=store.load(kind, found['id'])) if found else None
+
+    bootstrap = dict(entry, data=store.load(KIND_BOOTSTRAP, entry['id']))
+    return bootstrap, record(KIND_FIXTURES), record(KIND_ELEMENT_SUMMARY) if use_history else None
+
+
+def gameweek_predictions(players_df, fixture_matrix, gw, model=None):
+    """Očekávané body všech hráčů v jednom GW (model z historie, jinak predikce x FDR)"""
+    if model is not None:
+        projected, _ = model.project(players_df, fixture_matrix, gw, 1)
+    else:
+        projected, _ = project_points(players_df, fixture_matrix, gw, 1)
+    return projected[:, 0] if projected.shape[1] else np.zeros(len(players_df), dtype='float32')
+
+
+def pick_lineup(positions, expected):
+    """Sestava, lavička, kapitán a vice-kapitán kádru podle očekávaných bodů
+
+    Vrací (řádky sestavy seřazené od nejlepšího, pořadí lavičky s brankářem
+    první, kapitán, vice-kapitán) jako indexy do `positions`.
+    """
+    order = np.argsort(-np.asarray(expected), kind='stable')
+    starters = []
+    for pos, count in LINEUP_MINIMUM:
+        starters.extend([row for row in order if positions[row] == pos][:count])
+    rest = [row for row in order if row not in starters and positions[row] != 'Goalkeeper']
+    starters.extend(rest[:XI_SIZE - len(starters)])
+    starters = [row for row in order if row in starters]
+    bench = sorted((row for row in order if row not in starters), key=lambda row: positions[row] != 'Goalkeeper')
+    return np.array(starters), bench, starters[0], starters[1]
+
+
+def prediction_accuracy(predicted, actual, mask):
+    """MAE, RMSE, průměrná odchylka a pořadová (Spearmanova) korelace predikce"""
+    predicted, actual = predicted[mask].astype('float64'), actual[mask].astype('float64')
+    if len(predicted) < 2:
+        return {'mae': np.nan, 'rmse': np.nan, 'bias': np.nan, 'rank_corr': np.nan, 'players': len(predicted)}
+    error = predicted - actual
+    ranks = pd.DataFrame({'predicted': predicted, 'actual': actual}).rank()
+    return {
+        'mae': float(np.abs(error).mean()),
+        'rmse': float(np.sqrt((error ** 2).mean())),
+        'bias': float(error.mean()),
+        'rank_corr': float(ranks['predicted'].corr(ranks['actual'])),
+        'players': len(predicted)
+    }
+
+
+def score_gameweek(positions, lineup, points, minutes):
+    """Skutečné body kádru v GW po automatických střídáních, kapitán (nebo vice) dvakrát"""
+    starters, bench, captain, vice = lineup
+    played = minutes > 0
+    score = int(auto_subs(points[None, :], played[None, :], starters, bench, positions)[0])
+    if played[captain]:
+        score += int(points[captain])
+    elif played[vice]:
+        score += int(points[vice])
+    return score
+
+
+def backtest_season(root, params=None):
+    """Přehraje jednu sezónu (adresář snapshotů) s danými parametry
+
+    Vrací slovník:
+        season, root, params
+        gameweeks   DataFrame - řádek na GW: transfery, hity, očekávané a
+                    skutečné body, kapitán, průměr/maximum manažerů,
+                    přesnost predikcí a kumulativní součty
+        skipped     {GW: důvod} - kola, ve kterých se nedalo rozhodnout
+                    (neúplný počáteční kádr, hráč kádru chybí v bootstrapu)
+        summary     souhrn sezóny (viz summarize)
+    """
+    started = time.perf_counter()
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    store = SnapshotStore(root)
+    final = core.load_snapshot(store, KIND_BOOTSTRAP)
+    if not final:
+        raise core.SnapshotNotFound(f"V {root} není žádný bootstrap snapshot")
+    events = {event['id']: event for event in final['data'].get('events', [])}
+    schedule = decision_snapshots(store, events.values())
+    finished = [gw for gw, event in sorted(events.items()) if event.get('finished')]
+    points_table, minutes_table = actual_points(store)
+    gameweeks = [gw for gw in finished if schedule and gw >= min(schedule)]
+    if not gameweeks:
+        raise core.SnapshotNotFound(f"V {root} není snapshot před deadlinem žádného dohraného GW")
+
+    squad, bank, free_transfers = None, 0.0, 1
+    rows, skipped = [], {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for gw in gameweeks:
+            entry = schedule.get(gw)
+            ft = max(min(free_transfers, MAX_FREE_TRANSFERS), FT_TOPUP.get(gw, 0))
+            transfers, hits, accuracy = [], 0, {}
+            if entry is not None:
+                bootstrap, fixtures_snapshot, history_snapshot = snapshot_records(store, entry, params['use_model'])
+                pipeline = core.build_pipeline(
+                    bootstrap, fixtures_snapshot, history_snapshot=history_snapshot,
+                    model_path=os.path.join(workdir, 'xp_model.npz')
+                )
+                players_df, fixture_matrix = pipeline['players'], pipeline['fixture_matrix']
+                predicted = gameweek_predictions(players_df, fixture_matrix, gw, pipeline['xp_model'])
+                ids = players_df['id'].to_numpy()
+                actual = points_table.reindex(ids, fill_value=0).get(gw, pd.Series(0, index=ids)).to_numpy()
+                played = minutes_table.reindex(ids, fill_value=0).get(gw, pd.Series(0, index=ids)).to_numpy()
+                if fixture_matrix['count'].any():
+                    has_fixture = fixture_matrix['count'][players_df['team_id'].to_numpy(dtype='int64'), gw] > 0
+                else:
+                    has_fixture = np.ones(len(ids), dtype=bool)
+                accuracy = prediction_accuracy(predicted, actual, has_fixture | (played > 0))
+
+                row_of = {int(pid): row for row, pid in enumerate(ids)}
+                missing = sorted(pid for pid in squad or [] if pid not in row_of)
+                if missing:
+                    # Kádr nejde naplánovat ani seřadit - kolo se odehraje s poslední sestavou
+                    skipped[gw] = f"Hráči kádru chybí v bootstrapu: {', '.join(map(str, missing))}"
+                elif squad is None:
+                    _, cost, solution = core.create_ai_team(
+                        players_df, fixture_matrix, gw, params['budget'], params['time_limit']
+                    )
+                    if len(solution['squad']) != sum(SQUAD_POSITIONS.values()):
+                        # Kádr se zkusí znovu z dalšího snapshotu
+                        skipped[gw] = f"Neúplný počáteční kádr ({len(solution['squad'])} hráčů): {solution['message']}"
+                        continue
+                    squad = [int(pid) for pid in solution['squad']['id']]
+                    bank = round(params['budget'] - cost, 1)
+                    # Počáteční kádr je zdarma, další GW začíná s jedním FT
+                    ft = 0
+                else:
+                    plan = core.create_transfer_strategy(
+                        gw, squad, bank, ft, params['horizon'], players_df, fixture_matrix, params['max_transfers']
+                    )
+                    step = plan['steps'][0] if plan['steps'] else None
+                    if step is not None and step['gw'] == gw:
+                        transfers, hits, bank = step['transfers'], step['hits'], step['bank']
+                        replaced = dict(transfers)
+                        squad = [replaced.get(pid, pid) for pid in squad]
+
+                if not missing:
+                    squad_rows = [row_of[pid] for pid in squad]
+                    positions = players_df['position'].astype(str).to_numpy()[squad_rows]
+                    expected = predicted[squad_rows]
+                    lineup = pick_lineup(positions, expected)
+                    names = players_df['web_name'].to_numpy()[squad_rows]
+            elif squad is None:
+                continue
+
+            squad_points = points_table.reindex(squad, fill_value=0).get(gw, pd.Series(0, index=squad)).to_numpy()
+            squad_minutes = minutes_table.reindex(squad, fill_value=0).get(gw, pd.Series(0, index=squad)).to_numpy()
+            starters, _, captain, _ = lineup
+            score = score_gameweek(positions, lineup, squad_points, squad_minutes)
+            event = events[gw]
+            rows.append({
+                'gw': gw,
+                'snapshot_id': entry['id'] if entry else None,
+                'transfers': len(transfers),
+                'hits': hits,
+                'expected_points': float(expected[starters].sum() + expected[captain]) - HIT_COST * hits,
+                'points': score - HIT_COST * hits,
+                'captain': names[captain],
+                'captain_points': int(squad_points[captain]),
+                'captain_best': bool(squad_points[captain] >= squad_points[starters].max()),
+                'average': event.get('average_entry_score'),
+                'highest': event.get('highest_score'),
+                'bank': bank,
+                **accuracy
+            })
+            free_transfers = next_free_transfers(ft, len(transfers), gw + 1)
+
+    if not rows:
+        raise core.SnapshotNotFound(f"V {root} se nepodařilo přehrát žádný GW: {skipped}")
+    table = pd.DataFrame(rows)
+    table['total'] = table['points'].cumsum()
+    table['average_total'] = table['average'].fillna(0).cumsum()
+    # Kumulativní náskok před průměrným manažerem - náhrada za celkové pořadí
+    table['margin'] = table['total'] - table['average_total']
+    return {
+        'season': season_label(store),
+        'root': root,
+        'params': params,
+        'gameweeks': table,
+        'skipped': skipped,
+        'summary': dict(summarize(table, time.perf_counter() - started), skipped=len(skipped))
+    }
+
+
+def summarize(table, elapsed=None):
+    """Souhrn jedné sezóny z tabulky GW (výstup backtest_season)"""
+    highest = table['highest'].dropna()
+    return {
+        'gameweeks': len(table),
+        'points': int(table['points'].sum()),
+        'points_per_gw': float(table['points'].mean()),
+        'average_points': int(table['average'].fillna(0).sum()),
+        'margin': float(table['margin'].iloc[-1]),
+        'beat_average': float((table['points'] > table['average']).mean()),
+        'highest_share': float(table.loc[highest.index, 'points'].sum() / highest.sum()) if highest.sum() else None,
+        'hits': int(table['hits'].sum()),
+        'transfers': int(table['transfers'].sum()),
+        'captain_best': float(table['captain_best'].mean()),
+        'mae': float(table['mae'].mean()),
+        'rmse': float(table['rmse'].mean()),
+        'rank_corr': float(table['rank_corr'].mean()),
+        'elapsed_s': round(elapsed, 1) if elapsed is not None else None
+    }
+
+
+def run_backtests(roots, param_sets=None, workers=None):
+    """Všechny kombinace sezóna x sada parametrů, paralelně v procesech
+
+    `workers` je počet procesů (výchozí počet jader), 1 = bez poolu.
+    Výsledky jsou ve stejném pořadí jako kombinace.
+    """
+    param_sets = param_sets or [{}]
+    jobs = [(root, params) for root in roots for params in param_sets]
+    if workers == 1 or len(jobs) == 1:
+        return [backtest_season(root, params) for root, params in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(backtest_season, *zip(*jobs)))
+
+
+def summary_table(results):
+    """Jeden řádek na úlohu - sezóna, změněné parametry a souhrn"""
+    return pd.DataFrame([
+        {
+            'season': result['season'],
+            'params': json.dumps(
+                {key: value for key, value in result['params'].items() if DEFAULT_PARAMS.get(key) != value},
+                sort_keys=True
+            ),
+            **result['summary']
+        }
+        for result in results
+    ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m fpl_predictor.backtest', description=__doc__.splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter, epilog='\n'.join(__doc__.splitlines()[2:])
+    )
+    parser.add_argument('--snapshot-dir', nargs='+', required=True, help="adresáře snapshotů, jeden na sezónu")
+    parser.add_argument('--params', nargs='+', type=json.loads, default=[{}],
+                        help="sady parametrů jako JSON, např. '{\"horizon\": 3}'")
+    parser.add_argument('--workers', type=int, help="počet procesů (výchozí počet jader)")
+    parser.add_argument('--out', help="adresář pro summary.json a gameweeks.json")
+    args = parser.parse_args(argv)
+
+    unknown = sorted({key for params in args.params for key in params} - set(DEFAULT_PARAMS))
+    if unknown:
+        parser.error(f"Neznámé parametry: {', '.join(unknown)} (povolené: {', '.join(DEFAULT_PARAMS)})")
+
+    started = time.perf_counter()
+    try:
+        results = run_backtests(args.snapshot_dir, args.params, args.workers)
+    except core.SnapshotNotFound as e:
+        parser.exit(1, f"{e}\n")
+    summary = summary_table(results)
+
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        summary.to_json(os.path.join(args.out, 'summary.json'), orient='records', force_ascii=False, indent=1)
+        gameweeks = pd.concat([
+            result['gameweeks'].assign(season=result['season'], params=params)
+            for result, params in zip(results, summary['params'])
+        ], ignore_index=True)
+        gameweeks.to_json(os.path.join(args.out, 'gameweeks.json'), orient='records', force_ascii=False, indent=1)
+
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(summary.round(3).to_string(index=False))
+    for result in results:
+        for gw, reason in result['skipped'].items():
+            print(f"{result['season']} GW{gw}: {reason}", file=sys.stderr)
+    print(f"{len(results)} úloh za {time.perf_counter() - started:.1f} s")
+    return 0
+
+
+if __name__ == '__main__':
+    main()
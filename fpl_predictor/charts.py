@@ -0,0 +1,161 @@
+"""Plotly grafy aplikace - stavba figur z hotových dat snapshotu
+
+Figury se staví jednou pro snapshot (uzly pipeline) a při rerunu se jen
+odešlou. Plotly se importuje až uvnitř funkcí, aby ho nenačítal start
+aplikace.
+"""
+import pandas as pd
+
+TRANSPARENT_LAYOUT = dict(
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+    font=dict(color='white')
+)
+POSITION_NAMES = {'GK': 'Brankáři', 'DEF': 'Obránci', 'MID': 'Záložníci', 'FWD': 'Útočníci'}
+
+
+def value_scatter_figure(top_value):
+    """Graf cena vs predikované body pro hráče s nejlepší hodnotou za peníze"""
+    # graph_objects místo plotly.express - výchozí záložka tak nemusí načítat express
+    import plotly.graph_objects as go
+
+    # Velikost bodu podle vlastnictví jako plocha, stejně jako px.scatter (max 20 px)
+    sizeref = 2.0 * max(float(top_value['selected_by_percent'].max()), 1e-6) / 20 ** 2
+    fig = go.Figure()
+    for position, group in top_value.groupby('position', observed=True, sort=False):
+        fig.add_trace(go.Scatter(
+            x=group['price'],
+            y=group['predicted_points'],
+            mode='markers',
+            name=str(position),
+            text=group['name'],
+            customdata=group[['team', 'form', 'transfers_in']].to_numpy(dtype=object),
+            marker=dict(size=group['selected_by_percent'], sizemode='area', sizeref=sizeref, sizemin=2),
+            hovertemplate=(
+                "<b>%{text}</b><br>Cena (£m)=%{x}<br>Predikované body=%{y:.1f}<br>"
+                "team=%{customdata[0]}<br>form=%{customdata[1]}<br>transfers_in=%{customdata[2]}<extra></extra>"
+            )
+        ))
+    fig.update_layout(
+        title="Cena vs Predikované body - Nová sezóna (velikost = vlastnictví %)",
+        xaxis_title='Cena (£m)',
+        yaxis_title='Predikované body',
+        legend_title_text='position',
+        **TRANSPARENT_LAYOUT
+    )
+    return fig
+
+
+def budget_split(ai_team):
+    """Cena a počet hráčů AI týmu podle pozic (prázdný DataFrame bez týmu)"""
+    rows = [
+        {'Pozice': POSITION_NAMES[pos], 'Cena': sum(p['price'] for p in players), 'Počet': len(players)}
+        for pos, players in (ai_team or {}).items() if players
+    ]
+    return pd.DataFrame(rows, columns=['Pozice', 'Cena', 'Počet'])
+
+
+def budget_pie_figure(cost_df):
+    """Koláč rozdělení rozpočtu AI týmu podle pozic"""
+    import plotly.express as px
+
+    fig = px.pie(
+        cost_df,
+        values='Cena',
+        names='Pozice',
+        title="Rozdělení £100m rozpočtu podle pozic",
+        color_discrete_sequence=['#eab308', '#3b82f6', '#22c55e', '#ef4444'],
+        hover_data=['Počet']
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(**TRANSPARENT_LAYOUT)
+    return fig
+
+
+def difficulty_bar_figure(team_aggregates, current_gw):
+    """Deset týmů s nejsnadnějšími zápasy v dalších pěti kolech (None bez zápasů)"""
+    difficulty_df = team_aggregates[team_aggregates['avg_difficulty'] > 0]
+    if difficulty_df.empty:
+        return None
+
+    import plotly.express as px
+
+    fig = px.bar(
+        difficulty_df.sort_values('avg_difficulty').head(10),
+        x='avg_difficulty',
+        y='team',
+        orientation='h',
+        title=f"Nejsnadnější fixtures pro GW {current_gw}-{current_gw + 4}",
+        color='avg_difficulty',
+        color_continuous_scale='RdYlGn_r',
+        hover_data=['fixtures_count', 'home_difficulty', 'away_difficulty']
+    )
+    fig.update_layout(**TRANSPARENT_LAYOUT)
+    return fig
+
+
+def net_transfers_figure(players_df):
+    """Hráči s největšími čistými transfery mezi těmi s aktivitou nad 50 tisíc (None bez aktivity)"""
+    active_transfers = players_df[
+        (players_df['transfers_in'] > 50000) | (players_df['transfers_out'] > 50000)
+    ]
+    if active_transfers.empty:
+        return None
+
+    import plotly.express as px
+
+    fig = px.bar(
+        active_transfers.nlargest(15, 'net_transfers', keep='all'),
+        x='net_transfers',
+        y='name',
+        orientation='h',
+        title="Čisté transfery (IN - OUT)",
+        color='net_transfers',
+        color_continuous_scale='RdYlGn'
+    )
+    fig.update_layout(**TRANSPARENT_LAYOUT)
+    return fig
+
+
+def team_prediction_figure(team_df):
+    """Deset týmů s nejvyšší průměrnou predikcí (team_df už seřazený)"""
+    import plotly.express as px
+
+    fig = px.bar(
+        team_df.head(10),
+        x='team',
+        y='avg_prediction',
+        title="Průměrná predikce bodů všech hráčů týmu",
+        color='avg_prediction',
+        color_continuous_scale='viridis'
+    )
+    fig.update_layout(xaxis_tickangle=-45, **TRANSPARENT_LAYOUT)
+    return fig
+
+
+def score_distribution_figure(simulation):
+    """Histogram bodů AI kádru v GW ze simulace (None bez simulace)"""
+    if not simulation or simulation['histogram'] is None:
+        return None
+
+    import plotly.graph_objects as go
+
+    counts, edges = simulation['histogram']
+    summary = simulation['squad']
+    fig = go.Figure(go.Bar(
+        x=edges[:-1],
+        y=counts / simulation['sims'] * 100,
+        marker_color='#667eea',
+        hovertemplate="%{x} bodů: %{y:.2f} %<extra></extra>"
+    ))
+    for name, color in [('p10', '#ef4444'), ('p50', '#eab308'), ('p90', '#22c55e')]:
+        fig.add_vline(x=summary[name], line_dash='dash', line_color=color,
+                      annotation_text=name.upper(), annotation_font_color=color)
+    fig.update_layout(
+        title=f"Rozdělení bodů kádru v GW {simulation['gameweek']} ({simulation['sims']:,} simulací)",
+        xaxis_title='Body týmu (s kapitánem a střídáními)',
+        yaxis_title='Pravděpodobnost (%)',
+        bargap=0.05,
+        **TRANSPARENT_LAYOUT
+    )
+    return fig
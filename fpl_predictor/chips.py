@@ -0,0 +1,222 @@
+"""Plán chipů na zbytek sezóny (dynamické programování přes GW)
+
+Pravidla 2025/26: každý chip (Wildcard, Free Hit, Bench Boost, Triple
+Captain) je dvakrát - jednou pro GW1-19 a jednou pro GW20-38, nevyužitý
+chip z první poloviny propadá. V jednom kole lze zahrát jen jeden chip.
+
+Hodnota chipu v kole se počítá z projekce bodů:
+    Bench Boost     body lavičky aktivního kádru
+    Triple Captain  body kapitána navíc
+    Free Hit        sestava nejlepšího kádru jen pro to kolo minus aktivní kádr
+    Wildcard        přechod na nejlepší kádr pro `WILDCARD_HORIZON` kol dopředu;
+                    potom se počítá zase s původním kádrem (rozdíl by mezitím
+                    dohnaly free transfery)
+
+Kádry pro Free Hit a Wildcard hledá přesný řešič (optimizer.solve_squad),
+ale jen v několika kolech každé poloviny s nejvyšším horním odhadem zisku.
+Vlastní rozvrh pak najde DP přes stavy (použité chipy, aktivní wildcard),
+které trvá milisekundy. Nalezené kádry se vrací v `squads` a při změně
+projekcí nebo dostupných chipů je lze předat zpět - přepočet pak řešič
+vůbec nevolá.
+"""
+import time
+
+import numpy as np
+
+from fpl_predictor.optimizer import SQUAD_POSITIONS
+from fpl_predictor.planner import lineup_points, squad_slots
+
+WILDCARD = 'wildcard'
+FREE_HIT = 'free_hit'
+BENCH_BOOST = 'bench_boost'
+TRIPLE_CAPTAIN = 'triple_captain'
+CHIPS = [WILDCARD, FREE_HIT, BENCH_BOOST, TRIPLE_CAPTAIN]
+CHIP_NAMES = {
+    WILDCARD: 'Wildcard', FREE_HIT: 'Free Hit', BENCH_BOOST: 'Bench Boost', TRIPLE_CAPTAIN: 'Triple Captain'
+}
+# Poslední GW první poloviny sezóny (chipy se pak obnoví)
+FIRST_HALF_END = 19
+LAST_GAMEWEEK = 38
+
+WILDCARD_HORIZON = 6
+# Kolik kol v každé polovině sezóny dostane přesný kádr pro Wildcard / Free Hit
+WILDCARD_CANDIDATES = 3
+FREE_HIT_CANDIDATES = 3
+SQUAD_TIME_LIMIT = 0.5
+
+
+def season_half(gw):
+    """0 pro GW1-19, 1 pro GW20-38"""
+    return 0 if gw <= FIRST_HALF_END else 1
+
+
+def remaining_chips(from_gw):
+    """Všechny chipy (chip, polovina), které lze od from_gw ještě zahrát"""
+    halves = [half for half in (0, 1) if from_gw <= (FIRST_HALF_END if half == 0 else LAST_GAMEWEEK)]
+    return [(chip, half) for half in halves for chip in CHIPS]
+
+
+def _squad_values(points):
+    """Body sestavy (s kapitánem), lavičky a kapitána po GW pro kádr v pořadí slotů
+
+    `points` má tvar [15, GW]. Nejlepší hráč kádru je vždy v sestavě a je
+    kapitánem, takže lavička = všech 15 - (sestava - kapitán).
+    """
+    lineup = lineup_points(points)
+    captain = points.max(axis=0)
+    bench = points.sum(axis=0) - (lineup - captain)
+    return lineup, bench, captain
+
+
+def _top_squad_rows(positions, score, allowed):
+    """Nejlepší hráči každé pozice podle skóre bez rozpočtu a limitu klubu (horní odhad)"""
+    rows = []
+    for pos, count in SQUAD_POSITIONS.items():
+        candidates = np.flatnonzero((positions == pos) & allowed)
+        rows.extend(candidates[np.argsort(-score[candidates], kind='stable')[:count]])
+    return np.array(rows, dtype='int64')
+
+
+def _solve_chip_squad(players_df, score, allowed, budget, time_limit):
+    """Id hráčů nejlepšího kádru podle skóre, nebo None bez úplného kádru"""
+    from fpl_predictor.optimizer import solve_squad
+
+    candidates = players_df[allowed].copy()
+    candidates['chip_score'] = score[allowed]
+    solution = solve_squad(candidates, budget, 'chip_score', time_limit)
+    squad = solution['squad']
+    if len(squad) < sum(SQUAD_POSITIONS.values()):
+        return None
+    return tuple(sorted(int(pid) for pid in squad['id']))
+
+
+def find_chip_squads(players_df, squad_ids, points, gameweeks, budget, allowed=None, available=None,
+                     time_limit=SQUAD_TIME_LIMIT):
+    """Kádry pro Wildcard a Free Hit v nejslibnějších kolech
+
+    Kola se vyberou podle horního odhadu zisku (nejlepší hráči pozic bez
+    rozpočtu proti aktuálnímu kádru), přesný kádr se pak hledá jen pro
+    `WILDCARD_CANDIDATES` / `FREE_HIT_CANDIDATES` kol každé poloviny.
+    Vrací {(chip, gw): tuple id hráčů}.
+    """
+    points = np.asarray(points, dtype='float32')
+    positions = players_df['position'].astype(str).to_numpy()
+    allowed = np.ones(len(players_df), dtype=bool) if allowed is None else np.asarray(allowed, dtype=bool)
+    available = set(remaining_chips(gameweeks[0]) if available is None else available)
+    base_lineup = lineup_points(points[squad_slots(players_df, squad_ids)])
+    halves = np.array([season_half(gw) for gw in gameweeks])
+
+    bounds = {FREE_HIT: np.zeros(len(gameweeks)), WILDCARD: np.zeros(len(gameweeks))}
+    for step in range(len(gameweeks)):
+        top = _top_squad_rows(positions, points[:, step], allowed)
+        bounds[FREE_HIT][step] = lineup_points(points[top, step:step + 1])[0] - base_lineup[step]
+        window = slice(step, step + WILDCARD_HORIZON)
+        top = _top_squad_rows(positions, points[:, window].sum(axis=1), allowed)
+        bounds[WILDCARD][step] = (lineup_points(points[top, window]) - base_lineup[window]).sum()
+
+    squads = {}
+    for chip, count in [(WILDCARD, WILDCARD_CANDIDATES), (FREE_HIT, FREE_HIT_CANDIDATES)]:
+        for half in (0, 1):
+            if (chip, half) not in available:
+                continue
+            steps = np.flatnonzero(halves == half)
+            for step in steps[np.argsort(-bounds[chip][steps], kind='stable')[:count]]:
+                window = slice(step, step + (WILDCARD_HORIZON if chip == WILDCARD else 1))
+                ids = _solve_chip_squad(players_df, points[:, window].sum(axis=1), allowed, budget, time_limit)
+                if ids is not None:
+                    squads[(chip, int(gameweeks[step]))] = ids
+    return squads
+
+
+def plan_chips(players_df, squad_ids, points, gameweeks, budget, allowed=None, available=None, squads=None):
+    """Rozvrh chipů s nejvyšším očekávaným součtem bodů do konce sezóny
+
+    `points` je pole [hráč, GW] ve stejném pořadí jako players_df (viz
+    projection.project_points) a `gameweeks` čísla jeho sloupců. `budget`
+    je hodnota kádru plus banka. `available` je seznam (chip, polovina
+    sezóny), které ještě nebyly zahrány (výchozí všechny). `squads` jsou
+    kádry z dřívějšího plánu - s nimi se řešič nevolá.
+
+    Vrací slovník:
+        chips       [{chip, gw, gain}] seřazené podle GW
+        total       očekávané body s chipy
+        baseline    očekávané body stejného kádru bez chipů
+        squads      {(chip, gw): id hráčů} kádry pro Wildcard a Free Hit
+        solve_time  čas v sekundách
+    """
+    started = time.perf_counter()
+    points = np.asarray(points, dtype='float32')
+    gameweeks = [int(gw) for gw in gameweeks]
+    available = set(remaining_chips(gameweeks[0]) if available is None else available)
+    if squads is None:
+        squads = find_chip_squads(players_df, squad_ids, points, gameweeks, budget, allowed, available)
+    row_of = {int(pid): row for row, pid in enumerate(players_df['id'].to_numpy())}
+    step_of = {gw: step for step, gw in enumerate(gameweeks)}
+
+    def values(ids):
+        slots = squad_slots(players_df, ids)
+        return _squad_values(points[slots])
+
+    # Hodnoty po GW: aktivní kádr je původní (None) nebo wildcard kádr zahraný v GW w
+    squad_values = {None: values(squad_ids)}
+    free_hit = {}
+    for (chip, gw), ids in squads.items():
+        if gw not in step_of or any(int(pid) not in row_of for pid in ids):
+            continue
+        if chip == WILDCARD:
+            squad_values[gw] = values(ids)
+        elif chip == FREE_HIT:
+            free_hit[gw] = values(ids)[0][step_of[gw]]
+
+    bit = {(chip, half): 1 << (2 * i + half) for i, chip in enumerate(CHIPS) for half in (0, 1)}
+    used = sum(mask for key, mask in bit.items() if key not in available)
+
+    # Stav: (použité chipy, GW aktivního wildcardu) -> (body, zpětný ukazatel)
+    states = {(used, None): (0.0, None)}
+    history = []
+    for step, gw in enumerate(gameweeks):
+        half = season_half(gw)
+        next_states = {}
+
+        def offer(state, value, move):
+            if state not in next_states or value > next_states[state][0]:
+                next_states[state] = (value, move)
+
+        for origin, (earned, _) in states.items():
+            mask, wildcard = origin
+            if wildcard is not None and gw - wildcard >= WILDCARD_HORIZON:
+                wildcard = None
+            lineup, bench, captain = squad_values[wildcard]
+            base = float(lineup[step])
+            offer((mask, wildcard), earned + base, (origin, None, 0.0))
+
+            for chip, gain in [(BENCH_BOOST, bench[step]), (TRIPLE_CAPTAIN, captain[step]),
+                               (FREE_HIT, free_hit.get(gw, np.nan) - base)]:
+                if not mask & bit[(chip, half)] and not np.isnan(gain):
+                    offer((mask | bit[(chip, half)], wildcard), earned + base + float(gain), (origin, chip, float(gain)))
+            if gw in squad_values and not mask & bit[(WILDCARD, half)]:
+                wildcard_lineup = squad_values[gw][0]
+                window = slice(step, step + WILDCARD_HORIZON)
+                gain = float((wildcard_lineup[window] - squad_values[None][0][window]).sum())
+                offer((mask | bit[(WILDCARD, half)], gw), earned + float(wildcard_lineup[step]), (origin, WILDCARD, gain))
+        history.append(next_states)
+        states = next_states
+
+    # Zpětný průchod od nejlepšího koncového stavu
+    state = max(states, key=lambda key: states[key][0])
+    total = states[state][0]
+    chips = []
+    for step in range(len(gameweeks) - 1, -1, -1):
+        _, (origin, chip, gain) = history[step][state]
+        if chip is not None:
+            chips.append({'chip': chip, 'gw': gameweeks[step], 'gain': gain})
+        state = origin
+    chips.reverse()
+
+    return {
+        'chips': chips,
+        'total': total,
+        'baseline': float(squad_values[None][0].sum()),
+        'squads': squads,
+        'solve_time': time.perf_counter() - started
+    }
@@ -0,0 +1,197 @@
+"""Dávkový export bez webového serveru - kádr, predikce a matice zápasů pro jeden snapshot
+
+Spuštění z kořene repozitáře:
+    python -m fpl_predictor --snapshot latest --format parquet --out export/
+    python -m fpl_predictor --fetch --outputs squad plan
+
+Každý výstup je tabulka v souboru <výstup>.json (pole záznamů) nebo
+<výstup>.parquet (potřebuje pyarrow). Vedle se zapíše run.json s id
+snapshotů, souhrnem kádru a časy jednotlivých fází.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+
+import pandas as pd
+
+from fpl_predictor import core
+from fpl_predictor.fixtures import fixture_matrix_frame
+from fpl_predictor.optimizer import SQUAD_POSITIONS
+from fpl_predictor.projection import project_points
+from fpl_predictor.snapshots import SnapshotStore, KIND_BOOTSTRAP, KIND_FIXTURES, KIND_ELEMENT_SUMMARY
+from fpl_predictor.timing import StageTimer
+from fpl_predictor.weights import load_score_weights, weights_path
+from fpl_predictor.xp_model import model_path
+
+OUTPUTS = ['squad', 'predictions', 'fixtures', 'plan']
+DEFAULT_OUTPUTS = ['squad', 'predictions', 'fixtures']
+PREDICTION_COLUMNS = [
+    'id', 'name', 'web_name', 'team', 'position', 'price', 'form', 'selected_by_percent', 'status',
+    'predicted_points', 'value_score', 'value_per_million', 'net_transfers'
+]
+SQUAD_COLUMNS = ['id', 'name', 'web_name', 'team', 'position', 'price', 'expected_points', 'ai_score', 'starter', 'captain']
+
+
+def predictions_table(players_df, fixture_matrix, current_gw, horizon, model=None):
+    """Predikce všech hráčů a očekávané body po jednotlivých GW (sloupce xp_gw<N>)
+
+    S modelem z historie (xp_model) jsou body po GW přímo jeho predikcí pro
+    každý zápas, jinak predikce násobená obtížností soupeře.
+    """
+    if model is not None:
+        projected, gameweeks = model.project(players_df, fixture_matrix, current_gw, horizon)
+    else:
+        projected, gameweeks = project_points(players_df, fixture_matrix, current_gw, horizon)
+    table = players_df[PREDICTION_COLUMNS].copy()
+    for col, gw in enumerate(gameweeks):
+        table[f"xp_gw{gw}"] = projected[:, col]
+    return table.sort_values('predicted_points', ascending=False, kind='stable')
+
+
+def fixtures_table(fixture_matrix, teams_dict):
+    """Matice zápasů v dlouhém formátu doplněná o názvy týmů"""
+    table = fixture_matrix_frame(fixture_matrix)
+    table.insert(1, 'team', table['team_id'].map(teams_dict))
+    table.insert(5, 'opponent', table['opponent_id'].map(teams_dict))
+    return table
+
+
+def plan_table(plan, players_df):
+    """Transfer plán jako tabulka - jeden řádek na GW"""
+    names = players_df.set_index('id')['web_name']
+    return pd.DataFrame([
+        {
+            'gw': step['gw'],
+            'transfers_out': [int(out_id) for out_id, _ in step['transfers']],
+            'transfers_in': [int(in_id) for _, in_id in step['transfers']],
+            'names': [f"{names.get(out_id, '?')} -> {names.get(in_id, '?')}" for out_id, in_id in step['transfers']],
+            'free_transfers': step['free_transfers'],
+            'hits': step['hits'],
+            'expected_points': step['expected_points'],
+            'captain': step['captain'],
+            'bank': step['bank']
+        }
+        for step in plan['steps']
+    ])
+
+
+def write_table(table, path, file_format):
+    if file_format == 'parquet':
+        table.to_parquet(path, index=False)
+    else:
+        table.to_json(path, orient='records', force_ascii=False, indent=1)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m fpl_predictor', description=__doc__.splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter, epilog='\n'.join(__doc__.splitlines()[2:])
+    )
+    parser.add_argument('--snapshot', default='latest', help="id bootstrap snapshotu nebo 'latest'")
+    parser.add_argument('--fetch', action='store_true', help="nejdřív stáhnout čerstvá data z FPL API")
+    parser.add_argument('--snapshot-dir', help="adresář snapshotů (jinak FPL_SNAPSHOT_DIR)")
+    parser.add_argument('--out', default='.', help="adresář pro výstupy")
+    parser.add_argument('--format', choices=['json', 'parquet'], default='json')
+    parser.add_argument('--outputs', nargs='+', choices=OUTPUTS, default=DEFAULT_OUTPUTS)
+    parser.add_argument('--budget', type=float, default=100.0)
+    parser.add_argument('--time-limit', type=float, default=core.OPTIMIZER_TIME_LIMIT, help="limit řešiče v sekundách")
+    parser.add_argument('--horizon', type=int, default=5, help="počet GW predikcí a transfer plánu")
+    parser.add_argument('--free-transfers', type=int, default=1)
+    return parser, parser.parse_args(argv)
+
+
+def main(argv=None):
+    parser, args = parse_args(argv)
+    if args.format == 'parquet':
+        if importlib.util.find_spec('pyarrow') is None:
+            parser.error("Formát parquet potřebuje balíček pyarrow (pip install pyarrow)")
+
+    timer = StageTimer()
+    store = SnapshotStore(args.snapshot_dir)
+    with timer.span('load'):
+        try:
+            if args.fetch:
+                records = core.fetch_snapshots(store)
+                bootstrap, fixtures_snapshot = records[KIND_BOOTSTRAP], records[KIND_FIXTURES]
+                # Historie hráčů se stahuje pomalu (dotaz na hráče) - stačí poslední uložená
+                history_snapshot = core.load_snapshot(store, KIND_ELEMENT_SUMMARY)
+            else:
+                bootstrap = core.load_snapshot(store, KIND_BOOTSTRAP, args.snapshot)
+                fixtures_snapshot = core.load_snapshot(store, KIND_FIXTURES, args.snapshot)
+                history_snapshot = core.load_snapshot(store, KIND_ELEMENT_SUMMARY, args.snapshot)
+        except core.SnapshotNotFound as e:
+            parser.exit(1, f"{e}\n")
+    if not bootstrap:
+        parser.exit(1, f"Snapshot {args.snapshot} v {store.root} není\n")
+
+    score_weights = load_score_weights(weights_path(store.root))
+    pipeline = core.build_pipeline(
+        bootstrap, fixtures_snapshot, timer=timer, history_snapshot=history_snapshot,
+        model_path=model_path(store.root), score_weights=score_weights
+    )
+    with timer.span('process'):
+        players_df = pipeline['players']
+        current_gw = pipeline['current_gw']
+        planning_gw = pipeline['planning_gw']
+        fixture_matrix = pipeline['fixture_matrix']
+        model = pipeline['xp_model']
+
+    tables = {}
+    run = {
+        'bootstrap_id': bootstrap['id'],
+        'fixtures_id': fixtures_snapshot['id'] if fixtures_snapshot else None,
+        'fetched_at': bootstrap['fetched_at'],
+        'gameweek': current_gw,
+        'planning_gameweek': planning_gw,
+        'players': len(players_df),
+        'xp_model': {'trained_through': model.trained_through, 'rmse': model.rmse} if model is not None else None,
+        'score_weights': score_weights['version'] if score_weights else None
+    }
+
+    if 'predictions' in args.outputs:
+        with timer.span('predictions'):
+            tables['predictions'] = predictions_table(players_df, fixture_matrix, planning_gw, args.horizon, model)
+    if 'fixtures' in args.outputs:
+        with timer.span('fixtures'):
+            tables['fixtures'] = fixtures_table(fixture_matrix, pipeline['teams'])
+    if 'squad' in args.outputs or 'plan' in args.outputs:
+        with timer.span('optimize'):
+            _, cost, solution = core.create_ai_team(
+                players_df, fixture_matrix, planning_gw, args.budget, args.time_limit
+            )
+        squad = solution['squad'].sort_values('expected_points', ascending=False)
+        tables['squad'] = squad[SQUAD_COLUMNS]
+        run['squad'] = {
+            'players': len(squad),
+            'cost': round(float(cost), 1),
+            'objective': solution['objective'],
+            'optimal': solution['optimal'],
+            'gap': solution['gap'],
+            'message': solution['message']
+        }
+        if len(squad) < sum(SQUAD_POSITIONS.values()) and 'plan' in args.outputs:
+            print("Kádr není kompletní, transfer plán se nepočítá", file=sys.stderr)
+        elif 'plan' in args.outputs:
+            with timer.span('plan'):
+                plan = core.create_transfer_strategy(
+                    planning_gw, tuple(int(i) for i in squad['id']), round(args.budget - cost, 1),
+                    args.free_transfers, args.horizon, players_df, fixture_matrix
+                )
+            tables['plan'] = plan_table(plan, players_df)
+            run['plan'] = {'total': plan['total'], 'baseline': plan['baseline']}
+        if 'squad' not in args.outputs:
+            del tables['squad']
+
+    os.makedirs(args.out, exist_ok=True)
+    with timer.span('write'):
+        for name, table in tables.items():
+            write_table(table, os.path.join(args.out, f"{name}.{args.format}"), args.format)
+
+    run['files'] = sorted(f"{name}.{args.format}" for name in tables)
+    run['timings_s'] = {stage: round(seconds, 4) for stage, seconds in timer.as_dict().items()}
+    with open(os.path.join(args.out, 'run.json'), 'w', encoding='utf-8') as f:
+        json.dump(run, f, ensure_ascii=False, indent=1, default=str)
+    print(json.dumps(run, ensure_ascii=False, default=str))
+    return 0
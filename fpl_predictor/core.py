@@ -0,0 +1,303 @@
+"""Jádro bez UI - načtení snapshotu, zpracování, skóre, optimalizace a transfer plán
+
+Stejné kroky, jaké dělá dashboard, jen bez Streamlitu, takže je lze volat
+z cronu, benchmarků nebo CLI (python -m fpl_predictor). Chyby se hlásí
+výjimkou nebo v návratové hodnotě (např. neúplný kádr v `solution`),
+zobrazení je věcí volajícího.
+"""
+import pandas as pd
+
+from fpl_predictor.chips import LAST_GAMEWEEK, plan_chips
+from fpl_predictor.fixtures import (
+    process_fixtures_data, build_fixture_matrix, build_fixture_index, fixture_strips, blank_and_double_gameweeks
+)
+from fpl_predictor.optimizer import MAX_PER_CLUB
+from fpl_predictor.pipeline import Pipeline
+from fpl_predictor.planner import MAX_TRANSFERS_PER_GW, plan_transfers
+from fpl_predictor.players import process_players_data, add_player_scores, score_features, weighted_score
+from fpl_predictor.projection import project_points
+from fpl_predictor.simulation import simulate_ai_team
+from fpl_predictor.snapshots import KIND_BOOTSTRAP, KIND_FIXTURES, KIND_ELEMENT_SUMMARY
+from fpl_predictor.teams import build_team_aggregates
+from fpl_predictor.weights import tuned_weights
+from fpl_predictor.xp_model import apply_xp_model, train_xp_model
+
+# Kolik nejbližších GW se bere v úvahu při výběru kádru
+SQUAD_HORIZON = 3
+OPTIMIZER_TIME_LIMIT = 1.0
+POSITION_CODES = {'GK': 'Goalkeeper', 'DEF': 'Defender', 'MID': 'Midfielder', 'FWD': 'Forward'}
+# Váhy AI skóre zobrazovaného u hráčů AI týmu (výběr kádru ho nepoužívá)
+AI_SCORE_WEIGHTS = {
+    'predicted_points': 0.35,   # Predikovaná výkonnost
+    'form': 0.25,               # Aktuální forma
+    'price': 0.15,              # Prémiové hráči bonus
+    'differential': 0.15,       # Differential bonus
+    'transfer_trend': 0.1       # Transfer trend
+}
+
+
+class SnapshotNotFound(LookupError):
+    """Požadovaný snapshot v úložišti není (nebo se nepodařilo nic stáhnout)"""
+
+
+def find_snapshot_entry(store, kind, replay):
+    """Najde snapshot pro přehrávání - 'latest' nebo id bootstrap snapshotu"""
+    if replay == 'latest':
+        return store.latest(kind)
+
+    bootstrap_entry = store.find(KIND_BOOTSTRAP, replay)
+    if not bootstrap_entry:
+        return None
+    if kind == KIND_BOOTSTRAP:
+        return bootstrap_entry
+    # Ostatní endpointy bereme tak, jak vypadaly v okamžiku stažení bootstrapu
+    return store.latest(kind, at=bootstrap_entry['fetched_at'])
+
+
+def load_snapshot(store, kind, replay='latest'):
+    """Záznam {'id', 'fetched_at', 'data'} ze snapshotu na disku (None, pokud není)"""
+    entry = find_snapshot_entry(store, kind, replay)
+    if not entry:
+        return None
+    return dict(entry, data=store.load(kind, entry['id']))
+
+
+def fetch_snapshots(store, with_history=False, refresher=None):
+    """Jednorázově stáhne bootstrap a fixtures (volitelně i historii hráčů) do úložiště
+
+    Vrací záznamy podle druhu jako load_snapshot. Když se nepodaří získat
+    ani bootstrap, vyhodí SnapshotNotFound s poslední chybou.
+    """
+    from fpl_predictor.fetch import shared_refresher
+
+    # Sdílený refresher - souběžná obnova na pozadí se s touto sloučí do jednoho požadavku
+    refresher = refresher or shared_refresher(store)
+    refresher.refresh_all()
+    if with_history:
+        refresher.refresh_history()
+
+    kinds = [KIND_BOOTSTRAP, KIND_FIXTURES] + ([KIND_ELEMENT_SUMMARY] if with_history else [])
+    records = {kind: refresher.get(kind) for kind in kinds}
+    if not records[KIND_BOOTSTRAP]:
+        raise SnapshotNotFound(f"Bootstrap se nepodařilo stáhnout: {refresher.last_error.get(KIND_BOOTSTRAP)}")
+    return records
+
+
+def available_mask(players_df):
+    """Hráči, které má smysl kupovat - dostupní a s šancí na nasazení aspoň 75 %"""
+    chance = players_df['chance_of_playing_this_round']
+    return (players_df['status'] == 'a') & (chance.isna() | (chance >= 75))
+
+
+def get_current_gameweek(fpl_data):
+    """Najde aktuální gameweek"""
+    if not fpl_data:
+        return 1
+
+    current_gw = 1
+    for event in fpl_data['events']:
+        if event['is_current']:
+            current_gw = event['id']
+            break
+        elif event['is_next']:
+            current_gw = event['id']
+            break
+
+    return current_gw
+
+
+def get_planning_gameweek(fpl_data):
+    """Najde první GW, jehož deadline ještě neproběhl - od něj se plánuje
+
+    Aktuální GW bývá mezi deadliny už rozehraný nebo dohraný, transfery,
+    chipy a sestava platí až pro další. Na konci sezóny zůstane aktuální.
+    """
+    if not fpl_data:
+        return 1
+
+    for event in fpl_data['events']:
+        if event['is_next']:
+            return event['id']
+    return get_current_gameweek(fpl_data)
+
+
+def create_ai_team(players_df, fixture_matrix, current_gw, budget=100.0, time_limit=OPTIMIZER_TIME_LIMIT,
+                   max_per_club=MAX_PER_CLUB):
+    """Vytvoří AI doporučený tým podle oficiálních FPL pravidel 2025/26"""
+
+    # Oficiální FPL pravidla:
+    # - £100m budget
+    # - 15 hráčů: 2 GK, 5 DEF, 5 MID, 3 FWD
+    # - Max 3 z jednoho týmu
+    # - Starting XI: 1 GK, min 3 DEF, min 2 MID, min 1 FWD, max 11 celkem
+
+    # Filtrace dostupných hráčů (bez zraněných a suspendovaných)
+    available_players = players_df[available_mask(players_df)].copy()
+
+    if available_players.empty:
+        # Fallback pokud nejsou dostupní hráči
+        available_players = players_df.copy()
+
+    # AI skóring pro zobrazení u hráčů
+    available_players['ai_score'] = weighted_score(score_features(available_players), AI_SCORE_WEIGHTS)
+
+    # Očekávané body na kolo v nejbližších GW podle soupeřů (blank = 0, double = víc)
+    projected, gameweeks = project_points(available_players, fixture_matrix, current_gw, SQUAD_HORIZON)
+    available_players['expected_points'] = projected.sum(axis=1) / max(len(gameweeks), 1)
+
+    # Přesné řešení: kádr + základní sestava + kapitán najednou
+    from fpl_predictor.optimizer import solve_squad
+
+    solution = solve_squad(available_players, budget, 'expected_points', time_limit, max_per_club=max_per_club)
+    squad = solution['squad'].sort_values('expected_points', ascending=False)
+
+    team = {
+        pos: [player for _, player in squad[squad['position'] == position_name].iterrows()]
+        for pos, position_name in POSITION_CODES.items()
+    }
+
+    return team, solution['cost'], solution
+
+
+def get_optimal_formation(team):
+    """Starting XI z výsledku optimalizace (řešič už respektuje FPL formaci)"""
+    return {
+        pos: [player for player in team.get(pos, []) if player['starter']]
+        for pos in ['GK', 'DEF', 'MID', 'FWD']
+    }
+
+
+def get_squad_next_fixtures(players, fixture_index, teams_dict, current_gw, count=4):
+    """Získá následující fixtures pro celou skupinu hráčů jedním dávkovým dotazem"""
+    if not players:
+        return {}
+
+    strips = fixture_strips(fixture_index, [player['team_id'] for player in players], current_gw, count)
+
+    fixtures_by_player = {}
+    for row, player in enumerate(players):
+        fixtures_info = []
+        for col in range(count):
+            if not strips['valid'][row, col]:
+                break
+            opponent = teams_dict.get(int(strips['opponent'][row, col]), 'Unknown')
+            fixtures_info.append({
+                'gw': int(strips['gw'][row, col]),
+                'opponent': opponent[:3].upper(),
+                'is_home': bool(strips['is_home'][row, col]),
+                'difficulty': int(strips['fdr'][row, col])
+            })
+        fixtures_by_player[player['id']] = fixtures_info
+
+    return fixtures_by_player
+
+
+def create_transfer_strategy(current_gw, squad_ids, bank, free_transfers, horizon, players_df, fixture_matrix,
+                             max_transfers=MAX_TRANSFERS_PER_GW):
+    """Vytvoří transfer plán pro následující gameweeks podle kádru a fixtures"""
+
+    # FPL 2025/26 pravidla:
+    # - 1 free transfer každý GW
+    # - Můžeš "bankovat" max 5 FT
+    # - Extra transfery = -4 body každý
+    # - GW16: Bonus 5 FT kvůli AFCON
+
+    projected, gameweeks = project_points(players_df, fixture_matrix, current_gw, horizon)
+
+    # Kupovat se dají jen dostupní hráči (stejný filtr jako u AI týmu)
+    allowed = available_mask(players_df).to_numpy()
+
+    return plan_transfers(
+        players_df, list(squad_ids), projected, gameweeks, bank, free_transfers, allowed, max_transfers=max_transfers
+    )
+
+
+def create_chip_plan(current_gw, squad_ids, bank, players_df, fixture_matrix, available=None, squads=None):
+    """Rozvrh chipů od GW current_gw (nejbližší před deadlinem) do konce sezóny pro daný kádr
+
+    `squads` jsou kádry pro Wildcard a Free Hit z dřívějšího plánu (plan['squads']) -
+    s nimi je přepočet po změně dostupných chipů nebo projekcí bez řešiče.
+    """
+    projected, gameweeks = project_points(players_df, fixture_matrix, current_gw, LAST_GAMEWEEK - current_gw + 1)
+    if not gameweeks:
+        return None
+
+    prices = players_df.set_index('id')['price']
+    budget = float(prices.loc[list(squad_ids)].sum()) + bank
+    allowed = available_mask(players_df).to_numpy()
+    return plan_chips(players_df, list(squad_ids), projected, gameweeks, budget, allowed, available, squads)
+
+
+def build_pipeline(bootstrap, fixtures_snapshot, cache=None, timer=None, history_snapshot=None, model_path=None,
+                   score_weights=None):
+    """Graf odvozených dat nad snapshoty bootstrapu a fixtures (fixtures může chybět)
+
+    Uzly: player_stats, xp_model, player_predictions, players, teams,
+    current_gw, planning_gw, fixtures_df, fixture_matrix, fixture_index,
+    team_aggregates, special_gws, ai_team, optimal_xi, xi_fixtures,
+    squad_simulation. Volající si může
+    přidat vlastní uzly. AI tým a simulace začínají v planning_gw.
+
+    S historií hráčů (snapshot element-summary) bere predikce bodů z modelu
+    xp_model, jinak z formy a ceny. `model_path` je soubor, ve kterém se
+    model mezi snapshoty doučuje jen o nová kola. `score_weights` je
+    konfigurace vyladěných vah (weights.load_score_weights) - její verze je
+    součástí klíče cache, takže nové váhy přepočítají value skóre (players).
+    AI tým na vahách nezávisí - řešič maximalizuje očekávané body.
+    """
+    pipeline = Pipeline(cache, timer)
+    pipeline.input('bootstrap', bootstrap['id'], bootstrap['data'])
+    pipeline.input(
+        'fixtures',
+        fixtures_snapshot['id'] if fixtures_snapshot else None,
+        fixtures_snapshot['data'] if fixtures_snapshot else None
+    )
+    pipeline.input(
+        'history',
+        history_snapshot['id'] if history_snapshot else None,
+        history_snapshot['data'] if history_snapshot else None
+    )
+    pipeline.input(
+        'score_weights',
+        f"v{score_weights['version']}" if score_weights else None,
+        score_weights
+    )
+
+    pipeline.node('player_stats', ['bootstrap'], process_players_data)
+    pipeline.node(
+        'xp_model', ['history', 'fixtures', 'player_stats'],
+        lambda history, fixtures_raw, player_stats: train_xp_model(history, fixtures_raw, player_stats, model_path)
+    )
+    pipeline.node('player_predictions', ['player_stats', 'xp_model'], apply_xp_model)
+    pipeline.node(
+        'players', ['player_predictions', 'score_weights'],
+        lambda predictions, weights: add_player_scores(predictions, tuned_weights(weights, 'value_score'))
+    )
+    pipeline.node('teams', ['bootstrap'], lambda fpl_data: {team['id']: team['name'] for team in fpl_data['teams']})
+    pipeline.node('current_gw', ['bootstrap'], get_current_gameweek)
+    pipeline.node('planning_gw', ['bootstrap'], get_planning_gameweek)
+    pipeline.node(
+        'fixtures_df', ['fixtures', 'teams'],
+        lambda fixtures_raw, teams_dict: process_fixtures_data(fixtures_raw, teams_dict) if fixtures_raw else pd.DataFrame()
+    )
+    pipeline.node('fixture_matrix', ['fixtures'], build_fixture_matrix)
+    pipeline.node('fixture_index', ['fixture_matrix'], build_fixture_index)
+    pipeline.node(
+        'team_aggregates', ['players', 'fixture_matrix', 'teams', 'current_gw'],
+        lambda players_df, matrix, teams_dict, gw: build_team_aggregates(players_df, matrix, teams_dict, gw, horizon=5)
+    )
+    pipeline.node('special_gws', ['fixture_matrix', 'current_gw'], blank_and_double_gameweeks)
+
+    # AI tým - jediný drahý uzel, počítá se až na vyžádání. Závisí jen na
+    # predikcích bez vah skóre, takže nová verze vah řešič znovu nespouští.
+    pipeline.node('ai_team', ['player_predictions', 'fixture_matrix', 'planning_gw'], create_ai_team)
+    pipeline.node('optimal_xi', ['ai_team'], lambda ai_team: get_optimal_formation(ai_team[0]))
+    pipeline.node(
+        'xi_fixtures', ['optimal_xi', 'fixture_index', 'teams', 'current_gw'],
+        lambda xi, index, teams_dict, gw: get_squad_next_fixtures(
+            [player for players in xi.values() for player in players], index, teams_dict, gw, 3
+        )
+    )
+    # Monte Carlo rozdělení bodů AI kádru a volby kapitána v nejbližším GW před deadlinem
+    pipeline.node('squad_simulation', ['ai_team', 'fixture_matrix', 'planning_gw'], simulate_ai_team)
+    return pipeline
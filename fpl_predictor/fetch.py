@@ -0,0 +1,461 @@
+"""Stahování dat z FPL API
+
+BackgroundRefresher drží poslední dobrá data v paměti a obnovuje je ve
+vlákně na pozadí (stale-while-revalidate). Používá jednu sdílenou
+requests.Session s poolem spojení a podmíněné požadavky (ETag /
+If-Modified-Since), takže při odpovědi 304 se JSON vůbec neparsuje.
+
+fetch_all stahuje bootstrap, fixtures a element-summary všech hráčů
+souběžně přes pool vláken s omezením počtu požadavků za sekundu.
+
+Na proces stačí jeden refresher (shared_refresher) - dashboard, služba i
+dávkové skripty pak sdílí stejná data v paměti bez kopií. Obnova je
+single-flight: souběžná volání stejné obnovy počkají na tu běžící, takže
+na API jde vždy jen jeden požadavek. Všechna stahování se dělí o jeden
+limiter (API_LIMITER).
+"""
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from fpl_predictor.snapshots import (
+    content_hash, snapshot_age, utc_timestamp, KIND_BOOTSTRAP, KIND_FIXTURES, KIND_ELEMENT_SUMMARY
+)
+
+logger = logging.getLogger(__name__)
+
+FPL_API_URL = os.environ.get('FPL_API_URL', "https://fantasy.premierleague.com/api/")
+REQUEST_TIMEOUT = 10
+
+# Souběžnost a rychlost hromadného stahování element-summary
+MAX_WORKERS = 16
+REQUESTS_PER_SECOND = 40.0
+
+# Endpointy, které refresher udržuje aktuální
+ENDPOINTS = {
+    KIND_BOOTSTRAP: "bootstrap-static/",
+    KIND_FIXTURES: "fixtures/"
+}
+
+
+def element_summary_endpoint(player_id):
+    return f"element-summary/{player_id}/"
+
+
+def create_session(pool_size=MAX_WORKERS):
+    """Vytvoří session s poolem spojení pro FPL API"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = 'FPL-Predictor'
+    return session
+
+
+class RateLimiter:
+    """Token bucket - omezuje počet požadavků za sekundu napříč vlákny"""
+
+    def __init__(self, rate=REQUESTS_PER_SECOND, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Počká, dokud není volný token"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# Jeden limit pro celý proces, ať stahuje kdokoli (FPL_REQUESTS_PER_SECOND)
+API_LIMITER = RateLimiter(float(os.environ.get('FPL_REQUESTS_PER_SECOND', REQUESTS_PER_SECOND)))
+
+
+def endpoint_group(endpoint):
+    """'element-summary/123/' -> 'element-summary', ostatní beze změny"""
+    return endpoint.split('/')[0] if endpoint.startswith('element-summary/') else endpoint
+
+
+def timed_get(session, url, limiter=None, headers=None):
+    """GET s čekáním na rate limiter; vrací (response, záznam o čase)"""
+    if limiter:
+        limiter.acquire()
+    started = time.perf_counter()
+    try:
+        response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        return None, {'seconds': time.perf_counter() - started, 'status': None, 'bytes': 0, 'error': str(e)}
+    return response, {
+        'seconds': time.perf_counter() - started,
+        'status': response.status_code,
+        'bytes': len(response.content)
+    }
+
+
+def summarize_timings(timings):
+    """Shrne časy požadavků podle endpointu (počet, chyby, součet, medián, maximum)"""
+    groups = {}
+    for timing in timings:
+        groups.setdefault(endpoint_group(timing['endpoint']), []).append(timing)
+
+    summary = []
+    for endpoint, items in groups.items():
+        seconds = sorted(t['seconds'] for t in items)
+        summary.append({
+            'endpoint': endpoint,
+            'requests': len(items),
+            'errors': sum(1 for t in items if t.get('error') or (t['status'] or 0) >= 400),
+            'total_s': sum(seconds),
+            'p50_s': seconds[len(seconds) // 2],
+            'max_s': seconds[-1],
+            'bytes': sum(t['bytes'] for t in items)
+        })
+    return summary
+
+
+def _fetch_json(session, base_url, endpoint, limiter, timings):
+    response, timing = timed_get(session, f"{base_url}{endpoint}", limiter)
+    timing['endpoint'] = endpoint
+    timings.append(timing)
+    if response is None or not response.ok:
+        return None
+    try:
+        return response.json()
+    except ValueError as e:
+        # 200 s HTML stránkou nebo useknutým tělem - jako neúspěšný požadavek, ne pád celé obnovy
+        timing['error'] = f"Neplatný JSON: {e}"
+        return None
+
+
+def compact_element_summary(summary):
+    """Z element-summary necháme jen historii - nadcházející zápasy jsou ve fixtures/"""
+    return {
+        'history': summary.get('history', []),
+        'history_past': summary.get('history_past', [])
+    }
+
+
+def fetch_element_summaries(player_ids, session=None, base_url=FPL_API_URL,
+                            max_workers=MAX_WORKERS, limiter=None, timings=None):
+    """Souběžně stáhne element-summary pro všechny zadané hráče"""
+    session = session or create_session(max_workers)
+    limiter = limiter or API_LIMITER
+    timings = timings if timings is not None else []
+
+    summaries = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_fetch_json, session, base_url, element_summary_endpoint(pid), limiter, timings): pid
+            for pid in player_ids
+        }
+        for future in as_completed(futures):
+            summary = future.result()
+            if summary is not None:
+                summaries[futures[future]] = compact_element_summary(summary)
+    return summaries
+
+
+def fetch_all(session=None, base_url=FPL_API_URL, max_workers=MAX_WORKERS, limiter=None, with_history=True):
+    """Stáhne bootstrap, fixtures a historii všech hráčů souběžně
+
+    Element-summary se začnou stahovat hned, jak dorazí bootstrap (kvůli
+    seznamu hráčů), zatímco fixtures ještě můžou běžet. Vrací data a časy
+    jednotlivých požadavků.
+    """
+    session = session or create_session(max_workers)
+    limiter = limiter or API_LIMITER
+    timings = []
+    started = time.perf_counter()
+
+    result = {KIND_BOOTSTRAP: None, KIND_FIXTURES: None, KIND_ELEMENT_SUMMARY: {}}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        bootstrap_future = pool.submit(_fetch_json, session, base_url, ENDPOINTS[KIND_BOOTSTRAP], limiter, timings)
+        fixtures_future = pool.submit(_fetch_json, session, base_url, ENDPOINTS[KIND_FIXTURES], limiter, timings)
+
+        result[KIND_BOOTSTRAP] = bootstrap_future.result()
+        summary_futures = {}
+        if with_history and result[KIND_BOOTSTRAP]:
+            summary_futures = {
+                pool.submit(_fetch_json, session, base_url, element_summary_endpoint(p['id']), limiter, timings): p['id']
+                for p in result[KIND_BOOTSTRAP]['elements']
+            }
+
+        result[KIND_FIXTURES] = fixtures_future.result()
+        for future in as_completed(summary_futures):
+            summary = future.result()
+            if summary is not None:
+                result[KIND_ELEMENT_SUMMARY][summary_futures[future]] = compact_element_summary(summary)
+
+    result['timings'] = timings
+    result['wall_s'] = time.perf_counter() - started
+    return result
+
+
+class BackgroundRefresher:
+    """Obnovuje data z FPL API na pozadí, čtenáři vždy dostanou poslední dobrý payload"""
+
+    def __init__(self, store, interval=300, session=None, base_url=FPL_API_URL, endpoints=None,
+                 history_interval=None, max_workers=MAX_WORKERS, limiter=None):
+        self.store = store
+        self.interval = interval
+        self.history_interval = history_interval
+        self.base_url = base_url
+        self.endpoints = endpoints or ENDPOINTS
+        self.max_workers = max_workers
+        self.session = session or create_session(max_workers)
+        self.limiter = limiter or API_LIMITER
+
+        # kind -> {'id', 'fetched_at', 'checked_at', 'data'}
+        self._payloads = {}
+        # kind -> {'etag', 'last_modified'}
+        self._validators = {}
+        self.last_error = {}
+        # Časy požadavků z posledních obnov, pro zobrazení v UI
+        self.last_timings = []
+        # Čas (monotonic) posledního pokusu o stažení historie, i neúspěšného
+        self._history_attempted = None
+
+        self._lock = threading.Lock()
+        self._refresh_locks = {kind: threading.Lock() for kind in list(self.endpoints) + [KIND_ELEMENT_SUMMARY]}
+        # Výsledek poslední obnovy podle druhu pro ty, kdo na ni čekali
+        self._flight_results = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _tracked_kinds(self):
+        kinds = list(self.endpoints)
+        if self.history_interval:
+            kinds.append(KIND_ELEMENT_SUMMARY)
+        return kinds
+
+    def start(self):
+        """Načte poslední snapshoty z disku a spustí vlákno na pozadí"""
+        self.load_snapshots()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='fpl-refresher', daemon=True)
+            self._thread.start()
+        return self
+
+    def load_snapshots(self):
+        """Převezme poslední uložené snapshoty jako výchozí payloady (bez HTTP)"""
+        for kind in self._tracked_kinds():
+            entry = self.store.latest(kind)
+            if not entry:
+                continue
+            try:
+                data = self.store.load(kind, entry['id'])
+            except (OSError, ValueError) as e:
+                logger.warning("Snapshot %s/%s nelze načíst: %s", kind, entry['id'], e)
+                continue
+            self._payloads[kind] = {
+                'id': entry['id'],
+                'fetched_at': entry['fetched_at'],
+                'checked_at': entry['fetched_at'],
+                'data': data
+            }
+            self._validators[kind] = entry.get('validators', {})
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def request_refresh(self):
+        """Probudí vlákno na pozadí, aby hned obnovilo data"""
+        self._wake.set()
+
+    def get(self, kind):
+        """Vrátí poslední dobrý payload; blokuje jen tehdy, když zatím žádný není"""
+        record = self._payloads.get(kind)
+        if record is None and kind in self.endpoints:
+            # Úplně první start bez snapshotu na disku - jinou možnost nemáme
+            self.refresh(kind)
+            record = self._payloads.get(kind)
+        return record
+
+    def _store_payload(self, kind, raw, data, validators=None):
+        entry = self.store.save(kind, raw, validators=validators)
+        with self._lock:
+            self._payloads[kind] = {
+                'id': entry['id'],
+                'fetched_at': entry['fetched_at'],
+                'checked_at': entry['fetched_at'],
+                'data': data
+            }
+
+    def _mark_checked(self, kind):
+        with self._lock:
+            self._payloads[kind] = dict(self._payloads[kind], checked_at=utc_timestamp())
+
+    def _single_flight(self, kind, refresh):
+        """Spustí obnovu, nebo počká na už běžící obnovu stejného druhu a vrátí její výsledek"""
+        lock = self._refresh_locks[kind]
+        if lock.acquire(blocking=False):
+            try:
+                self._flight_results[kind] = result = refresh()
+                return result
+            finally:
+                lock.release()
+        # Obnova už běží - druhý požadavek na API neposíláme
+        with lock:
+            return self._flight_results.get(kind, False)
+
+    def refresh(self, kind):
+        """Podmíněně stáhne jeden endpoint; vrací True, pokud se data změnila"""
+        return self._single_flight(kind, lambda: self._refresh(kind))
+
+    def _refresh(self, kind):
+        headers = {}
+        validators = self._validators.get(kind, {})
+        if kind in self._payloads:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+
+        endpoint = self.endpoints[kind]
+        response, timing = timed_get(self.session, f"{self.base_url}{endpoint}", self.limiter, headers)
+        timing['endpoint'] = endpoint
+        self.last_timings = [t for t in self.last_timings if t['endpoint'] != endpoint] + [timing]
+
+        if response is None or (response.status_code != 304 and not response.ok):
+            error = timing.get('error') or f"HTTP {response.status_code}"
+            self.last_error[kind] = error
+            logger.warning("Obnova %s selhala: %s", kind, error)
+            return False
+        self.last_error.pop(kind, None)
+
+        if response.status_code == 304:
+            # Beze změny - neparsujeme, jen si poznačíme čas kontroly
+            self._mark_checked(kind)
+            return False
+
+        raw = response.content
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+        validators = {k: v for k, v in validators.items() if v}
+
+        current = self._payloads.get(kind)
+        if current and current['id'] == content_hash(raw):
+            # Server nepodporuje 304, ale obsah je stejný - parsování si ušetříme
+            self._validators[kind] = validators
+            self._mark_checked(kind)
+            return False
+
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            # Poslední dobrý payload zůstává a validátory neplatného těla se nepřevezmou,
+            # jinak by další požadavek dostal 304 a opravená data by nikdy nedorazila
+            self.last_error[kind] = f"Neplatný JSON: {e}"
+            logger.warning("Obnova %s vrátila neplatný JSON: %s", kind, e)
+            return False
+        self._validators[kind] = validators
+        self._store_payload(kind, raw, data, validators)
+        return True
+
+    def refresh_all(self):
+        """Obnoví všechny endpointy souběžně"""
+        with ThreadPoolExecutor(max_workers=len(self.endpoints)) as pool:
+            changed = list(pool.map(self.refresh, self.endpoints))
+        return any(changed)
+
+    def history_due(self):
+        if not self.history_interval:
+            return False
+        # Interval se počítá od poslední kontroly, ne od poslední změny - jinak by se
+        # po history_interval bez nových zápasů stahovala celá historie každý cyklus
+        if self._history_attempted is not None and time.monotonic() - self._history_attempted < self.history_interval:
+            return False
+        record = self._payloads.get(KIND_ELEMENT_SUMMARY)
+        if record is None:
+            return True
+        return snapshot_age({'fetched_at': record['checked_at']}) >= self.history_interval
+
+    def refresh_history(self):
+        """Stáhne element-summary všech hráčů a uloží je jako jeden snapshot"""
+        bootstrap = self._payloads.get(KIND_BOOTSTRAP)
+        if not bootstrap:
+            return False
+        return self._single_flight(KIND_ELEMENT_SUMMARY, lambda: self._refresh_history(bootstrap))
+
+    def _refresh_history(self, bootstrap):
+        self._history_attempted = time.monotonic()
+        timings = []
+        summaries = fetch_element_summaries(
+            [p['id'] for p in bootstrap['data']['elements']],
+            session=self.session,
+            base_url=self.base_url,
+            max_workers=self.max_workers,
+            limiter=self.limiter,
+            timings=timings
+        )
+        self.last_timings = [
+            t for t in self.last_timings if endpoint_group(t['endpoint']) != KIND_ELEMENT_SUMMARY
+        ] + timings
+        if not summaries:
+            self.last_error[KIND_ELEMENT_SUMMARY] = "Žádná historie hráčů nebyla stažena"
+            return False
+        self.last_error.pop(KIND_ELEMENT_SUMMARY, None)
+
+        # Chybějící hráče (chyba požadavku) doplníme z předchozího snapshotu
+        current = self._payloads.get(KIND_ELEMENT_SUMMARY)
+        data = dict(current['data']) if current else {}
+        data.update({str(pid): summary for pid, summary in summaries.items()})
+
+        raw = json.dumps(data, separators=(',', ':'), sort_keys=True).encode('utf-8')
+        if current and current['id'] == content_hash(raw):
+            self._mark_checked(KIND_ELEMENT_SUMMARY)
+            return False
+        self._store_payload(KIND_ELEMENT_SUMMARY, raw, data)
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.refresh_all()
+                if self.history_due():
+                    self.refresh_history()
+            except Exception:
+                # Vlákno nesmí umřít, jinak by data navždy zůstala stará
+                logger.exception("Neočekávaná chyba při obnově dat")
+            self._wake.wait(max(0.0, self.interval - (time.monotonic() - started)))
+            self._wake.clear()
+
+
+_shared_refreshers = {}
+_shared_lock = threading.Lock()
+
+
+def shared_refresher(store, **options):
+    """Jediný spuštěný BackgroundRefresher na proces pro dané úložiště snapshotů
+
+    Všechny session dashboardu, služba i skripty v jednom procesu čtou
+    stejné payloady (jen pro čtení, bez kopií). `options` se použijí jen
+    při vytvoření; pozdější volání s historií ji u existujícího zapnou.
+    """
+    with _shared_lock:
+        refresher = _shared_refreshers.get(store.root)
+        if refresher is None:
+            refresher = _shared_refreshers[store.root] = BackgroundRefresher(store, **options).start()
+        elif options.get('history_interval') and not refresher.history_interval:
+            refresher.history_interval = options['history_interval']
+        return refresher
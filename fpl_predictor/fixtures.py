@@ -0,0 +1,291 @@
+"""Zápasy celé sezóny jako husté NumPy matice tým x gameweek
+
+Matice se staví jednou pro každý snapshot fixtures a indexují se přímo id
+týmu a číslem GW (řádek i sloupec 0 jsou nevyužité). Poslední rozměr jsou
+sloty pro více zápasů v jednom kole, takže blank GW (count == 0) i double
+GW (count == 2) jsou vidět bez dalšího hledání.
+"""
+import numpy as np
+import pandas as pd
+
+N_GAMEWEEKS = 38
+# Double GW = 2 zápasy, výjimečně i 3
+MAX_FIXTURES_PER_GW = 3
+
+
+def process_fixtures_data(fixtures_data, teams_dict):
+    """Zpracuje data o zápasech celé sezóny"""
+    if not fixtures_data:
+        return pd.DataFrame()
+
+    fixtures = []
+    for fixture in fixtures_data:
+        home_team = teams_dict.get(fixture['team_h'], 'Unknown')
+        away_team = teams_dict.get(fixture['team_a'], 'Unknown')
+
+        home_difficulty = fixture['team_h_difficulty']
+        away_difficulty = fixture['team_a_difficulty']
+        avg_difficulty = (home_difficulty + away_difficulty) / 2
+
+        fixtures.append({
+            'id': fixture['id'],
+            'gameweek': fixture['event'],
+            'home_team': home_team,
+            'away_team': away_team,
+            'home_team_id': fixture['team_h'],
+            'away_team_id': fixture['team_a'],
+            'difficulty': round(avg_difficulty),
+            'home_difficulty': home_difficulty,
+            'away_difficulty': away_difficulty,
+            'kickoff_time': fixture['kickoff_time'],
+            'finished': fixture['finished'],
+            'started': fixture['started']
+        })
+
+    return pd.DataFrame(fixtures)
+
+
+def build_fixture_matrix(fixtures_data, n_teams=20, n_gameweeks=N_GAMEWEEKS, max_slots=MAX_FIXTURES_PER_GW):
+    """Postaví matice soupeřů, domácího prostředí, FDR a počtu zápasů
+
+    Vrací slovník:
+        opponent [tým, GW, slot]  id soupeře (0 = žádný zápas)
+        is_home  [tým, GW, slot]  True pro domácí zápas
+        fdr      [tým, GW, slot]  obtížnost z pohledu týmu (0 = žádný zápas)
+        finished [tým, GW, slot]  zápas už je odehraný
+        kickoff  [tým, GW, slot]  výkop v sekundách od epochy UTC (0 = neznámý)
+        count    [tým, GW]        počet zápasů v kole (0 = blank, 2+ = double)
+        unscheduled               odložené zápasy bez GW jako (domácí, hosté)
+    """
+    fixtures_data = fixtures_data or []
+    scheduled = [f for f in fixtures_data if f['event']]
+
+    event = np.array([f['event'] for f in scheduled], dtype='int16')
+    team_h = np.array([f['team_h'] for f in scheduled], dtype='int16')
+    team_a = np.array([f['team_a'] for f in scheduled], dtype='int16')
+    if len(scheduled):
+        n_teams = max(n_teams, int(team_h.max()), int(team_a.max()))
+        n_gameweeks = max(n_gameweeks, int(event.max()))
+
+    # Každý zápas dvakrát - jednou z pohledu domácích, jednou hostů
+    team = np.concatenate([team_h, team_a])
+    opponent = np.concatenate([team_a, team_h])
+    gw = np.concatenate([event, event])
+    is_home = np.concatenate([np.ones(len(scheduled), bool), np.zeros(len(scheduled), bool)])
+    fdr = np.array(
+        [f['team_h_difficulty'] for f in scheduled] + [f['team_a_difficulty'] for f in scheduled],
+        dtype='int8'
+    )
+    finished = np.array([bool(f['finished']) for f in scheduled] * 2, dtype=bool)
+    fixture_id = np.array([f['id'] for f in scheduled] * 2, dtype='int32')
+    kickoff_times = pd.to_datetime([f.get('kickoff_time') for f in scheduled], utc=True, errors='coerce')
+    kickoff_seconds = (kickoff_times - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)
+    kickoff = np.tile(np.nan_to_num(np.asarray(kickoff_seconds, dtype='float64')), 2).astype('int64')
+
+    # Pořadí zápasu v rámci (tým, GW) určuje slot; id zápasů jdou chronologicky
+    key = team.astype('int32') * (n_gameweeks + 1) + gw
+    order = np.lexsort((fixture_id, key))
+    sorted_key = key[order]
+    slot = np.arange(len(order)) - np.searchsorted(sorted_key, sorted_key, side='left')
+    keep = slot < max_slots
+    idx, slot = order[keep], slot[keep]
+
+    shape = (n_teams + 1, n_gameweeks + 1, max_slots)
+    matrix = {
+        'opponent': np.zeros(shape, dtype='int8'),
+        'is_home': np.zeros(shape, dtype=bool),
+        'fdr': np.zeros(shape, dtype='int8'),
+        'finished': np.zeros(shape, dtype=bool),
+        'kickoff': np.zeros(shape, dtype='int64'),
+        'count': np.zeros(shape[:2], dtype='int8')
+    }
+    target = (team[idx], gw[idx], slot)
+    matrix['opponent'][target] = opponent[idx]
+    matrix['is_home'][target] = is_home[idx]
+    matrix['fdr'][target] = fdr[idx]
+    matrix['finished'][target] = finished[idx]
+    matrix['kickoff'][target] = kickoff[idx]
+    np.add.at(matrix['count'], (team, gw), 1)
+
+    # Matice sdílí všechny session, nikdo je nesmí měnit
+    for array in matrix.values():
+        array.flags.writeable = False
+
+    matrix['n_teams'] = n_teams
+    matrix['n_gameweeks'] = n_gameweeks
+    matrix['unscheduled'] = [(f['team_h'], f['team_a']) for f in fixtures_data if not f['event']]
+    return matrix
+
+
+def gameweek_window(matrix, from_gw, horizon):
+    """Platný rozsah GW [from_gw, from_gw + horizon) oříznutý na sezónu"""
+    start = max(1, from_gw)
+    end = min(matrix['n_gameweeks'] + 1, from_gw + horizon)
+    return slice(start, max(start, end))
+
+
+def team_fixture_difficulty(matrix, from_gw, horizon=5):
+    """Průměrné FDR a počet zápasů každého týmu v okně GW (index = id týmu)"""
+    window = gameweek_window(matrix, from_gw, horizon)
+    fdr = matrix['fdr'][:, window, :].astype('float32')
+    played = fdr > 0
+    fixtures_count = played.sum(axis=(1, 2))
+    fdr_sum = fdr.sum(axis=(1, 2))
+    avg_difficulty = np.divide(fdr_sum, fixtures_count, out=np.zeros_like(fdr_sum), where=fixtures_count > 0)
+    return avg_difficulty, fixtures_count
+
+
+def blank_and_double_gameweeks(matrix, from_gw=1):
+    """Seznam blank a double GW: {gw: {'blank': [id týmů], 'double': [id týmů]}}"""
+    count = matrix['count'][1:, :]
+    result = {}
+    for gw in range(max(1, from_gw), matrix['n_gameweeks'] + 1):
+        blank = np.flatnonzero(count[:, gw] == 0) + 1
+        double = np.flatnonzero(count[:, gw] >= 2) + 1
+        if len(blank) or len(double):
+            result[gw] = {'blank': blank.tolist(), 'double': double.tolist()}
+    return result
+
+
+def fixture_ticker(matrix, teams_dict, from_gw, horizon=6):
+    """Přehled soupeřů týmů na další GW jako tabulka pro zobrazení (řádky = týmy)"""
+    window = gameweek_window(matrix, from_gw, horizon)
+    short_names = {team_id: name[:3].upper() for team_id, name in teams_dict.items()}
+
+    rows = {}
+    for team_id, team_name in teams_dict.items():
+        cells = []
+        for gw in range(window.start, window.stop):
+            labels = []
+            for slot in range(min(matrix['count'][team_id, gw], matrix['opponent'].shape[2])):
+                opponent = short_names.get(int(matrix['opponent'][team_id, gw, slot]), '???')
+                venue = 'H' if matrix['is_home'][team_id, gw, slot] else 'A'
+                labels.append(f"{opponent} ({venue}) {matrix['fdr'][team_id, gw, slot]}")
+            cells.append(' + '.join(labels) if labels else '—')
+        rows[team_name] = cells
+
+    return pd.DataFrame.from_dict(
+        rows, orient='index', columns=[f"GW{gw}" for gw in range(window.start, window.stop)]
+    )
+
+
+def gameweek_fixtures(matrix, teams_dict, gw):
+    """Zápasy jednoho GW jako tabulka pro zobrazení (řádek = zápas) seřazená podle výkopu
+
+    Zápasy se berou z pohledu domácích, FDR hostů z jejich slotu proti
+    stejnému soupeři. `difficulty` je zaokrouhlený průměr obou FDR.
+    """
+    if not 1 <= gw <= matrix['n_gameweeks']:
+        gw = 0  # sloupec GW0 je vždy prázdný
+    home, slot = np.nonzero(matrix['is_home'][:, gw] & (matrix['opponent'][:, gw] > 0))
+    away = matrix['opponent'][home, gw, slot].astype('int64')
+    away_slot = ((matrix['opponent'][away, gw] == home[:, None]) & ~matrix['is_home'][away, gw]).argmax(axis=1)
+    home_fdr = matrix['fdr'][home, gw, slot]
+    away_fdr = matrix['fdr'][away, gw, away_slot]
+    kickoff = matrix['kickoff'][home, gw, slot]
+
+    table = pd.DataFrame({
+        'home_team': [teams_dict.get(int(team), 'Unknown') for team in home],
+        'away_team': [teams_dict.get(int(team), 'Unknown') for team in away],
+        'difficulty': np.rint((home_fdr + away_fdr) / 2).astype('int8'),
+        'home_difficulty': home_fdr,
+        'away_difficulty': away_fdr,
+        'kickoff': pd.to_datetime(np.where(kickoff > 0, kickoff, np.nan), unit='s', utc=True)
+    })
+    # Zápasy bez výkopu na konec, jinak podle výkopu a id domácích
+    order = np.lexsort((home, kickoff, kickoff == 0))
+    return table.iloc[order].reset_index(drop=True)
+
+
+def fixture_matrix_frame(matrix):
+    """Matice zápasů v dlouhém formátu - jeden řádek na (tým, GW, slot) s naplánovaným zápasem"""
+    team, gw, slot = np.nonzero(matrix['opponent'])
+    return pd.DataFrame({
+        'team_id': team.astype('int16'),
+        'gw': gw.astype('int16'),
+        'slot': slot.astype('int8'),
+        'opponent_id': matrix['opponent'][team, gw, slot],
+        'is_home': matrix['is_home'][team, gw, slot],
+        'fdr': matrix['fdr'][team, gw, slot],
+        'finished': matrix['finished'][team, gw, slot]
+    })
+
+
+def build_fixture_index(matrix):
+    """Index neodehraných zápasů podle id týmu pro dotazy "dalších N zápasů" v O(N)
+
+    Zápasy každého týmu leží za sebou seřazené podle GW (řádek = id týmu),
+    `start[tým, GW]` ukazuje na první zápas od daného kola. Odehrané zápasy
+    v indexu nejsou - aktuální GW bývá mezi deadliny už dohraný. Pole jsou
+    doplněná prázdnými sloty, aby dávkové dotazy nemusely hlídat konec.
+    """
+    opponent = matrix['opponent']
+    n_rows, n_cols, n_slots = opponent.shape
+    upcoming = (opponent > 0) & ~matrix['finished']
+    valid = upcoming.reshape(n_rows, n_cols * n_slots)
+    n_fixtures = valid.sum(axis=1)
+
+    # Stabilní řazení posune platné sloty dopředu a zachová pořadí (GW, slot)
+    order = np.argsort(~valid, axis=1, kind='stable')
+    max_fixtures = int(n_fixtures.max(initial=0))
+    used = np.arange(max_fixtures)[None, :] < n_fixtures[:, None]
+    # Za posledním zápasem je vždy aspoň jeden prázdný sloupec
+    width = max_fixtures + 1
+
+    def packed(values, fill=0):
+        flat = np.take_along_axis(values.reshape(n_rows, n_cols * n_slots), order, axis=1)[:, :max_fixtures]
+        out = np.full((n_rows, width), fill, dtype=values.dtype)
+        out[:, :max_fixtures] = np.where(used, flat, fill)
+        return out
+
+    gw = np.broadcast_to(np.arange(n_cols, dtype='int16')[None, :, None], opponent.shape)
+    index = {
+        'gw': packed(gw),
+        'opponent': packed(opponent),
+        'is_home': packed(matrix['is_home']),
+        'fdr': packed(matrix['fdr']),
+        'valid': packed(upcoming, False),
+        # start[tým, GW] = počet neodehraných zápasů týmu před tímto kolem
+        'start': np.concatenate(
+            [np.zeros((n_rows, 1), dtype='int32'), np.cumsum(upcoming.sum(axis=2), axis=1, dtype='int32')],
+            axis=1
+        )
+    }
+    for array in index.values():
+        array.flags.writeable = False
+    return index
+
+
+def next_fixtures(index, team_id, from_gw, n=4):
+    """Dalších n neodehraných zápasů týmu od kola from_gw jako seznam slovníků"""
+    from_gw = min(max(from_gw, 0), index['start'].shape[1] - 1)
+    start = index['start'][team_id, from_gw]
+    fixtures = []
+    for pos in range(start, min(start + n, index['valid'].shape[1])):
+        if not index['valid'][team_id, pos]:
+            break
+        fixtures.append({
+            'gw': int(index['gw'][team_id, pos]),
+            'opponent_id': int(index['opponent'][team_id, pos]),
+            'is_home': bool(index['is_home'][team_id, pos]),
+            'difficulty': int(index['fdr'][team_id, pos])
+        })
+    return fixtures
+
+
+def fixture_strips(index, team_ids, from_gw, n=4):
+    """Dávkově dalších n zápasů pro libovolně mnoho hráčů (podle id jejich týmů)
+
+    Vrací pole tvaru [len(team_ids), n]: gw, opponent, is_home, fdr a valid
+    (False tam, kde tým už další zápas nemá).
+    """
+    team_ids = np.asarray(team_ids, dtype='int64')
+    from_gw = min(max(from_gw, 0), index['start'].shape[1] - 1)
+    positions = index['start'][team_ids, from_gw][:, None] + np.arange(n)
+    # Pozice za koncem sezóny míří do prázdného posledního sloupce
+    positions = np.minimum(positions, index['valid'].shape[1] - 1)
+    rows = team_ids[:, None]
+    return {
+        key: index[key][rows, positions]
+        for key in ('gw', 'opponent', 'is_home', 'fdr', 'valid')
+    }
@@ -0,0 +1,151 @@
+"""Přesný výběr týmu jako celočíselný lineární program (MILP, HiGHS přes SciPy)
+
+Pro každého hráče jsou tři binární proměnné - v kádru (x), v základní
+sestavě (y) a kapitán (c). Maximalizuje se očekávaný počet bodů sestavy
+(kapitán dvakrát) plus malá váha lavičky, při dodržení pravidel FPL:
+rozpočet, 2-5-5-3, max 3 hráči z klubu a platná formace základní sestavy.
+Hráči, kteří jsou prokazatelně dominovaní, se z modelu předem vyřadí.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+SQUAD_POSITIONS = {'Goalkeeper': 2, 'Defender': 5, 'Midfielder': 5, 'Forward': 3}
+# Počet hráčů v základní sestavě (min, max) podle pozice
+XI_LIMITS = {'Goalkeeper': (1, 1), 'Defender': (3, 5), 'Midfielder': (2, 5), 'Forward': (1, 3)}
+XI_SIZE = 11
+MAX_PER_CLUB = 3
+# Body z lavičky se počítají jen zčásti (náhradníci nastoupí jen občas)
+BENCH_WEIGHT = 0.1
+
+# Stav z scipy.optimize.milp pro prokázané optimum
+STATUS_OPTIMAL = 0
+
+
+def dominated_players(players, score, price, max_per_club=MAX_PER_CLUB):
+    """Maska hráčů, bez kterých se optimální kádr vždy obejde
+
+    Hráč je dominovaný, když jiný hráč stejné pozice stojí nejvýš stejně a má
+    aspoň stejné skóre. Kádr s dominovaným hráčem jde vždy zlepšit (nebo
+    udržet) výměnou za dominujícího, pokud je z klubu, který ještě nemá plno.
+    Ostatních 14 hráčů zaplní nejvýš 14 // max_per_club klubů a nejvýš
+    count - 1 dominujících už může být v kádru, takže stačí, aby dominující
+    pocházeli z aspoň count + 14 // max_per_club různých klubů.
+    """
+    position = players['position'].astype(str).to_numpy()
+    club = players['team_id'].to_numpy()
+    clubs = np.unique(club)
+    club_onehot = (club[:, None] == clubs[None, :]).astype('float32')
+    order = np.arange(len(players))
+
+    dominated = np.zeros(len(players), dtype=bool)
+    for pos, count in SQUAD_POSITIONS.items():
+        idx = np.flatnonzero(position == pos)
+        if not len(idx):
+            continue
+        p_score, p_price, p_order = score[idx], price[idx], order[idx]
+        # dominates[q, p]: q je aspoň stejně dobrý a levný; shody rozhodne pořadí
+        at_least = (p_price[:, None] <= p_price[None, :]) & (p_score[:, None] >= p_score[None, :])
+        strictly = (p_price[:, None] < p_price[None, :]) | (p_score[:, None] > p_score[None, :])
+        dominates = at_least & (strictly | (p_order[:, None] < p_order[None, :]))
+        distinct_clubs = ((dominates.T.astype('float32') @ club_onehot[idx]) > 0).sum(axis=1)
+        dominated[idx] = distinct_clubs >= count + (sum(SQUAD_POSITIONS.values()) - 1) // max_per_club
+    return dominated
+
+
+def solve_squad(players_df, budget=100.0, score_column='predicted_points', time_limit=1.0,
+                bench_weight=BENCH_WEIGHT, max_per_club=MAX_PER_CLUB, mip_rel_gap=1e-4):
+    """Najde kádr 15 hráčů se základní sestavou a kapitánem s nejvyšším očekávaným skóre
+
+    Vrací slovník:
+        squad       DataFrame vybraných hráčů se sloupci 'starter' a 'captain'
+        cost        cena kádru
+        objective   hodnota účelové funkce (body XI + kapitán + váha lavičky)
+        gap         relativní mezera optimality (0 = prokazatelně optimální)
+        optimal     True, pokud řešič optimum dokázal v časovém limitu
+        solve_time  čas řešení v sekundách
+        message     zpráva řešiče
+    """
+    # SciPy se načítá až tady - import trvá skoro půl sekundy a většina záložek ho nepotřebuje
+    from scipy.optimize import Bounds, LinearConstraint, milp
+    from scipy.sparse import csr_matrix, eye, hstack, vstack
+
+    started = time.perf_counter()
+    players = players_df.reset_index(drop=True)
+
+    score = players[score_column].to_numpy(dtype='float64')
+    # Ceny v desetinách milionu, aby rozpočet nezávisel na zaokrouhlení floatů
+    price = np.rint(players['price'].to_numpy(dtype='float64') * 10)
+
+    # Dominovaní hráči optimum nezmění, jen zvětšují model
+    keep = ~dominated_players(players, score, price, max_per_club)
+    players, score, price = players[keep].reset_index(drop=True), score[keep], price[keep]
+    n = len(players)
+    position = players['position'].astype(str).to_numpy()
+    club = players['team_id'].to_numpy()
+
+    # Pořadí proměnných: x (kádr), y (sestava), c (kapitán)
+    objective = -np.concatenate([bench_weight * score, (1 - bench_weight) * score, score])
+
+    zeros = csr_matrix((1, n))
+    rows, lower, upper = [], [], []
+
+    def add(x_row, y_row, c_row, lo, hi):
+        rows.append(hstack([x_row, y_row, c_row]))
+        lower.append(lo)
+        upper.append(hi)
+
+    add(csr_matrix(price), zeros, zeros, 0, round(budget * 10))
+    for pos, count in SQUAD_POSITIONS.items():
+        mask = csr_matrix((position == pos).astype(float))
+        add(mask, zeros, zeros, count, count)
+        add(zeros, mask, zeros, *XI_LIMITS[pos])
+    for team_id in np.unique(club):
+        add(csr_matrix((club == team_id).astype(float)), zeros, zeros, 0, max_per_club)
+    add(zeros, csr_matrix(np.ones((1, n))), zeros, XI_SIZE, XI_SIZE)
+    add(zeros, zeros, csr_matrix(np.ones((1, n))), 1, 1)
+
+    # y <= x a c <= y pro každého hráče
+    identity = eye(n, format='csr')
+    empty = csr_matrix((n, n))
+    links = vstack([hstack([-identity, identity, empty]), hstack([empty, -identity, identity])])
+
+    constraints = [
+        LinearConstraint(vstack(rows), lower, upper),
+        LinearConstraint(links, -np.inf, 0)
+    ]
+
+    result = milp(
+        objective,
+        constraints=constraints,
+        integrality=np.ones(3 * n),
+        bounds=Bounds(0, 1),
+        options={'time_limit': time_limit, 'mip_rel_gap': mip_rel_gap}
+    )
+
+    solution = {
+        'squad': players.iloc[0:0].assign(starter=pd.Series(dtype=bool), captain=pd.Series(dtype=bool)),
+        'cost': 0.0,
+        'objective': None,
+        'gap': None,
+        'optimal': result.status == STATUS_OPTIMAL,
+        'solve_time': time.perf_counter() - started,
+        'message': result.message
+    }
+    if result.x is None:
+        return solution
+
+    chosen = np.rint(result.x).astype(bool)
+    in_squad, starter, captain = chosen[:n], chosen[n:2 * n], chosen[2 * n:]
+    squad = players[in_squad].copy()
+    squad['starter'] = starter[in_squad]
+    squad['captain'] = captain[in_squad]
+
+    solution.update({
+        'squad': squad,
+        'cost': float(price[in_squad].sum()) / 10,
+        'objective': -float(result.fun),
+        'gap': float(getattr(result, 'mip_gap', 0.0) or 0.0)
+    })
+    return solution
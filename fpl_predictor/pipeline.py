@@ -0,0 +1,61 @@
+"""Líně počítaný graf odvozených dat nad jedním snapshotem
+
+Vstupy (bootstrap, fixtures) nesou id snapshotu. Uzel deklaruje, na kterých
+vstupech a uzlech závisí, a spočítá se až při prvním `pipeline[name]`.
+Výsledek se uloží do sdílené ArtifactCache pod klíčem z názvu uzlu a id
+snapshotů, na kterých uzel tranzitivně závisí. Uzel jen z bootstrapu se
+tedy nepřepočítá, když se změní jen fixtures.
+"""
+from fpl_predictor.artifacts import ArtifactCache
+
+
+class Pipeline:
+    """Graf uzlů s deklarovanými závislostmi, vyhodnocovaný na požádání"""
+
+    def __init__(self, cache=None, timer=None):
+        self.cache = cache if cache is not None else ArtifactCache()
+        self.timer = timer
+        self._inputs = {}
+        self._nodes = {}
+        self._values = {}
+
+    def input(self, name, snapshot_id, value):
+        """Vstupní data a id snapshotu, ze kterého pochází"""
+        self._inputs[name] = (snapshot_id, value)
+        self._values[name] = value
+
+    def node(self, name, dependencies, compute):
+        """Uzel `name` = compute(*hodnoty závislostí)"""
+        unknown = [dep for dep in dependencies if dep not in self._inputs and dep not in self._nodes]
+        if unknown:
+            raise KeyError(f"Uzel {name} závisí na neznámých uzlech: {', '.join(unknown)}")
+        self._nodes[name] = (tuple(dependencies), compute)
+
+    def snapshot_key(self, name):
+        """Id snapshotů (vstup, id), na kterých uzel tranzitivně závisí"""
+        if name in self._inputs:
+            return ((name, self._inputs[name][0]),)
+        keys = set()
+        for dep in self._nodes[name][0]:
+            keys.update(self.snapshot_key(dep))
+        return tuple(sorted(keys, key=lambda item: item[0]))
+
+    def __getitem__(self, name):
+        if name in self._values:
+            return self._values[name]
+        dependencies, compute = self._nodes[name]
+
+        def evaluate():
+            args = [self[dep] for dep in dependencies]
+            if self.timer is None:
+                return compute(*args)
+            with self.timer.span(f"node:{name}"):
+                return compute(*args)
+
+        value = self.cache.get((name,) + self.snapshot_key(name), evaluate)
+        self._values[name] = value
+        return value
+
+    def computed(self):
+        """Uzly, které už byly v tomto běhu vyžádány"""
+        return [name for name in self._nodes if name in self._values]
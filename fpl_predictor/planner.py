@@ -0,0 +1,209 @@
+"""Plánovač transferů na více GW dopředu (beam search)
+
+Stav je kádr 15 hráčů, peníze v bance a počet free transferů. V každém GW
+se zkusí žádný transfer a kombinace nejlepších jednotlivých výměn. Každý
+transfer navíc nad free transfery stojí 4 body. Nevyužité FT se přenáší
+(max 5) a v GW16 se kvůli AFCON doplní na 5. Stav se hodnotí body, které
+už získal, plus body, které by jeho kádr získal ve zbývajících kolech bez
+dalších změn. Do dalšího kola pokračuje jen `beam_width` nejlepších stavů.
+
+Prodejní cena se bere jako aktuální cena hráče. Nákupní ceny kádru API
+bez přihlášení nevrací.
+"""
+import time
+from itertools import combinations
+
+import numpy as np
+
+from fpl_predictor.optimizer import MAX_PER_CLUB, SQUAD_POSITIONS
+
+MAX_FREE_TRANSFERS = 5
+HIT_COST = 4
+# GW, před kterým FPL všem doplní free transfery (AFCON 2025/26)
+FT_TOPUP = {16: MAX_FREE_TRANSFERS}
+
+BEAM_WIDTH = 40
+# Kolik nejlepších jednotlivých výměn se kombinuje v jednom GW
+TOP_MOVES = 8
+MAX_TRANSFERS_PER_GW = 3
+# Kolik nejlepších hráčů každé pozice připadá v úvahu jako posila
+CANDIDATES_PER_POSITION = 25
+
+# Sloty kádru seřazené podle pozic: 2 GK, 5 DEF, 5 MID, 3 FWD
+SLOT_POSITIONS = [pos for pos, count in SQUAD_POSITIONS.items() for _ in range(count)]
+_GK, _DEF, _MID, _FWD = (
+    slice(0, 2), slice(2, 7), slice(7, 12), slice(12, 15)
+)
+
+
+def lineup_points(points):
+    """Body nejlepší základní sestavy včetně kapitána pro kádry v pořadí slotů
+
+    `points` má tvar [..., 15, GW]. Sestava: nejlepší GK, 3 nejlepší DEF,
+    2 MID, 1 FWD a 4 nejlepší ze zbytku hráčů v poli. Kapitán je nejlepší
+    hráč sestavy a jeho body se započítají dvakrát.
+    """
+    def ranked(block):
+        return -np.sort(-points[..., block, :], axis=-2)
+
+    gk, defenders, midfielders, forwards = ranked(_GK), ranked(_DEF), ranked(_MID), ranked(_FWD)
+    core = gk[..., 0, :] + defenders[..., :3, :].sum(-2) + midfielders[..., :2, :].sum(-2) + forwards[..., 0, :]
+    rest = np.concatenate([defenders[..., 3:, :], midfielders[..., 2:, :], forwards[..., 1:, :]], axis=-2)
+    flex = -np.sort(-rest, axis=-2)[..., :4, :].sum(-2)
+    captain = np.maximum.reduce([gk[..., 0, :], defenders[..., 0, :], midfielders[..., 0, :], forwards[..., 0, :]])
+    return core + flex + captain
+
+
+def next_free_transfers(free_transfers, used, next_gw):
+    """Počet FT v dalším kole po `used` transferech"""
+    remaining = min(MAX_FREE_TRANSFERS, max(free_transfers - used, 0) + 1)
+    return max(remaining, FT_TOPUP.get(next_gw, 0))
+
+
+def squad_slots(players_df, squad_ids):
+    """Řádky hráčů kádru seřazené do slotů podle pozic"""
+    row_of = {pid: row for row, pid in enumerate(players_df['id'].to_numpy())}
+    positions = players_df['position'].astype(str).to_numpy()
+    slots = []
+    for pos, count in SQUAD_POSITIONS.items():
+        rows = [row_of[pid] for pid in squad_ids if positions[row_of[pid]] == pos]
+        if len(rows) != count:
+            raise ValueError(f"Kádr musí mít {count} hráčů na pozici {pos}, má {len(rows)}")
+        slots.extend(rows)
+    return np.array(slots, dtype='int64')
+
+
+def _candidate_rows(positions, points, allowed):
+    """Nejlepší hráči každé pozice podle bodů v horizontu (řádky players_df)"""
+    total = points.sum(axis=1)
+    candidates = {}
+    for pos in SQUAD_POSITIONS:
+        rows = np.flatnonzero((positions == pos) & allowed)
+        candidates[pos] = rows[np.argsort(-total[rows], kind='stable')[:CANDIDATES_PER_POSITION]]
+    return candidates
+
+
+def _single_moves(slots, bank, clubs, price, future, candidates):
+    """Všechny proveditelné výměny (slot, nový hráč) seřazené podle zisku bodů"""
+    in_squad = set(slots.tolist())
+    club_counts = np.bincount(clubs[slots], minlength=clubs.max() + 1)
+    moves = []
+    for slot, row in enumerate(slots):
+        for new_row in candidates[SLOT_POSITIONS[slot]]:
+            if new_row in in_squad or price[new_row] > bank + price[row]:
+                continue
+            if clubs[new_row] != clubs[row] and club_counts[clubs[new_row]] >= MAX_PER_CLUB:
+                continue
+            gain = future[new_row] - future[row]
+            if gain > 0:
+                moves.append((gain, slot, int(new_row)))
+    moves.sort(reverse=True)
+    return moves[:TOP_MOVES]
+
+
+def _combine_moves(slots, bank, clubs, price, moves, max_transfers):
+    """Kombinace jednotlivých výměn, které jsou dohromady proveditelné"""
+    combos = [()]
+    for size in range(1, max_transfers + 1):
+        for combo in combinations(moves, size):
+            out_slots = {slot for _, slot, _ in combo}
+            new_rows = [new_row for _, _, new_row in combo]
+            if len(out_slots) < size or len(set(new_rows)) < size:
+                continue
+            new_slots = slots.copy()
+            for _, slot, new_row in combo:
+                new_slots[slot] = new_row
+            spent = price[new_slots].sum() - price[slots].sum()
+            if spent > bank:
+                continue
+            if np.bincount(clubs[new_slots]).max() > MAX_PER_CLUB:
+                continue
+            combos.append(combo)
+    return combos
+
+
+def plan_transfers(players_df, squad_ids, points, gameweeks, bank=0.0, free_transfers=1,
+                   allowed=None, beam_width=BEAM_WIDTH, max_transfers=MAX_TRANSFERS_PER_GW):
+    """Najde posloupnost transferů s nejvyšším očekávaným součtem bodů po započtení hitů
+
+    `points` je pole [hráč, GW] očekávaných bodů ve stejném pořadí jako
+    players_df (viz projection.project_points) a `gameweeks` čísla jeho
+    sloupců. `allowed` je maska hráčů, které lze koupit.
+
+    Vrací slovník:
+        steps         pro každé GW: gw, transfers [(id ven, id dovnitř)], free_transfers,
+                      hits, expected_points (po odečtení hitů), captain, bank
+        total         očekávané body plánu
+        baseline      očekávané body bez jakýchkoli transferů
+        solve_time    čas hledání v sekundách
+    """
+    started = time.perf_counter()
+    points = np.asarray(points, dtype='float32')
+    positions = players_df['position'].astype(str).to_numpy()
+    clubs = players_df['team_id'].to_numpy(dtype='int64')
+    # Ceny v desetinách milionu, aby se rozpočet nesčítal ve floatech
+    price = np.rint(players_df['price'].to_numpy(dtype='float64') * 10).astype('int64')
+    ids = players_df['id'].to_numpy()
+    allowed = np.ones(len(players_df), dtype=bool) if allowed is None else np.asarray(allowed, dtype=bool)
+
+    slots = squad_slots(players_df, squad_ids)
+    candidates = _candidate_rows(positions, points, allowed)
+    n_gw = len(gameweeks)
+    baseline = float(lineup_points(points[slots]).sum())
+
+    # Stav: (získané body, sloty, banka, FT, historie kroků)
+    first_ft = max(min(free_transfers, MAX_FREE_TRANSFERS), FT_TOPUP.get(gameweeks[0], 0)) if n_gw else free_transfers
+    beam = [(0.0, slots, int(round(bank * 10)), first_ft, [])]
+
+    for step, gw in enumerate(gameweeks):
+        future = points[:, step:].sum(axis=1)
+        children = []
+        for earned, state_slots, state_bank, ft, history in beam:
+            moves = _single_moves(state_slots, state_bank, clubs, price, future, candidates)
+            for combo in _combine_moves(state_slots, state_bank, clubs, price, moves, max_transfers):
+                new_slots = state_slots.copy()
+                for _, slot, new_row in combo:
+                    new_slots[slot] = new_row
+                children.append((earned, state_slots, new_slots, state_bank, ft, history, combo))
+        if not children:
+            break
+
+        # Body všech potomků v tomto i zbývajících kolech najednou
+        squads = np.stack([child[2] for child in children])
+        remaining = lineup_points(points[squads][:, :, step:])
+        next_gw = gameweeks[step + 1] if step + 1 < n_gw else gw + 1
+
+        scored = {}
+        for child, lineup in zip(children, remaining):
+            earned, old_slots, new_slots, state_bank, ft, history, combo = child
+            hits = max(len(combo) - ft, 0)
+            gw_points = float(lineup[0]) - HIT_COST * hits
+            priority = earned + gw_points + float(lineup[1:].sum())
+            new_ft = next_free_transfers(ft, len(combo), next_gw)
+            # Stejný kádr se stejnými FT stačí držet jednou
+            key = (tuple(sorted(new_slots.tolist())), new_ft)
+            if key in scored and scored[key][0] >= priority:
+                continue
+            new_bank = state_bank - int(price[new_slots].sum() - price[old_slots].sum())
+            squad_points = points[new_slots, step]
+            captain = int(ids[new_slots[np.argmax(squad_points)]])
+            scored[key] = (priority, (earned + gw_points, new_slots, new_bank, new_ft, history + [{
+                'gw': gw,
+                'transfers': [(int(ids[old_slots[slot]]), int(ids[new_row])) for _, slot, new_row in combo],
+                'free_transfers': ft,
+                'hits': hits,
+                'expected_points': gw_points,
+                'captain': captain,
+                'bank': new_bank / 10
+            }]))
+
+        ranked = sorted(scored.values(), key=lambda item: item[0], reverse=True)
+        beam = [state for _, state in ranked[:beam_width]]
+
+    total, _, _, _, steps = max(beam, key=lambda state: state[0])
+    return {
+        'steps': steps,
+        'total': total,
+        'baseline': baseline,
+        'solve_time': time.perf_counter() - started
+    }
@@ -0,0 +1,134 @@
+"""Sloupcové zpracování hráčů z bootstrap-static
+
+Místo smyčky přes hráče se každé pole vytáhne jako celý sloupec a převody
+(čísla z textu, týmy, pozice) se dělají vektorově. Tým, pozice a status
+jsou kategorie, počty malé celočíselné typy a ceny float32.
+"""
+import numpy as np
+import pandas as pd
+
+# Sloupce převzaté z API beze změny, s cílovým typem
+COUNT_COLUMNS = {
+    'minutes': 'int16',
+    'goals_scored': 'int16',
+    'assists': 'int16',
+    'clean_sheets': 'int16',
+    'bonus': 'int16',
+    'total_points': 'int16',
+    'transfers_in': 'int32',
+    'transfers_out': 'int32'
+}
+
+ELEMENT_FIELDS = [
+    'id', 'first_name', 'second_name', 'web_name', 'team', 'team_code', 'element_type',
+    'now_cost', 'form', 'selected_by_percent', 'news', 'status',
+    'chance_of_playing_this_round', 'chance_of_playing_next_round'
+] + list(COUNT_COLUMNS)
+
+# Pořadí sloupců výsledného DataFrame
+PLAYER_COLUMNS = [
+    'id', 'name', 'web_name', 'team', 'team_id', 'team_code', 'position', 'price', 'form',
+    'selected_by_percent', 'predicted_points', 'minutes', 'news',
+    'chance_of_playing_this_round', 'chance_of_playing_next_round', 'transfers_in',
+    'transfers_out', 'status', 'goals_scored', 'assists', 'clean_sheets', 'bonus', 'total_points'
+]
+
+PLAYER_STATUSES = ['a', 'd', 'i', 'n', 's', 'u']
+
+# Příznaky, ze kterých se skládá value skóre a AI skóre (core.create_ai_team)
+SCORE_FEATURES = ['predicted_points', 'form', 'price', 'differential', 'transfer_trend']
+VALUE_SCORE_WEIGHTS = {'predicted_points': 0.5, 'form': 0.3, 'differential': 0.2}
+
+
+def _numeric(values, dtype='float32'):
+    """Text z API ('5.3' nebo '') na čísla, prázdné hodnoty jako 0 - převod dělá NumPy"""
+    return np.array([value or '0' for value in values], dtype=dtype)
+
+
+def _categorical_by_id(ids, lookup):
+    """Převede id (týmu, pozice) na kategorii podle slovníku id -> název"""
+    categories = list(lookup.values())
+    codes_by_id = np.full(max(max(lookup), int(ids.max(initial=0))) + 1, -1, dtype='int16')
+    codes_by_id[list(lookup)] = np.arange(len(categories))
+    codes = codes_by_id[ids]
+    if (codes < 0).any():
+        categories.append('Unknown')
+        codes[codes < 0] = len(categories) - 1
+    return pd.Categorical.from_codes(codes, categories)
+
+
+def predict_points(form, price):
+    """Predikce založená na formě a ceně (vyšší cena = vyšší očekávání)"""
+    price_factor = price / 15.0
+    return (form + price_factor * 3).astype('float32')
+
+
+def process_players_data(fpl_data):
+    """Zpracuje data hráčů z FPL API - zaměřeno na novou sezónu 2025/26"""
+    if not fpl_data:
+        return pd.DataFrame()
+
+    elements = fpl_data['elements']
+    columns = {field: [player[field] for player in elements] for field in ELEMENT_FIELDS}
+
+    teams = {team['id']: team['name'] for team in fpl_data['teams']}
+    positions = {pos['id']: pos['singular_name'] for pos in fpl_data['element_types']}
+
+    team_ids = np.array(columns['team'], dtype='int16')
+    price = np.array(columns['now_cost'], dtype='float32') / 10
+    form = _numeric(columns['form'])
+    statuses = PLAYER_STATUSES + sorted(set(columns['status']) - set(PLAYER_STATUSES))
+
+    data = {
+        'id': np.array(columns['id'], dtype='int32'),
+        'name': [f"{first} {second}" for first, second in zip(columns['first_name'], columns['second_name'])],
+        'web_name': columns['web_name'],
+        'team': _categorical_by_id(team_ids, teams),
+        'team_id': team_ids.astype('int8'),
+        'team_code': np.array(columns['team_code'], dtype='int16'),
+        'position': _categorical_by_id(np.array(columns['element_type'], dtype='int16'), positions),
+        'price': price,
+        'form': form,
+        'selected_by_percent': _numeric(columns['selected_by_percent']),
+        'predicted_points': predict_points(form, price),
+        'news': [news or '' for news in columns['news']],
+        # Šance na nasazení chybí (None) u plně fit hráčů - NumPy z None udělá NaN
+        'chance_of_playing_this_round': np.array(columns['chance_of_playing_this_round'], dtype='float32'),
+        'chance_of_playing_next_round': np.array(columns['chance_of_playing_next_round'], dtype='float32'),
+        'status': pd.Categorical(columns['status'], categories=statuses)
+    }
+    for column, dtype in COUNT_COLUMNS.items():
+        data[column] = np.array(columns[column], dtype=dtype)
+
+    # Jeden konstruktor se všemi sloupci najednou, bez postupného vkládání
+    return pd.DataFrame({column: data[column] for column in PLAYER_COLUMNS})
+
+
+def score_features(players_df):
+    """Příznaky skóre jako tabulka [hráč, příznak] se sloupci SCORE_FEATURES"""
+    return pd.DataFrame({
+        'predicted_points': players_df['predicted_points'],
+        'form': players_df['form'],
+        'price': players_df['price'],
+        # Differential - čím menší vlastnictví, tím víc
+        'differential': (100 - players_df['selected_by_percent']) / 100,
+        'transfer_trend': players_df['transfers_in'] / 50000
+    }, index=players_df.index).astype('float32')
+
+
+def weighted_score(features, weights):
+    """Vážený součet příznaků - `weights` je {příznak: váha}"""
+    names = list(weights)
+    return features[names].to_numpy(dtype='float32') @ np.array([weights[name] for name in names], dtype='float32')
+
+
+def add_player_scores(players_df, value_weights=None):
+    """Přidá skóre, která záložky řadí a zobrazují (hodnota za milion, value skóre, čisté transfery)
+
+    `value_weights` jsou vyladěné váhy value skóre (viz tuning), jinak VALUE_SCORE_WEIGHTS.
+    """
+    return players_df.assign(
+        value_per_million=(players_df['predicted_points'] / players_df['price']).astype('float32'),
+        value_score=weighted_score(score_features(players_df), value_weights or VALUE_SCORE_WEIGHTS),
+        net_transfers=(players_df['transfers_in'] - players_df['transfers_out']).astype('int32')
+    )
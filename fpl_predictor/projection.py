@@ -0,0 +1,30 @@
+"""Projekce bodů hráčů na jednotlivá kola podle matice zápasů
+
+Základní predikce (body za zápas) se násobí obtížností soupeře a sčítá přes
+všechny zápasy v kole - blank GW dává 0, double GW zhruba dvojnásobek.
+"""
+import numpy as np
+
+from fpl_predictor.fixtures import gameweek_window
+
+# Násobitel predikce podle FDR soupeře (index = FDR, 0 = žádný zápas)
+FDR_MULTIPLIER = np.array([0.0, 1.3, 1.15, 1.0, 0.85, 0.7], dtype='float32')
+
+
+def project_points(players_df, fixture_matrix, from_gw, horizon=6, base_column='predicted_points'):
+    """Očekávané body každého hráče v kolech from_gw .. from_gw + horizon - 1
+
+    Vrací (pole [hráč, GW], seznam GW). Bez jakýchkoli zápasů v matici
+    (chybí fixtures) se vrátí základní predikce pro každé kolo.
+    """
+    window = gameweek_window(fixture_matrix, from_gw, horizon)
+    gameweeks = list(range(window.start, window.stop))
+    base = players_df[base_column].to_numpy(dtype='float32')
+
+    if not fixture_matrix['count'].any():
+        return np.repeat(base[:, None], len(gameweeks), axis=1), gameweeks
+
+    team_ids = players_df['team_id'].to_numpy(dtype='int64')
+    fdr = fixture_matrix['fdr'][team_ids, window, :]
+    multiplier = FDR_MULTIPLIER[fdr].sum(axis=2)
+    return base[:, None] * multiplier, gameweeks
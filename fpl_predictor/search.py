@@ -0,0 +1,106 @@
+"""Vyhledávací index hráčů - bez diakritiky, podle prefixu a s tolerancí překlepů
+
+Jména se převedou na malá písmena bez diakritiky ("Ødegaard" -> "odegaard")
+a rozdělí na slova. Index se staví jednou pro snapshot a dotaz pak nedělá
+žádný průchod přes text: prefix se najde půlením v seřazeném seznamu slov,
+překlepy přes trigramy (Dice koeficient), pokud prefix nic nenajde.
+Každé slovo dotazu musí odpovídat některému slovu ve jménu hráče.
+"""
+import bisect
+import unicodedata
+
+import numpy as np
+
+# Písmena, která NFKD nerozloží na základ + diakritiku
+SPECIAL_LETTERS = str.maketrans({
+    'ø': 'o', 'æ': 'ae', 'œ': 'oe', 'ß': 'ss', 'đ': 'd', 'ð': 'd', 'ł': 'l', 'þ': 'th', 'ı': 'i'
+})
+
+EXACT_SCORE = 1.2
+PREFIX_SCORE = 1.0
+# Minimální podobnost trigramů, od které se slovo bere jako překlep
+FUZZY_THRESHOLD = 0.45
+
+
+def fold(text):
+    """Malá písmena bez diakritiky, vše kromě písmen a číslic jako mezera"""
+    text = unicodedata.normalize('NFKD', str(text).lower().translate(SPECIAL_LETTERS))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ''.join(ch if ch.isalnum() else ' ' for ch in text)
+
+
+def trigrams(token):
+    """Trigramy slova včetně okrajů (^ a $), aby fungovala i krátká slova"""
+    padded = f"^{token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerSearchIndex:
+    """Index slov ze jmen hráčů; search() vrací id hráčů seřazená podle shody"""
+
+    def __init__(self, player_ids, *name_columns):
+        self.player_ids = np.asarray(player_ids)
+        token_rows = {}
+        for row, names in enumerate(zip(*name_columns)):
+            for name in names:
+                for token in fold(name).split():
+                    token_rows.setdefault(token, set()).add(row)
+
+        # Seřazená slova pro hledání prefixu půlením
+        self._tokens = sorted(token_rows)
+        # Dvojice (slovo, hráč) jako plochá pole pro vektorové skórování
+        pairs = [(t, row) for t, token in enumerate(self._tokens) for row in token_rows[token]]
+        self._pair_token = np.array([t for t, _ in pairs], dtype='int32')
+        self._pair_row = np.array([row for _, row in pairs], dtype='int32')
+
+        postings = {}
+        self._gram_counts = np.zeros(len(self._tokens), dtype='float32')
+        for t, token in enumerate(self._tokens):
+            grams = trigrams(token)
+            self._gram_counts[t] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(t)
+        self._postings = {gram: np.array(ts, dtype='int32') for gram, ts in postings.items()}
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    def _word_scores(self, word):
+        """Skóre každého slova indexu pro jedno slovo dotazu"""
+        scores = np.zeros(len(self._tokens), dtype='float32')
+
+        lo = bisect.bisect_left(self._tokens, word)
+        hi = bisect.bisect_left(self._tokens, word + '￿')
+        scores[lo:hi] = PREFIX_SCORE
+        if lo < hi and self._tokens[lo] == word:
+            scores[lo] = EXACT_SCORE
+        # Překlepy se hledají, jen když slovo nemá žádnou přesnou ani prefixovou shodu
+        if lo < hi:
+            return scores
+
+        grams = trigrams(word)
+        hits = [self._postings[gram] for gram in grams if gram in self._postings]
+        if hits:
+            common = np.bincount(np.concatenate(hits), minlength=len(self._tokens)).astype('float32')
+            similarity = 2 * common / (len(grams) + self._gram_counts)
+            scores = np.where(similarity >= FUZZY_THRESHOLD, similarity, 0).astype('float32')
+        return scores
+
+    def search(self, query, limit=None):
+        """Id hráčů odpovídajících dotazu, nejlepší shoda první"""
+        words = fold(query).split()
+        if not words:
+            return self.player_ids[:0]
+
+        total = np.zeros(len(self.player_ids), dtype='float32')
+        matched = np.ones(len(self.player_ids), dtype=bool)
+        for word in words:
+            # Hráč dostane skóre svého nejlépe odpovídajícího slova
+            player_scores = np.zeros(len(self.player_ids), dtype='float32')
+            np.maximum.at(player_scores, self._pair_row, self._word_scores(word)[self._pair_token])
+            matched &= player_scores > 0
+            total += player_scores
+
+        rows = np.flatnonzero(matched)
+        rows = rows[np.argsort(-total[rows], kind='stable')]
+        return self.player_ids[rows[:limit] if limit else rows]
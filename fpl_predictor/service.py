@@ -0,0 +1,423 @@
+"""Lokální JSON HTTP služba nad jádrem - hráči, matice zápasů, AI kádr a transfer plán
+
+Spuštění z kořene repozitáře:
+    python -m fpl_predictor.service --port 8765
+    python -m fpl_predictor.service --live
+
+Jednoduchý HTTP/1.1 server nad asyncio (keep-alive, jen GET/HEAD) bez
+dalších závislostí. Všechny požadavky sdílí jednu ArtifactCache: odvozená
+data snapshotu i hotové JSON odpovědi, takže opakovaný dotaz je jen
+vyhledání v cache. Výpočty běží v poolu vláken mimo smyčku událostí a
+stejné souběžné požadavky (stejná cesta, parametry a snapshot) čekají
+na jediný výpočet.
+
+Endpointy:
+    GET /health
+    GET /players?position=MID&team=Arsenal&max_price=8&q=saka&sort=form&limit=50&offset=0
+    GET /fixtures?team=Arsenal&from_gw=5&to_gw=10
+    GET /squad?budget=100&max_per_club=3&exclude=1,2&time_limit=1
+    GET /plan?squad=1,2,...&bank=0.5&free_transfers=1&horizon=5
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from fpl_predictor import core
+from fpl_predictor.artifacts import ArtifactCache
+from fpl_predictor.cli import SQUAD_COLUMNS, fixtures_table, plan_table, predictions_table
+from fpl_predictor.optimizer import MAX_PER_CLUB, SQUAD_POSITIONS
+from fpl_predictor.planner import MAX_FREE_TRANSFERS, squad_slots
+from fpl_predictor.search import PlayerSearchIndex
+from fpl_predictor.snapshots import SnapshotStore, KIND_BOOTSTRAP, KIND_FIXTURES, KIND_ELEMENT_SUMMARY
+from fpl_predictor.weights import load_score_weights, weights_path
+from fpl_predictor.xp_model import model_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+MAX_REQUEST_BYTES = 16 * 1024
+KEEP_ALIVE_TIMEOUT = 15
+# Jak často se při přehrávání z disku hledá nový snapshot
+SNAPSHOT_CHECK_INTERVAL = 5.0
+PREDICTION_HORIZON = 5
+MAX_LIMIT = 1000
+
+
+class HTTPError(Exception):
+    """Chyba, která se klientovi vrátí jako JSON {'error': ...} s daným stavem"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _param(params, name, convert, default, low=None, high=None):
+    """Parametr dotazu převedený na typ a ověřený rozsah"""
+    if name not in params:
+        return default
+    try:
+        value = convert(params[name])
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Neplatná hodnota parametru {name}: {params[name]}")
+    if (low is not None and value < low) or (high is not None and value > high):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Parametr {name} musí být v rozsahu {low}-{high}")
+    return value
+
+
+def _id_list(text):
+    return tuple(sorted({int(part) for part in text.split(',') if part.strip()}))
+
+
+def _error_body(message):
+    return json.dumps({'error': message}, ensure_ascii=False).encode('utf-8')
+
+
+def _records(table):
+    """Řádky tabulky jako JSON-kompatibilní slovníky (NaN -> null, NumPy -> Python)"""
+    return json.loads(table.to_json(orient='records'))
+
+
+def players_endpoint(pipeline, params):
+    table = pipeline['predictions']
+    if 'q' in params:
+        ids = pipeline['search_index'].search(params['q'])
+        table = table[table['id'].isin(ids)]
+    if 'position' in params:
+        position = core.POSITION_CODES.get(params['position'].upper(), params['position'])
+        table = table[table['position'] == position]
+    if 'team' in params:
+        table = table[table['team'] == params['team']]
+    max_price = _param(params, 'max_price', float, None, 0)
+    if max_price is not None:
+        table = table[table['price'] <= max_price]
+
+    sort_by = params.get('sort', 'predicted_points')
+    if sort_by not in table.columns:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Nelze řadit podle {sort_by}")
+    ascending = params.get('ascending', '0') in ('1', 'true')
+    limit = _param(params, 'limit', int, 50, 1, MAX_LIMIT)
+    offset = _param(params, 'offset', int, 0, 0)
+    table = table.sort_values(sort_by, ascending=ascending, kind='stable', na_position='last')
+    return {'total': len(table), 'offset': offset, 'players': _records(table.iloc[offset:offset + limit])}
+
+
+def fixtures_endpoint(pipeline, params):
+    table = pipeline['fixture_table']
+    if 'team' in params:
+        table = table[table['team'] == params['team']]
+    from_gw = _param(params, 'from_gw', int, None, 1)
+    to_gw = _param(params, 'to_gw', int, None, 1)
+    if from_gw is not None:
+        table = table[table['gw'] >= from_gw]
+    if to_gw is not None:
+        table = table[table['gw'] <= to_gw]
+    return {'fixtures': _records(table)}
+
+
+def squad_endpoint(pipeline, params):
+    budget = _param(params, 'budget', float, 100.0, 50.0, 200.0)
+    max_per_club = _param(params, 'max_per_club', int, MAX_PER_CLUB, 1, 15)
+    time_limit = _param(params, 'time_limit', float, core.OPTIMIZER_TIME_LIMIT, 0.1, 10.0)
+    exclude = _param(params, 'exclude', _id_list, ())
+
+    players_df = pipeline['players']
+    if exclude:
+        players_df = players_df[~players_df['id'].isin(exclude)]
+    _, cost, solution = core.create_ai_team(
+        players_df, pipeline['fixture_matrix'], pipeline['planning_gw'], budget, time_limit, max_per_club
+    )
+    squad = solution['squad'].sort_values('expected_points', ascending=False)
+    return {
+        'complete': len(squad) == sum(SQUAD_POSITIONS.values()),
+        'cost': round(float(cost), 1),
+        'objective': solution['objective'],
+        'optimal': solution['optimal'],
+        'gap': solution['gap'],
+        'solve_time': solution['solve_time'],
+        'players': _records(squad[SQUAD_COLUMNS])
+    }
+
+
+def plan_endpoint(pipeline, params):
+    players_df = pipeline['players']
+    if 'squad' in params:
+        squad_ids = _param(params, 'squad', _id_list, ())
+        unknown = set(squad_ids) - set(players_df['id'].tolist())
+        if unknown:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Neznámí hráči: {', '.join(map(str, sorted(unknown)))}")
+        if len(squad_ids) == sum(SQUAD_POSITIONS.values()):
+            # Skladbu 2-5-5-3 ověří planner - chyba kádru je chyba klienta, ne 500
+            try:
+                squad_slots(players_df, squad_ids)
+            except ValueError as e:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+        default_bank = 0.0
+    else:
+        # Bez kádru se plánuje pro AI kádr ze sdíleného uzlu pipeline
+        _, cost, solution = pipeline['ai_team']
+        squad_ids = tuple(sorted(int(i) for i in solution['squad']['id']))
+        default_bank = round(100.0 - cost, 1)
+    if len(squad_ids) != sum(SQUAD_POSITIONS.values()):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Kádr musí mít 15 různých hráčů")
+
+    bank = _param(params, 'bank', float, default_bank, 0.0, 100.0)
+    free_transfers = _param(params, 'free_transfers', int, 1, 0, MAX_FREE_TRANSFERS)
+    horizon = _param(params, 'horizon', int, PREDICTION_HORIZON, 1, 8)
+    plan = core.create_transfer_strategy(
+        pipeline['planning_gw'], squad_ids, bank, free_transfers, horizon, players_df, pipeline['fixture_matrix']
+    )
+    return {
+        'squad': list(squad_ids),
+        'total': plan['total'],
+        'baseline': plan['baseline'],
+        'solve_time': plan['solve_time'],
+        'steps': _records(plan_table(plan, players_df))
+    }
+
+
+ROUTES = {
+    '/players': players_endpoint,
+    '/fixtures': fixtures_endpoint,
+    '/squad': squad_endpoint,
+    '/plan': plan_endpoint
+}
+
+
+class PredictorService:
+    """Snapshot, pipeline a cache odpovědí sdílené všemi spojeními jednoho procesu"""
+
+    def __init__(self, store=None, replay='latest', refresher=None, cache=None):
+        self.store = store or SnapshotStore()
+        self.replay = replay
+        self.refresher = refresher
+        self.cache = cache if cache is not None else ArtifactCache()
+        # (id bootstrapu, id fixtures, id historie), pipeline - mění se najednou jedním přiřazením
+        self.current = None
+        self._watcher = None
+        self._inflight = {}
+        self._loaded = {}
+        self.stats = {'requests': 0, 'computed': 0, 'coalesced': 0, 'errors': 0}
+        self.started = time.time()
+
+    def _records(self):
+        """Aktuální záznamy bootstrapu, fixtures a historie hráčů - z refresheru nebo z disku"""
+        kinds = (KIND_BOOTSTRAP, KIND_FIXTURES, KIND_ELEMENT_SUMMARY)
+        if self.refresher is not None:
+            return tuple(self.refresher.get(kind) for kind in kinds)
+
+        records = []
+        for kind in kinds:
+            entry = core.find_snapshot_entry(self.store, kind, self.replay)
+            if entry is None:
+                records.append(None)
+                continue
+            if (kind, entry['id']) not in self._loaded:
+                self._loaded = {key: value for key, value in self._loaded.items() if key[0] != kind}
+                self._loaded[(kind, entry['id'])] = self.store.load(kind, entry['id'])
+            records.append(dict(entry, data=self._loaded[(kind, entry['id'])]))
+        return tuple(records)
+
+    def update_snapshot(self):
+        """Přestaví pipeline, pokud se změnil snapshot; vrací True při změně"""
+        bootstrap, fixtures_snapshot, history_snapshot = self._records()
+        if bootstrap is None:
+            return False
+        # Nová verze vyladěných vah přestaví pipeline stejně jako nový snapshot
+        score_weights = load_score_weights(weights_path(self.store.root))
+        key = tuple(record['id'] if record else None for record in (bootstrap, fixtures_snapshot, history_snapshot))
+        key += (score_weights['version'] if score_weights else None,)
+        if self.current and self.current[0] == key:
+            return False
+
+        pipeline = core.build_pipeline(
+            bootstrap, fixtures_snapshot, self.cache, history_snapshot=history_snapshot,
+            model_path=model_path(self.store.root), score_weights=score_weights
+        )
+        pipeline.node(
+            'search_index', ['players'],
+            lambda players_df: PlayerSearchIndex(players_df['id'], players_df['name'], players_df['web_name'])
+        )
+        pipeline.node(
+            'predictions', ['players', 'fixture_matrix', 'planning_gw', 'xp_model'],
+            lambda players_df, matrix, gw, model: predictions_table(players_df, matrix, gw, PREDICTION_HORIZON, model)
+        )
+        pipeline.node('fixture_table', ['fixture_matrix', 'teams'], fixtures_table)
+        self.current = (key, pipeline)
+        logger.info("Snapshot %s / %s / %s, váhy skóre %s", *key)
+        return True
+
+    def _render(self, handler, pipeline, snapshot_key, params, key):
+        def compute():
+            self.stats['computed'] += 1
+            body = handler(pipeline, params)
+            meta = {
+                'bootstrap_id': snapshot_key[0], 'fixtures_id': snapshot_key[1],
+                'gameweek': pipeline['current_gw'], 'planning_gameweek': pipeline['planning_gw']
+            }
+            return json.dumps({**meta, **body}, ensure_ascii=False).encode('utf-8')
+
+        return self.cache.get(key, compute)
+
+    async def respond(self, path, params):
+        """Tělo JSON odpovědi pro cestu a parametry dotazu"""
+        if path == '/health':
+            snapshot_key = self.current[0] if self.current else (None, None)
+            return json.dumps({
+                'status': 'ok' if self.current else 'no-snapshot',
+                'bootstrap_id': snapshot_key[0],
+                'fixtures_id': snapshot_key[1],
+                'uptime_s': round(time.time() - self.started, 1),
+                'inflight': len(self._inflight),
+                **self.stats,
+                'cache': self.cache.stats()
+            }).encode('utf-8')
+
+        handler = ROUTES.get(path)
+        if handler is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Neznámý endpoint {path}")
+        if self.current is None:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Žádný snapshot zatím není k dispozici")
+
+        snapshot_key, pipeline = self.current
+        key = ('response', path) + snapshot_key + tuple(sorted(params.items()))
+        body = self.cache.lookup(key)
+        if body is not None:
+            return body
+
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(None, self._render, handler, pipeline, snapshot_key, params, key)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats['coalesced'] += 1
+        # shield - odpojení jednoho klienta nezruší výpočet ostatním
+        return await asyncio.shield(future)
+
+    async def dispatch(self, method, target):
+        """(stav, tělo) pro jeden požadavek"""
+        self.stats['requests'] += 1
+        if method not in ('GET', 'HEAD'):
+            return HTTPStatus.METHOD_NOT_ALLOWED, _error_body("Podporované jsou jen GET a HEAD")
+        url = urlsplit(target)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            return HTTPStatus.OK, await self.respond(url.path.rstrip('/') or '/', params)
+        except HTTPError as e:
+            self.stats['errors'] += 1
+            return e.status, _error_body(str(e))
+        except Exception:
+            self.stats['errors'] += 1
+            logger.exception("Chyba při zpracování %s", target)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, _error_body("Interní chyba")
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if 0 <= length <= MAX_REQUEST_BYTES:
+                    # Tělo požadavku se nepoužívá, jen se přeskočí
+                    if length:
+                        await reader.readexactly(length)
+                    status, body = await self.dispatch(method, target)
+                else:
+                    # Konec těla neznáme - odpovíme chybou a spojení zavřeme
+                    self.stats['requests'] += 1
+                    self.stats['errors'] += 1
+                    status, body = HTTPStatus.BAD_REQUEST, _error_body("Neplatná hlavička Content-Length")
+                    keep_alive = False
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1')
+                    + (body if method != 'HEAD' else b'')
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def watch_snapshots(self, interval=SNAPSHOT_CHECK_INTERVAL):
+        """Na pozadí hlídá nový snapshot (načtení z disku běží mimo smyčku událostí)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(None, self.update_snapshot)
+            except Exception:
+                logger.exception("Kontrola snapshotu selhala")
+            await asyncio.sleep(interval)
+
+    async def start(self, host='127.0.0.1', port=DEFAULT_PORT):
+        """Spustí server; vrací asyncio.Server (port 0 = libovolný volný)"""
+        await asyncio.get_running_loop().run_in_executor(None, self.update_snapshot)
+        self._watcher = asyncio.ensure_future(self.watch_snapshots())
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_REQUEST_BYTES)
+
+    def stop(self):
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m fpl_predictor.service', description=__doc__.splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter, epilog='\n'.join(__doc__.splitlines()[2:])
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--snapshot-dir', help="adresář snapshotů (jinak FPL_SNAPSHOT_DIR)")
+    parser.add_argument('--snapshot', default='latest', help="id bootstrap snapshotu nebo 'latest'")
+    parser.add_argument('--live', action='store_true', help="obnovovat data z FPL API na pozadí")
+    parser.add_argument('--cache-mb', type=int, default=256)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    store = SnapshotStore(args.snapshot_dir)
+    refresher = None
+    if args.live:
+        from fpl_predictor.fetch import shared_refresher
+        refresher = shared_refresher(store)
+    service = PredictorService(store, args.snapshot, refresher, ArtifactCache(args.cache_mb * 2**20))
+
+    async def serve():
+        server = await service.start(args.host, args.port)
+        logger.info("Naslouchám na http://%s:%s", args.host, args.port)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,368 @@
+"""Monte Carlo simulace bodů kádru v jednom GW
+
+Každý zápas hráče se rozloží na události - minuty (nenastoupí / do 60 /
+60+), góly, asistence, zákaz inkasovat gól a bonus. Minuty se losují podle
+šance na nasazení a podílu odehraných minut v sezóně, čisté konto jednou
+za tým a zápas (spoluhráči ho sdílejí), góly a asistence z Poissonova
+rozdělení. Predikce (`predicted_points` x FDR násobitel) je nepodmíněná -
+forma i xp_model počítají i zápasy bez minut. Intenzity se proto dopočítají
+tak, aby body za odehraný zápas byly predikce / P(nastoupí) a nepodmíněná
+střední hodnota odpovídala predikci. Útočné body se rozdělí na góly a
+asistence podle dosavadní sezóny hráče.
+
+Všechny scénáře se počítají najednou jako pole [scénář, zápas hráče] po
+dávkách `batch_size`, takže 100 tisíc simulací kádru trvá na jednom jádře
+zhruba 0,3 s - většinu času zabere losování z Poissonova rozdělení.
+Sestava má automatická střídání z lavičky podle FPL pravidel formace a
+místo nenastoupivšího kapitána se zdvojnásobí vice-kapitán.
+"""
+import numpy as np
+import pandas as pd
+
+from fpl_predictor.fixtures import gameweek_window
+from fpl_predictor.optimizer import SQUAD_POSITIONS
+from fpl_predictor.projection import FDR_MULTIPLIER
+
+N_SIMULATIONS = 100_000
+BATCH_SIZE = 50_000
+SEED = 2025
+
+GOAL_POINTS = {'Goalkeeper': 10, 'Defender': 6, 'Midfielder': 5, 'Forward': 4}
+CLEAN_SHEET_POINTS = {'Goalkeeper': 4, 'Defender': 4, 'Midfielder': 1, 'Forward': 0}
+ASSIST_POINTS = 3
+# Bonus: 2 za gól, 1 za asistenci a 1 za čisté konto brankáře/obránce, nejvýš 3
+BONUS_PER_GOAL = 2
+BONUS_PER_ASSIST = 1
+MAX_BONUS = 3
+# Členy Poissonova rozdělení a kroky dorovnání bodů useknutých stropem bonusu
+BONUS_POISSON_TERMS = 12
+BONUS_CALIBRATION_STEPS = 4
+# Pravděpodobnost čistého konta podle FDR soupeře (index = FDR)
+CLEAN_SHEET_PROBABILITY = np.array([0.0, 0.45, 0.37, 0.29, 0.21, 0.14], dtype='float32')
+# Střídající hráč (do 60 minut) má zlomek gólových šancí hráče v základu
+SUB_RATE = 0.3
+# Pravděpodobnost nástupu z lavičky, když hráč nezačne
+SUB_APPEARANCE = 0.3
+# Podíl minut, dokud tým v sezóně nic neodehrál
+DEFAULT_MINUTES_SHARE = 0.8
+# Apriorní podíl gólů na útočných bodech (váha odpovídá 10 bodům)
+GOAL_SHARE_PRIOR = {'Defender': 0.4, 'Midfielder': 0.55, 'Forward': 0.75}
+PRIOR_WEIGHT = 10.0
+# Minimální počet nastoupení formace (DEF, MID, FWD)
+FORMATION_MINIMUM = {'Defender': 3, 'Midfielder': 2, 'Forward': 1}
+PERCENTILES = [5, 10, 25, 50, 75, 90, 95]
+
+
+def _play_probabilities(squad, games_played):
+    """(P(nastoupí), P(odehraje 60+ minut)) pro každého hráče"""
+    chance = squad['chance_of_playing_next_round'].to_numpy(dtype='float32') / 100
+    fit = (squad['status'] == 'a').to_numpy()
+    chance = np.where(np.isnan(chance), np.where(fit, 1.0, 0.0), chance).astype('float32')
+
+    minutes = squad['minutes'].to_numpy(dtype='float32')
+    share = np.divide(
+        minutes, 90 * games_played, out=np.full_like(minutes, DEFAULT_MINUTES_SHARE), where=games_played > 0
+    )
+    share = np.clip(share, 0.05, 1.0)
+    p_full = chance * share
+    p_play = chance * (share + SUB_APPEARANCE * (1 - share))
+    return p_play.astype('float32'), p_full.astype('float32')
+
+
+def _bonus_overflow(goal_rate, assist_rate, cs_bonus):
+    """Očekávané body bonusu nad MAX_BONUS, které strop useknul
+
+    Góly a asistence jsou Poissonovy s intenzitami `goal_rate` a
+    `assist_rate`, `cs_bonus` je bonus za čisté konto (0 nebo 1).
+    """
+    counts = np.arange(BONUS_POISSON_TERMS, dtype='float32')
+    factorial = np.cumprod(np.maximum(counts, 1))
+
+    def pmf(rate):
+        return np.exp(-rate)[:, None] * rate[:, None] ** counts / factorial
+
+    excess = np.maximum(
+        BONUS_PER_GOAL * counts[None, :, None] + BONUS_PER_ASSIST * counts[None, None, :]
+        + np.asarray(cs_bonus, dtype='float32')[:, None, None] - MAX_BONUS, 0
+    )
+    return np.einsum('pi,pj,pij->p', pmf(goal_rate), pmf(assist_rate), excess)
+
+
+def _event_rates(squad, expected, p_cs, q_full):
+    """Intenzity gólů, asistencí a zákroků brankáře na jeden odehraný zápas
+
+    `expected` jsou očekávané body za odehraný zápas, `p_cs` šance na čisté
+    konto a `q_full` podíl 60+ minut mezi nastoupeními (vše po zápasech).
+    Ze `expected` se odečtou body za nastoupení a čisté konto, zbytek jsou
+    útočné body - u brankáře zákroky (1 bod), jinak góly a asistence.
+    Intenzity se navýší o body, které by useknul strop bonusu.
+    """
+    positions = squad['position'].astype(str).to_numpy()
+    goal_value = np.array([GOAL_POINTS.get(p, 4) for p in positions], dtype='float32') + BONUS_PER_GOAL
+    assist_value = np.float32(ASSIST_POINTS + BONUS_PER_ASSIST)
+    defensive = np.isin(positions, ['Goalkeeper', 'Defender'])
+    cs_value = np.array([CLEAN_SHEET_POINTS.get(p, 0) for p in positions], dtype='float32') + defensive
+
+    attack = np.maximum(expected - 1 - q_full - q_full * p_cs * cs_value, 0)
+    exposure = q_full + SUB_RATE * (1 - q_full)
+
+    goals = squad['goals_scored'].to_numpy(dtype='float32') * goal_value
+    assists = squad['assists'].to_numpy(dtype='float32') * assist_value
+    prior = np.array([GOAL_SHARE_PRIOR.get(p, 0.0) for p in positions], dtype='float32')
+    goal_share = (goals + PRIOR_WEIGHT * prior) / (goals + assists + PRIOR_WEIGHT)
+
+    goalkeeper = positions == 'Goalkeeper'
+    # Útočné body na celý zápas; strop bonusu z nich část usekne, takže se
+    # několikrát navýší o useknutou střední hodnotu (pevný bod konverguje rychle)
+    target = np.where(goalkeeper, 0, attack)
+    boosted = target.copy()
+    for _ in range(BONUS_CALIBRATION_STEPS):
+        goal_rate = boosted / exposure * goal_share / goal_value
+        assist_rate = boosted / exposure * (1 - goal_share) / assist_value
+        overflow = (
+            q_full * p_cs * _bonus_overflow(goal_rate, assist_rate, defensive)
+            + q_full * (1 - p_cs) * _bonus_overflow(goal_rate, assist_rate, np.zeros_like(defensive))
+            + (1 - q_full) * _bonus_overflow(SUB_RATE * goal_rate, SUB_RATE * assist_rate, np.zeros_like(defensive))
+        )
+        boosted = target + overflow
+
+    goal_rate = boosted / exposure * goal_share / goal_value
+    assist_rate = boosted / exposure * (1 - goal_share) / assist_value
+    save_rate = np.where(goalkeeper, attack / exposure, 0)
+    return goal_rate, assist_rate, save_rate, cs_value - defensive, defensive
+
+
+def _fixture_pairs(squad, fixture_matrix, gw):
+    """Zápasy hráčů kádru v kole gw jako páry (řádek hráče, tým-zápas, FDR)
+
+    Bez zápasů v matici (chybí fixtures) má každý tým jeden zápas s FDR 3.
+    """
+    team_ids = squad['team_id'].to_numpy(dtype='int64')
+    if not fixture_matrix['count'].any():
+        return np.arange(len(squad)), team_ids, np.full(len(squad), 3, dtype='int64')
+
+    window = gameweek_window(fixture_matrix, gw, 1)
+    if window.stop <= window.start:
+        empty = np.zeros(0, dtype='int64')
+        return empty, empty, empty
+    fdr = fixture_matrix['fdr'][team_ids, window.start, :].astype('int64')
+    rows, slots = np.nonzero(fdr)
+    # Klíč tým-zápas - spoluhráči v témž zápase sdílí čisté konto
+    return rows, team_ids[rows] * fdr.shape[1] + slots, fdr[rows, slots]
+
+
+def _team_clean_sheet(p_cs, pair_team):
+    """Šance na čisté konto pro každý tým-zápas (spoluhráči mají stejné FDR)"""
+    p_team = np.zeros(pair_team.max(initial=-1) + 1, dtype='float32')
+    p_team[pair_team] = p_cs
+    return p_team
+
+
+def auto_subs(points, played, starters, bench, positions):
+    """Body sestavy po automatických střídáních pro všechny scénáře najednou
+
+    `points` a `played` mají tvar [scénář, hráč kádru]; `bench` je pořadí
+    lavičky (brankář první). Náhradník, který hrál, nastoupí za prvního
+    nenastoupivšího hráče, pokud formace zůstane platná.
+    """
+    score = (points[:, starters] * played[:, starters]).sum(axis=1)
+    starter_positions = positions[starters]
+
+    keeper = starters[starter_positions == 'Goalkeeper']
+    bench_keeper = [b for b in bench if positions[b] == 'Goalkeeper']
+    if len(keeper) and bench_keeper:
+        swap = ~played[:, keeper[0]] & played[:, bench_keeper[0]]
+        score = score + np.where(swap, points[:, bench_keeper[0]], 0)
+
+    outfield = list(FORMATION_MINIMUM)
+    count = {pos: np.full(len(points), (starter_positions == pos).sum(), dtype='int8') for pos in outfield}
+    missing = {
+        pos: (~played[:, starters[starter_positions == pos]]).sum(axis=1).astype('int8') for pos in outfield
+    }
+    for b in bench:
+        pos = positions[b]
+        if pos not in count:
+            continue
+        available = played[:, b]
+        same = available & (missing[pos] > 0)
+        missing[pos] = missing[pos] - same
+        done = same
+        for other in outfield:
+            if other == pos:
+                continue
+            swap = available & ~done & (missing[other] > 0) & (count[other] > FORMATION_MINIMUM[other])
+            missing[other] = missing[other] - swap
+            count[other] = count[other] - swap
+            count[pos] = count[pos] + swap
+            done = done | swap
+        score = score + np.where(done, points[:, b], 0)
+    return score
+
+
+def _integer_percentiles(values, percentiles):
+    """Percentily celočíselných bodů po sloupcích přes četnosti (bez řazení)
+
+    Vrací pole [percentil, sloupec] - nejmenší hodnotu, pod kterou leží
+    aspoň daný podíl scénářů.
+    """
+    low = int(values.min())
+    result = np.empty((len(percentiles), values.shape[1]), dtype='float32')
+    for col in range(values.shape[1]):
+        cumulative = np.cumsum(np.bincount(values[:, col] - low))
+        result[:, col] = low + np.searchsorted(cumulative, np.asarray(percentiles) / 100 * len(values))
+    return result
+
+
+def _summary(values):
+    summary = {'mean': float(values.mean()), 'std': float(values.std())}
+    quantiles = _integer_percentiles(values[:, None], PERCENTILES)[:, 0]
+    summary.update({f"p{q}": float(v) for q, v in zip(PERCENTILES, quantiles)})
+    return summary
+
+
+def _player_table(squad, positions, p_play, mean_points):
+    return pd.DataFrame({
+        'id': squad['id'].to_numpy(),
+        'web_name': squad['web_name'].to_numpy(),
+        'position': positions,
+        'starter': squad['starter'].to_numpy(dtype=bool),
+        'p_play': p_play,
+        'mean_points': mean_points
+    })
+
+
+def _empty_result(gw, n_sims, players):
+    """Výsledek bez sestavy nebo bez zápasů - bez souhrnu a kapitánů"""
+    return {'gameweek': gw, 'sims': n_sims, 'squad': None, 'histogram': None,
+            'captains': pd.DataFrame(), 'players': players}
+
+
+def simulate_squad(squad, fixture_matrix, gw, n_sims=N_SIMULATIONS, seed=SEED, batch_size=BATCH_SIZE,
+                   base_column='predicted_points'):
+    """Rozdělení bodů kádru v GW a rozdělení pro každou volbu kapitána
+
+    `squad` je 15 hráčů z optimalizace (sloupce starter, captain,
+    expected_points a sloupce players_df). Vrací slovník:
+        gameweek, sims
+        squad      souhrn (mean, std, percentily) skóre se zvoleným kapitánem
+        histogram  (četnosti, hranice binů) skóre se zvoleným kapitánem
+        captains   DataFrame - pro každého hráče sestavy skóre týmu s ním
+                   jako kapitánem, body kapitána a P(nejlepší volba)
+    Bez sestavy nebo v blank GW je squad a histogram None a captains prázdný.
+        players    DataFrame - body a šance na nastoupení hráčů kádru
+    """
+    squad = squad.reset_index(drop=True)
+    positions = squad['position'].astype(str).to_numpy()
+    n_players = len(squad)
+
+    team_ids = squad['team_id'].to_numpy(dtype='int64')
+    if fixture_matrix['count'].any():
+        games_played = fixture_matrix['finished'][team_ids].sum(axis=(1, 2)).astype('float32')
+    else:
+        games_played = np.full(n_players, max(gw - 1, 0), dtype='float32')
+    p_play, p_full = _play_probabilities(squad, games_played)
+
+    rows, team_keys, fdr = _fixture_pairs(squad, fixture_matrix, gw)
+    if not len(rows):
+        # Blank GW - nikdo z kádru nehraje, není co simulovat
+        zeros = np.zeros(n_players)
+        return _empty_result(gw, n_sims, _player_table(squad, positions, zeros, zeros))
+    team_keys, pair_team = np.unique(team_keys, return_inverse=True)
+    p_cs = CLEAN_SHEET_PROBABILITY[fdr]
+    base = squad[base_column].to_numpy(dtype='float32')
+    # Predikce je nepodmíněná (počítá i zápasy bez minut) - na odehraný zápas se převede
+    # dělením P(nastoupí), jinak by se riziko rotace započítalo dvakrát
+    pair_play, pair_full = p_play[rows], p_full[rows]
+    expected = np.divide(
+        base[rows] * FDR_MULTIPLIER[fdr], pair_play, out=np.zeros(len(rows), dtype='float32'), where=pair_play > 0
+    )
+    q_full = np.divide(pair_full, pair_play, out=np.zeros_like(pair_play), where=pair_play > 0)
+    goal_rate, assist_rate, save_rate, cs_points, cs_bonus = _event_rates(squad.iloc[rows], expected, p_cs, q_full)
+    goal_points = np.array([GOAL_POINTS.get(p, 4) for p in positions[rows]], dtype='int16')
+    cs_points = cs_points.astype('int16')
+    team_clean_sheet = _team_clean_sheet(p_cs, pair_team)
+    # Sečtení zápasů hráče (double GW) maticovým součinem pár -> hráč
+    to_player = np.zeros((len(rows), n_players), dtype='float32')
+    to_player[np.arange(len(rows)), rows] = 1
+    event_rates = np.stack([goal_rate, assist_rate, save_rate]).astype('float32')
+
+    starters = np.flatnonzero(squad['starter'].to_numpy(dtype=bool))
+    bench_rows = np.flatnonzero(~squad['starter'].to_numpy(dtype=bool))
+    expected_points = squad['expected_points'].to_numpy(dtype='float32')
+    # Lavička: náhradní brankář první, hráči v poli podle očekávaných bodů
+    bench = sorted(bench_rows, key=lambda r: (positions[r] != 'Goalkeeper', -expected_points[r]))
+    by_expectation = starters[np.argsort(-expected_points[starters], kind='stable')]
+    vice_of = {c: next(r for r in by_expectation if r != c) for c in starters} if len(starters) > 1 else {}
+    chosen = np.flatnonzero(squad['captain'].to_numpy(dtype=bool))
+    chosen = int(chosen[0]) if len(chosen) else (int(by_expectation[0]) if len(starters) else None)
+
+    rng = np.random.default_rng(seed)
+    team_scores = np.zeros((n_sims, len(starters)), dtype='int16')
+    captain_points = np.zeros((n_sims, len(starters)), dtype='int16')
+    player_points = np.zeros(n_players, dtype='float64')
+    player_played = np.zeros(n_players, dtype='float64')
+
+    for start in range(0, n_sims, batch_size):
+        size = min(batch_size, n_sims - start)
+        draw = rng.random((size, len(rows)), dtype=np.float32)
+        plays = draw < pair_play
+        full = draw < pair_full
+        intensity = np.where(full, np.float32(1), np.float32(SUB_RATE)) * plays
+
+        events = rng.poisson(intensity[:, None, :] * event_rates).astype('int16')
+        goals, assists, saves = events[:, 0], events[:, 1], events[:, 2]
+        clean_sheet = rng.random((size, len(team_keys)), dtype=np.float32) < team_clean_sheet
+        clean_sheet = clean_sheet[:, pair_team] & full
+
+        bonus = np.minimum(BONUS_PER_GOAL * goals + BONUS_PER_ASSIST * assists + clean_sheet * cs_bonus, MAX_BONUS)
+        pair_points = (
+            plays.astype('int16') + full + goals * goal_points + ASSIST_POINTS * assists + saves
+            + clean_sheet * cs_points + bonus
+        )
+        points = (pair_points.astype('float32') @ to_player).astype('int16')
+        played = (plays.astype('float32') @ to_player) > 0
+        player_points += points.sum(axis=0)
+        player_played += played.sum(axis=0)
+        if not len(starters):
+            continue
+
+        lineup = auto_subs(points, played, starters, bench, positions)
+        for col, captain in enumerate(starters):
+            vice = vice_of.get(captain, captain)
+            extra = np.where(played[:, captain], points[:, captain], points[:, vice] * played[:, vice])
+            team_scores[start:start + size, col] = lineup + extra
+            captain_points[start:start + size, col] = 2 * points[:, captain]
+
+    players = _player_table(squad, positions, player_played / n_sims, player_points / n_sims)
+    if not len(starters):
+        return _empty_result(gw, n_sims, players)
+
+    best = np.bincount(team_scores.argmax(axis=1), minlength=len(starters)) / n_sims
+    captains = squad.loc[starters, ['id', 'web_name', 'team', 'position', 'price']].reset_index(drop=True)
+    captains['team_mean'] = team_scores.mean(axis=0)
+    captains['team_p10'], captains['team_p90'] = _integer_percentiles(team_scores, [10, 90])
+    captains['captain_mean'] = captain_points.mean(axis=0)
+    # Kapitán s aspoň 6 body (12 po zdvojení) - návratnost riskantní volby
+    captains['p_haul'] = (captain_points >= 12).mean(axis=0)
+    captains['p_best'] = best
+    captains = captains.sort_values('team_mean', ascending=False, kind='stable').reset_index(drop=True)
+
+    chosen_scores = team_scores[:, int(np.flatnonzero(starters == chosen)[0])] if chosen in starters else team_scores[:, 0]
+    counts, edges = np.histogram(chosen_scores, bins=np.arange(chosen_scores.min(), chosen_scores.max() + 2))
+    return {
+        'gameweek': gw,
+        'sims': n_sims,
+        'squad': _summary(chosen_scores),
+        'histogram': (counts, edges),
+        'captains': captains,
+        'players': players
+    }
+
+
+def simulate_ai_team(ai_team_result, fixture_matrix, current_gw, n_sims=N_SIMULATIONS, seed=SEED):
+    """Simulace kádru z výsledku core.create_ai_team (None pro neúplný kádr)"""
+    _, _, solution = ai_team_result
+    squad = solution['squad']
+    if len(squad) < sum(SQUAD_POSITIONS.values()):
+        return None
+    return simulate_squad(squad, fixture_matrix, current_gw, n_sims, seed)
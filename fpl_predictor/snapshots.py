@@ -0,0 +1,130 @@
+"""Lokální úložiště snapshotů z FPL API
+
+Každá stažená odpověď se uloží jako gzip soubor pojmenovaný podle SHA-256
+hashe obsahu. Stejná data se tedy na disk zapíšou jen jednou. Soubor
+manifest.jsonl eviduje, kdy byl který snapshot stažen, takže lze zpětně
+přehrát libovolný stav dashboardu bez jediného HTTP požadavku.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.fpl_snapshots'
+)
+
+# Druhy snapshotů podle endpointu FPL API
+KIND_BOOTSTRAP = 'bootstrap'
+KIND_FIXTURES = 'fixtures'
+# Historie všech hráčů z element-summary/{id}/ uložená jako jeden snapshot {id: summary}
+KIND_ELEMENT_SUMMARY = 'element-summary'
+
+
+def content_hash(raw):
+    """Vrátí zkrácený SHA-256 hash surových dat odpovědi"""
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def utc_timestamp():
+    """Aktuální čas v UTC ve formátu, který se dá řadit jako text"""
+    return datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+def snapshot_age(entry):
+    """Stáří snapshotu v sekundách"""
+    fetched_at = datetime.strptime(entry['fetched_at'], TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - fetched_at).total_seconds()
+
+
+class SnapshotStore:
+    """Komprimované snapshoty na disku adresované hashem obsahu"""
+
+    def __init__(self, root=None):
+        self.root = root or os.environ.get('FPL_SNAPSHOT_DIR') or DEFAULT_SNAPSHOT_DIR
+        self._manifest_path = os.path.join(self.root, 'manifest.jsonl')
+        self._lock = threading.Lock()
+
+    def _path(self, kind, snapshot_id):
+        return os.path.join(self.root, kind, f"{snapshot_id}.json.gz")
+
+    def save(self, kind, raw, fetched_at=None, validators=None):
+        """Uloží surovou odpověď a vrátí záznam z manifestu
+
+        `validators` jsou HTTP hlavičky ETag/Last-Modified, se kterými lze
+        po restartu pokračovat v podmíněných požadavcích.
+        """
+        snapshot_id = content_hash(raw)
+        entry = {
+            'kind': kind,
+            'id': snapshot_id,
+            'fetched_at': fetched_at or utc_timestamp(),
+            'size': len(raw)
+        }
+        if validators:
+            entry['validators'] = validators
+
+        with self._lock:
+            path = self._path(kind, snapshot_id)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Zápis přes dočasný soubor, aby čtenář nikdy neviděl polovičatý gzip
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+                    f.write(raw)
+                os.replace(tmp_path, path)
+
+            with open(self._manifest_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+
+        return entry
+
+    def entries(self, kind=None):
+        """Vrátí záznamy z manifestu seřazené od nejstaršího"""
+        if not os.path.exists(self._manifest_path):
+            return []
+
+        entries = []
+        with open(self._manifest_path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Useknutý řádek po pádu procesu přeskočíme
+                    continue
+                if kind is None or entry.get('kind') == kind:
+                    entries.append(entry)
+
+        entries.sort(key=lambda e: e['fetched_at'])
+        return entries
+
+    def find(self, kind, snapshot_id):
+        """Najde poslední záznam daného snapshotu (podle celého nebo zkráceného id)"""
+        for entry in reversed(self.entries(kind)):
+            if entry['id'].startswith(snapshot_id):
+                return entry
+        return None
+
+    def latest(self, kind, at=None):
+        """Poslední snapshot daného druhu, volitelně stažený nejpozději v čase `at`"""
+        for entry in reversed(self.entries(kind)):
+            if at is None or entry['fetched_at'] <= at:
+                return entry
+        return None
+
+    def load_raw(self, kind, snapshot_id):
+        """Načte surová data snapshotu"""
+        with gzip.open(self._path(kind, snapshot_id), 'rb') as f:
+            return f.read()
+
+    def load(self, kind, snapshot_id):
+        """Načte a rozparsuje JSON snapshotu"""
+        return json.loads(self.load_raw(kind, snapshot_id))
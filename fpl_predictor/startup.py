@@ -0,0 +1,56 @@
+"""Profil studeného startu - kolik trvá import jednotlivých modulů a první vykreslení
+
+Zapíná se proměnnou prostředí FPL_PROFILE_STARTUP=1. Obalí se
+builtins.__import__ a pro každý import nejvyšší úrovně (import, který
+nevyvolal jiný měřený import) se změří, jak dlouho trval, včetně všeho,
+co natáhl. Moduly už načtené v sys.modules se nepočítají, takže se měří
+jen skutečně první import v procesu.
+"""
+import builtins
+import sys
+import threading
+import time
+
+_timings = {}
+_state = threading.local()
+_original_import = None
+_started = None
+_report = None
+
+
+def profile_imports():
+    """Začne měřit importy (volat co nejdřív, před importem těžkých knihoven)"""
+    global _original_import, _started
+    if _original_import is not None or _report is not None:
+        return
+    original = _original_import = builtins.__import__
+    _started = time.perf_counter()
+
+    def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules or getattr(_state, 'depth', 0):
+            return original(name, globals, locals, fromlist, level)
+        _state.depth = 1
+        started = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            _state.depth = 0
+            _timings[name] = _timings.get(name, 0.0) + time.perf_counter() - started
+
+    builtins.__import__ = timed_import
+
+
+def startup_report():
+    """Při prvním volání ukončí měření; vrací čas do prvního vykreslení a časy importů
+
+    Další volání (reruny) vrací stejný výsledek. Bez zapnutého profilu None.
+    """
+    global _original_import, _report
+    if _report is None and _original_import is not None:
+        builtins.__import__ = _original_import
+        _original_import = None
+        _report = {
+            'first_render_s': time.perf_counter() - _started,
+            'imports': sorted(_timings.items(), key=lambda item: item[1], reverse=True)
+        }
+    return _report
@@ -0,0 +1,79 @@
+"""Tabulky hráčů pro zobrazení - řazení a stránkování na straně serveru
+
+Místo desítek prvků na hráče se posílá jedna tabulka a z ní jen jedna
+stránka, takže velikost odpovědi nezávisí na počtu hráčů.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+PRICE_CATEGORIES = [
+    ("Budget (£3.5-5.5m)", 3.5, 5.5),
+    ("Mid-range (£5.5-8.0m)", 5.5, 8.0),
+    ("Premium (£8.0-12.0m)", 8.0, 12.0),
+    ("Super premium (£12.0+)", 12.0, 20.0)
+]
+
+STATUS_ICONS = {'d': '🤕', 'i': '🚑', 's': '⛔'}
+
+
+def player_status(players_df):
+    """Ikony novinek, zranění a statusu hráče jako jeden textový sloupec"""
+    news = np.where(players_df['news'].to_numpy(dtype=object) != '', '🚨', '')
+    chance = players_df['chance_of_playing_this_round']
+    risk = np.where(chance < 100, '⚠️ ' + chance.fillna(100).astype(int).astype(str) + '%', '')
+    status = players_df['status'].astype(str).map(STATUS_ICONS).fillna('').to_numpy(dtype=object)
+    return pd.Series(
+        [' '.join(part for part in parts if part) for parts in zip(news, risk, status)],
+        index=players_df.index
+    )
+
+
+def price_category(prices):
+    """Název cenové kategorie pro každého hráče (None mimo kategorie)"""
+    bins = [low for _, low, _ in PRICE_CATEGORIES] + [PRICE_CATEGORIES[-1][2]]
+    labels = [label for label, _, _ in PRICE_CATEGORIES]
+    return pd.cut(prices, bins=bins, labels=labels, right=False)
+
+
+def player_table(players_df):
+    """Tabulka všech hráčů s českými názvy sloupců (stejné pořadí řádků jako players_df)"""
+    return pd.DataFrame({
+        'Hráč': players_df['name'],
+        'Stav': player_status(players_df),
+        'Tým': players_df['team'],
+        'Pozice': players_df['position'],
+        'Kategorie': price_category(players_df['price']),
+        'Predikce': players_df['predicted_points'],
+        'Forma': players_df['form'],
+        'Cena': players_df['price'],
+        'Vlastnictví': players_df['selected_by_percent'],
+        'Value skóre': players_df['value_score'],
+        'Body/£m': players_df['value_per_million'],
+        'Transfery IN': players_df['transfers_in'],
+        'Transfery OUT': players_df['transfers_out'],
+        'Čisté transfery': players_df['net_transfers'],
+        'Góly': players_df['goals_scored'],
+        'Asistence': players_df['assists'],
+        'Clean sheets': players_df['clean_sheets'],
+        'Body': players_df['total_points'],
+        'Novinky': players_df['news']
+    })
+
+
+def paginate(table, sort_by=None, ascending=False, page=1, page_size=20):
+    """Seřadí tabulku a vrátí jednu stránku: (stránka, počet stránek, číslo stránky)
+
+    page_size None = všechny řádky. Číslo stránky se ořízne do platného
+    rozsahu, takže po zúžení filtru stačí poslat původní hodnotu.
+    """
+    if sort_by is not None:
+        table = table.sort_values(sort_by, ascending=ascending, kind='stable', na_position='last')
+    if not page_size:
+        return table, 1, 1
+
+    n_pages = max(1, math.ceil(len(table) / page_size))
+    page = min(max(int(page), 1), n_pages)
+    start = (page - 1) * page_size
+    return table.iloc[start:start + page_size], n_pages, page
@@ -0,0 +1,79 @@
+"""Agregace hráčů a zápasů po týmech
+
+Vše, co záložky "Týmová analýza" a "Fixture analýza" zobrazují po týmech,
+se spočítá jedním seskupeným průchodem přes hráče a několika operacemi
+nad maticí zápasů. Výsledek je malý DataFrame (řádek = tým), který se
+cachuje pro každý snapshot.
+"""
+import numpy as np
+import pandas as pd
+
+from fpl_predictor.fixtures import gameweek_window
+
+
+def rolling_fixture_difficulty(matrix, horizon=5):
+    """Průměrné FDR v okně `horizon` kol začínajícím v každém GW: pole [tým, GW]
+
+    Blank GW se do průměru nepočítají, double GW se započítají oba zápasy.
+    """
+    fdr = matrix['fdr'].astype('float32')
+    fdr_sum = np.cumsum(np.pad(fdr.sum(axis=2), ((0, 0), (0, horizon))), axis=1)
+    fixtures = np.cumsum(np.pad((fdr > 0).sum(axis=2), ((0, 0), (0, horizon))), axis=1)
+
+    # Součet okna [gw, gw + horizon) jako rozdíl kumulativních součtů
+    n_cols = fdr.shape[1]
+    window_sum = fdr_sum[:, horizon - 1:horizon - 1 + n_cols] - np.pad(fdr_sum, ((0, 0), (1, 0)))[:, :n_cols]
+    window_count = fixtures[:, horizon - 1:horizon - 1 + n_cols] - np.pad(fixtures, ((0, 0), (1, 0)))[:, :n_cols]
+    return np.divide(window_sum, window_count, out=np.zeros_like(window_sum), where=window_count > 0)
+
+
+def venue_difficulty(matrix, from_gw, horizon=5):
+    """Průměrné FDR domácích a venkovních zápasů v okně GW (index = id týmu)"""
+    window = gameweek_window(matrix, from_gw, horizon)
+    fdr = matrix['fdr'][:, window, :].astype('float32')
+    is_home = matrix['is_home'][:, window, :]
+
+    result = []
+    for venue_mask in (is_home & (fdr > 0), ~is_home & (fdr > 0)):
+        total = np.where(venue_mask, fdr, 0).sum(axis=(1, 2))
+        count = venue_mask.sum(axis=(1, 2))
+        result.append(np.divide(total, count, out=np.zeros_like(total), where=count > 0))
+    return result
+
+
+def build_team_aggregates(players_df, fixture_matrix, teams_dict, current_gw, horizon=5):
+    """Souhrn po týmech: hodnota, průměrná predikce, nejlepší hráči a obtížnost fixtures"""
+    team_ids = list(teams_dict)
+    aggregates = pd.DataFrame({'team': [teams_dict[team_id] for team_id in team_ids]}, index=team_ids)
+
+    if not players_df.empty:
+        grouped = players_df.groupby('team_id', sort=False).agg(
+            total_value=('price', 'sum'),
+            avg_prediction=('predicted_points', 'mean'),
+            players_count=('id', 'size'),
+            top_idx=('predicted_points', 'idxmax'),
+            most_selected_idx=('selected_by_percent', 'idxmax')
+        )
+        top = players_df.loc[grouped['top_idx'], ['name', 'predicted_points']].to_numpy()
+        most_selected = players_df.loc[grouped['most_selected_idx'], ['name', 'selected_by_percent']].to_numpy()
+        grouped['top_player'] = top[:, 0]
+        grouped['top_prediction'] = top[:, 1].astype('float32')
+        grouped['most_selected'] = most_selected[:, 0]
+        grouped['highest_selection'] = most_selected[:, 1].astype('float32')
+        aggregates = aggregates.join(grouped.drop(columns=['top_idx', 'most_selected_idx']))
+    aggregates['players_count'] = aggregates.get('players_count', pd.Series(0, index=aggregates.index)).fillna(0).astype('int16')
+
+    # Obtížnost nadcházejících zápasů z matice (řádky matice = id týmů)
+    rolling = rolling_fixture_difficulty(fixture_matrix, horizon)
+    window = gameweek_window(fixture_matrix, current_gw, horizon)
+    home_fdr, away_fdr = venue_difficulty(fixture_matrix, current_gw, horizon)
+    fixtures_count = (fixture_matrix['fdr'][:, window, :] > 0).sum(axis=(1, 2))
+
+    rows = np.array([team_id if team_id < rolling.shape[0] else 0 for team_id in team_ids])
+    gw = min(max(current_gw, 1), rolling.shape[1] - 1)
+    aggregates['avg_difficulty'] = rolling[rows, gw]
+    aggregates['home_difficulty'] = home_fdr[rows]
+    aggregates['away_difficulty'] = away_fdr[rows]
+    aggregates['fixtures_count'] = fixtures_count[rows]
+    aggregates.index.name = 'team_id'
+    return aggregates
@@ -0,0 +1,129 @@
+"""Měření doby běhu jednotlivých fází rerunu aplikace
+
+StageTimer se vytvoří pro každý rerun a zaznamená časy fází (stažení,
+zpracování, optimalizace, vykreslení záložky). PerformanceLog je sdílený
+celým procesem: drží posledních několik set rerunů pro p50/p95, připisuje
+každý rerun jako řádek JSON do logu a přepisuje textfile pro Prometheus
+node_exporter.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from fpl_predictor.snapshots import utc_timestamp
+
+# Kolik posledních rerunů se drží v paměti pro kvantily
+HISTORY_SIZE = 500
+QUANTILES = (0.5, 0.95)
+TOTAL_STAGE = 'total'
+
+
+def quantile(sorted_values, q):
+    """Kvantil seřazeného seznamu (nejbližší nižší hodnota)"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(q * len(sorted_values)), len(sorted_values) - 1)]
+
+
+class StageTimer:
+    """Časy fází jednoho rerunu v pořadí, v jakém skončily
+
+    Fragment měří svůj vlastní rerun pod jiným názvem celkového času
+    (`total_stage`), aby se nemíchal s rerunem celé stránky.
+    """
+
+    def __init__(self, total_stage=TOTAL_STAGE):
+        self.total_stage = total_stage
+        self.started = time.perf_counter()
+        self.stages = {}
+        self._open = {}
+
+    def begin(self, stage):
+        self._open[stage] = time.perf_counter()
+
+    def end(self, stage):
+        started = self._open.pop(stage, None)
+        if started is not None:
+            self.stages[stage] = self.stages.get(stage, 0.0) + time.perf_counter() - started
+
+    @contextmanager
+    def span(self, stage):
+        """with timer.span('fetch'): ... - opakované spany stejné fáze se sčítají"""
+        self.begin(stage)
+        try:
+            yield
+        finally:
+            self.end(stage)
+
+    def total(self):
+        return time.perf_counter() - self.started
+
+    def as_dict(self):
+        return {**self.stages, self.total_stage: self.total()}
+
+
+class PerformanceLog:
+    """Sběr časů rerunů celého procesu, JSON log a Prometheus textfile"""
+
+    def __init__(self, log_path=None, textfile_path=None, history_size=HISTORY_SIZE):
+        self.log_path = log_path
+        self.textfile_path = textfile_path
+        self._history = {}
+        self._history_size = history_size
+        # Součty a počty pro Prometheus summary rostou po celý běh procesu
+        self._sum = {}
+        self._count = {}
+        self._lock = threading.Lock()
+
+    def record(self, timer, **labels):
+        """Uloží časy rerunu; `labels` (např. záložka) jdou jen do JSON logu"""
+        stages = timer.as_dict()
+        with self._lock:
+            for stage, seconds in stages.items():
+                self._history.setdefault(stage, deque(maxlen=self._history_size)).append(seconds)
+                self._sum[stage] = self._sum.get(stage, 0.0) + seconds
+                self._count[stage] = self._count.get(stage, 0) + 1
+
+            if self.log_path:
+                line = {'ts': utc_timestamp(), **labels, 'stages': {k: round(v, 6) for k, v in stages.items()}}
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(line, ensure_ascii=False) + '\n')
+
+            if self.textfile_path:
+                self._write_textfile()
+        return stages
+
+    def summary(self):
+        """Počet, p50 a p95 každé fáze za posledních `history_size` rerunů"""
+        with self._lock:
+            history = {stage: sorted(values) for stage, values in self._history.items()}
+        return [
+            {
+                'stage': stage,
+                'count': len(values),
+                'p50_s': quantile(values, 0.5),
+                'p95_s': quantile(values, 0.95)
+            }
+            for stage, values in history.items()
+        ]
+
+    def _write_textfile(self):
+        lines = [
+            '# HELP fpl_rerun_stage_seconds Doba fáze rerunu Streamlit aplikace',
+            '# TYPE fpl_rerun_stage_seconds summary'
+        ]
+        for stage, values in self._history.items():
+            ordered = sorted(values)
+            for q in QUANTILES:
+                lines.append(f'fpl_rerun_stage_seconds{{stage="{stage}",quantile="{q}"}} {quantile(ordered, q):.6f}')
+            lines.append(f'fpl_rerun_stage_seconds_sum{{stage="{stage}"}} {self._sum[stage]:.6f}')
+            lines.append(f'fpl_rerun_stage_seconds_count{{stage="{stage}"}} {self._count[stage]}')
+
+        # node_exporter nesmí nikdy přečíst rozepsaný soubor
+        tmp_path = f"{self.textfile_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, self.textfile_path)
@@ -0,0 +1,235 @@
+"""Ladění vah value skóre na historických snapshotech
+
+Spuštění z kořene repozitáře:
+    python -m fpl_predictor.tuning --snapshot-dir seasons/2024 seasons/2025 --save
+    python -m fpl_predictor.tuning --snapshot-dir seasons/2025 --samples 20000
+
+Data: pro každý GW se snapshotem před deadlinem (viz backtest) příznaky
+skóre všech hráčů tak, jak je v tu chvíli viděl dashboard, a jejich
+skutečné body za kolo v tomto a dalších OUTCOME_HORIZON - 1 kolech.
+
+Kandidáti jsou výchozí váhy a `samples` náhodných vektorů z jednotkového
+simplexu (nezáporné, součet 1 - pořadí hráčů na měřítku vah nezávisí).
+Vektor se hodnotí průměrnými skutečnými body TOP_K nejlepších hráčů každé
+cenové kategorie jako v záložce Top hráči podle ceny. Skóre skupiny pro všechny
+vektory je jeden maticový součin [vektor, příznak] @ [příznak, hráč] a
+body top hráčů další součin masky [vektor, hráč] se skutečnými body, takže
+5 000 vektorů přes 38 GW trvá zhruba sekundu.
+
+Intervaly spolehlivosti jsou z bootstrapu přes GW: převážení kol je
+matice četností [vzorek, GW] @ [GW, vektor], takže i všechny vzorky pro
+všechny vektory jsou jeden součin. Interval vah je rozptyl vítězného
+vektoru napříč vzorky. Nejlepší z tisíců vektorů na stejných datech je
+vždy trochu optimistický - o nasazení rozhoduje interval zlepšení proti
+výchozím vahám (uplift_ci) a p_better.
+
+AI skóre se neladí - kádr AI týmu vybírá řešič podle očekávaných bodů a
+AI skóre je jen zobrazené číslo, vyladěné váhy by žádné rozhodnutí nezměnily.
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from fpl_predictor import core
+from fpl_predictor.backtest import actual_points, decision_snapshots, season_label, snapshot_records
+from fpl_predictor.players import VALUE_SCORE_WEIGHTS, score_features
+from fpl_predictor.snapshots import SnapshotStore, KIND_BOOTSTRAP
+from fpl_predictor.tables import price_category
+from fpl_predictor.weights import SCORES, save_score_weights, weights_path
+
+TOP_K = 10
+# Kolik kol od rozhodnutí se počítá do skutečných bodů (stejně jako výběr kádru)
+OUTCOME_HORIZON = core.SQUAD_HORIZON
+N_SAMPLES = 5000
+N_BOOTSTRAP = 1000
+SEED = 2025
+CI_LEVEL = 0.95
+
+# Výchozí váhy a skupiny, ve kterých se berou nejlepší hráči
+SCORE_SETTINGS = {
+    'value_score': {'defaults': VALUE_SCORE_WEIGHTS, 'group': 'price_category'}
+}
+
+
+def training_data(root, use_model=True, horizon=OUTCOME_HORIZON):
+    """Příznaky a skutečné body hráčů ve všech GW jedné sezóny - řádek na hráče a GW
+
+    Sloupce: SCORE_FEATURES, season, gw, price_category a outcome
+    (průměrné skutečné body za kolo).
+    """
+    store = SnapshotStore(root)
+    final = core.load_snapshot(store, KIND_BOOTSTRAP)
+    if not final:
+        raise core.SnapshotNotFound(f"V {root} není žádný bootstrap snapshot")
+    events = final['data'].get('events', [])
+    finished = {event['id'] for event in events if event.get('finished')}
+    points_table, _ = actual_points(store)
+    season = season_label(store)
+
+    frames = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for gw, entry in sorted(decision_snapshots(store, events).items()):
+            window = [g for g in range(gw, gw + horizon) if g in finished]
+            if not window:
+                continue
+            bootstrap, fixtures_snapshot, history_snapshot = snapshot_records(store, entry, use_model)
+            players_df = core.build_pipeline(
+                bootstrap, fixtures_snapshot, history_snapshot=history_snapshot,
+                model_path=os.path.join(workdir, 'xp_model.npz')
+            )['players']
+            outcome = points_table.reindex(index=players_df['id'], columns=window, fill_value=0).mean(axis=1)
+            frames.append(score_features(players_df).assign(
+                season=season,
+                gw=gw,
+                price_category=price_category(players_df['price']).astype(str).to_numpy(),
+                outcome=outcome.to_numpy(dtype='float32')
+            ))
+    if not frames:
+        raise core.SnapshotNotFound(f"V {root} není snapshot před deadlinem žádného dohraného GW")
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_training_data(roots, use_model=True, workers=None):
+    """Data všech sezón najednou, sezóny paralelně v procesech (1 = bez poolu)"""
+    if workers == 1 or len(roots) == 1:
+        frames = [training_data(root, use_model) for root in roots]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            frames = list(pool.map(training_data, roots, [use_model] * len(roots)))
+    return pd.concat(frames, ignore_index=True)
+
+
+def candidate_weights(features, defaults, n_samples=N_SAMPLES, seed=SEED):
+    """Matice [vektor, příznak] - výchozí váhy (řádek 0) a náhodné vektory ze simplexu"""
+    rng = np.random.default_rng(seed)
+    default = np.array([defaults[name] for name in features], dtype='float64')
+    samples = rng.dirichlet(np.ones(len(features)), n_samples)
+    return np.vstack([default / default.sum(), samples]).astype('float32')
+
+
+def gameweek_objectives(data, features, group, weights, top_k=TOP_K):
+    """Pole [GW, vektor] - průměrné skutečné body top_k hráčů každé skupiny podle skóre"""
+    objectives = []
+    for _, gameweek in data.groupby(['season', 'gw'], sort=True):
+        matrix = gameweek[features].to_numpy(dtype='float32')
+        outcome = gameweek['outcome'].to_numpy(dtype='float32')
+        groups = gameweek[group].to_numpy()
+        total, n_groups = np.zeros(len(weights)), 0
+        for value in np.unique(groups):
+            members = np.flatnonzero(groups == value)
+            if len(members) <= top_k:
+                continue
+            # Skóre skupiny pro všechny vektory vah jedním součinem [vektor, hráč]
+            scores = weights @ matrix[members].T
+            threshold = np.partition(scores, -top_k, axis=1)[:, -top_k:-top_k + 1]
+            # Maska top hráčů @ skutečné body - hráči se stejným skóre na hranici se průměrují
+            top = scores >= threshold
+            total += (top @ outcome[members]) / top.sum(axis=1)
+            n_groups += 1
+        if n_groups:
+            objectives.append(total / n_groups)
+    return np.array(objectives).reshape(-1, len(weights))
+
+
+def tune_weights(data, score='value_score', n_samples=N_SAMPLES, seed=SEED, top_k=TOP_K, n_bootstrap=N_BOOTSTRAP):
+    """Nejlepší váhy skóre s intervaly spolehlivosti
+
+    Vrací slovník:
+        score, weights {příznak: váha}, weights_ci {příznak: [dolní, horní]}
+        objective, objective_ci  průměrné body top hráčů s nejlepšími vahami
+        baseline                 totéž s výchozími vahami
+        uplift_ci, p_better      zlepšení proti výchozím vahám (interval, P(> 0))
+        samples, gameweeks, tune_time
+    """
+    started = time.perf_counter()
+    settings = SCORE_SETTINGS[score]
+    features = list(settings['defaults'])
+    weights = candidate_weights(features, settings['defaults'], n_samples, seed)
+    objectives = gameweek_objectives(data, features, settings['group'], weights, top_k)
+    n_gw = len(objectives)
+    if not n_gw:
+        raise ValueError("Žádný GW s dost hráči pro ladění")
+
+    mean = objectives.mean(axis=0)
+    best = int(np.argmax(mean))
+    # Bootstrap přes GW: četnosti kol [vzorek, GW] @ [GW, vektor]
+    rng = np.random.default_rng(seed + 1)
+    resampled = rng.multinomial(n_gw, np.full(n_gw, 1 / n_gw), size=n_bootstrap) / n_gw
+    boot = resampled @ objectives
+    bounds = [(1 - CI_LEVEL) / 2 * 100, (1 + CI_LEVEL) / 2 * 100]
+    winners = np.percentile(weights[boot.argmax(axis=1)], bounds, axis=0)
+    uplift = boot[:, best] - boot[:, 0]
+
+    return {
+        'score': score,
+        'weights': {name: round(float(value), 4) for name, value in zip(features, weights[best])},
+        'weights_ci': {name: [round(float(low), 4), round(float(high), 4)] for name, low, high in zip(features, *winners)},
+        'objective': float(mean[best]),
+        'objective_ci': [float(value) for value in np.percentile(boot[:, best], bounds)],
+        'baseline': float(mean[0]),
+        'uplift_ci': [float(value) for value in np.percentile(uplift, bounds)],
+        'p_better': float((uplift > 0).mean()),
+        'samples': len(weights),
+        'gameweeks': n_gw,
+        'tune_time': time.perf_counter() - started
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m fpl_predictor.tuning', description=__doc__.splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter, epilog='\n'.join(__doc__.splitlines()[2:])
+    )
+    parser.add_argument('--snapshot-dir', nargs='+', required=True, help="adresáře snapshotů, jeden na sezónu")
+    parser.add_argument('--scores', nargs='+', choices=SCORES, default=SCORES)
+    parser.add_argument('--samples', type=int, default=N_SAMPLES, help="počet náhodných vektorů vah")
+    parser.add_argument('--top-k', type=int, default=TOP_K)
+    parser.add_argument('--bootstrap', type=int, default=N_BOOTSTRAP)
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--no-model', action='store_true', help="predikce z formy a ceny místo modelu xp_model")
+    parser.add_argument('--workers', type=int, help="počet procesů pro přípravu dat (výchozí počet jader)")
+    parser.add_argument('--save', action='store_true', help="uložit váhy jako novou verzi konfigurace")
+    parser.add_argument('--config', help="soubor konfigurace (jinak score_weights.json u snapshotů dashboardu)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        data = load_training_data(args.snapshot_dir, not args.no_model, args.workers)
+    except core.SnapshotNotFound as e:
+        parser.exit(1, f"{e}\n")
+    print(f"Data: {data['season'].nunique()} sezón, {data.groupby(['season', 'gw']).ngroups} GW, "
+          f"{len(data):,} řádků za {time.perf_counter() - started:.1f} s")
+
+    results = {}
+    for score in args.scores:
+        result = tune_weights(data, score, args.samples, args.seed, args.top_k, args.bootstrap)
+        results[score] = result
+        defaults = SCORE_SETTINGS[score]['defaults']
+        table = pd.DataFrame({
+            'výchozí': defaults,
+            'vyladěné': result['weights'],
+            'CI od': {name: ci[0] for name, ci in result['weights_ci'].items()},
+            'CI do': {name: ci[1] for name, ci in result['weights_ci'].items()}
+        })
+        low, high = result['uplift_ci']
+        print(f"\n{score}: {result['samples']:,} vektorů x {result['gameweeks']} GW za {result['tune_time']:.2f} s")
+        print(table.to_string())
+        print(f"Body top {args.top_k}: {result['baseline']:.3f} -> {result['objective']:.3f} "
+              f"(zlepšení {low:+.3f} až {high:+.3f}, P(lepší) {result['p_better']:.0%})")
+        if low <= 0:
+            print("Zlepšení není průkazné - interval zasahuje pod nulu")
+
+    if args.save:
+        path = args.config or weights_path(SnapshotStore().root)
+        config = save_score_weights(path, results, sorted(data['season'].unique()))
+        print(f"\nUloženo jako verze {config['version']} do {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    main()
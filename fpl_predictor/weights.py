@@ -0,0 +1,79 @@
+"""Verzovaná konfigurace vyladěných vah skóre (value skóre)
+
+Ladění (fpl_predictor.tuning) zapíše score_weights.v<N>.json s novou verzí
+a zkopíruje ho do score_weights.json, který čte dashboard, CLI i služba.
+Starší verze zůstávají vedle pro návrat. Bez souboru (nebo s jiným
+formátem) platí ručně zvolené výchozí váhy v kódu. Sekce skóre, která se
+už neladí (ai_score ze starších verzí), se do nové verze nepřenáší.
+"""
+import json
+import os
+
+from fpl_predictor.snapshots import utc_timestamp
+from fpl_predictor.xp_model import MODEL_DIR
+
+CONFIG_FORMAT = 1
+CONFIG_NAME = 'score_weights'
+SCORES = ['value_score']
+
+
+def weights_path(snapshot_root):
+    """Aktuální konfigurace vah vedle snapshotů (stejný adresář jako model xp_model)"""
+    return os.path.join(snapshot_root, MODEL_DIR, f"{CONFIG_NAME}.json")
+
+
+def load_score_weights(path):
+    """Konfigurace {version, created_at, value_score, ...} nebo None"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if config.get('format') != CONFIG_FORMAT:
+        return None
+    return config
+
+
+def tuned_weights(config, score):
+    """Váhy {příznak: váha} jednoho skóre z konfigurace (None = výchozí v kódu)"""
+    if not config or score not in config:
+        return None
+    return config[score]['weights']
+
+
+def save_score_weights(path, results, seasons=()):
+    """Uloží výsledky ladění jako novou verzi a vrátí zapsanou konfiguraci
+
+    `results` je {skóre: výsledek tune_weights}. Skóre, která se tentokrát
+    neladila, se převezmou z předchozí verze.
+    """
+    previous = load_score_weights(path) or {}
+    config = {
+        'format': CONFIG_FORMAT,
+        'version': previous.get('version', 0) + 1,
+        'created_at': utc_timestamp(),
+        'seasons': list(seasons)
+    }
+    for score in SCORES:
+        if score in results:
+            result = results[score]
+            config[score] = {
+                key: result[key] for key in [
+                    'weights', 'weights_ci', 'objective', 'objective_ci', 'baseline', 'uplift_ci',
+                    'p_better', 'samples', 'gameweeks'
+                ]
+            }
+        elif score in previous:
+            config[score] = previous[score]
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    versioned = os.path.join(directory, f"{CONFIG_NAME}.v{config['version']}.json")
+    with open(versioned, 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=1)
+    # Aktuální verze přes dočasný soubor, aby čtenář nikdy neviděl polovičatý JSON
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+    return config
@@ -0,0 +1,317 @@
+"""Model očekávaných bodů z historie hráčů (element-summary)
+
+Pro každého hráče se vede stav - exponenciálně vážené průměry minut, startů,
+bodů, xG, xA (bez nich gólů a asistencí), čistých kont a bonusu za odehrané
+zápasy. Řádek pro zápas spojí stav hráče před kolem s pozicí, cenou,
+obtížností soupeře (FDR) a domácím prostředím a hřebenová regrese z něj
+odhadne body. Hráč za £15m, který nehraje, tak dostane nízkou predikci.
+
+Trénuje se po kolech: nejdřív se řádky kola předpoví dosavadními vahami
+(průběžná chyba), pak se přičtou do součtů X'X a X'y se zapomínáním
+starších kol a nakonec se aktualizují stavy hráčů. Každé nové kolo tedy
+stojí jen své řádky a řešení soustavy 17x17, ne trénink od začátku. Model
+se ukládá do .npz a při dalším snapshotu se jen doučí nová kola - eviduje
+množinu naučených kol, takže kolo, které čekalo na odložený zápas, se
+doučí i po pozdějších kolech.
+
+Predikce pro všechny hráče a N kol je jedno maticové násobení přes
+[hráč, GW, zápas v kole, příznak].
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from fpl_predictor.fixtures import gameweek_window
+from fpl_predictor.simulation import ASSIST_POINTS, CLEAN_SHEET_POINTS, GOAL_POINTS
+
+# Váha předchozího stavu v klouzavém průměru za každý zápas
+DECAY = 0.8
+# Váha součtů X'X, X'y z předchozích kol (starší sezóna se pomalu zapomíná)
+FORGET = 0.97
+RIDGE = 10.0
+MODEL_VERSION = 2
+# Podadresář úložiště snapshotů, kde se model mezi snapshoty doučuje
+MODEL_DIR = 'models'
+
+STATE_FIELDS = ['minutes', 'starts', 'points', 'goals', 'assists', 'clean_sheets', 'bonus']
+FEATURES = [
+    'intercept', 'defender', 'midfielder', 'forward', 'minutes', 'starts', 'points', 'goal_points',
+    'assist_points', 'clean_sheet_points', 'bonus', 'price', 'no_history', 'fdr', 'fdr_x_starts',
+    'home', 'home_x_starts'
+]
+HISTORY_COLUMNS = [
+    'element', 'fixture', 'round', 'minutes', 'total_points', 'goals_scored', 'assists',
+    'clean_sheets', 'bonus', 'was_home', 'value'
+]
+
+
+def model_path(snapshot_root):
+    """Soubor modelu vedle snapshotů"""
+    return os.path.join(snapshot_root, MODEL_DIR, 'xp_model.npz')
+
+
+def history_frame(history, fixtures_data=None):
+    """Řádky historie všech hráčů jako jeden DataFrame seřazený podle kola
+
+    Doplní FDR soupeře z fixtures (bez nich 3), xG/xA jako čísla (bez nich
+    góly a asistence) a pořadí zápasu hráče v kole (double GW).
+    """
+    rows = [row for summary in history.values() for row in summary.get('history', [])]
+    if not rows:
+        return pd.DataFrame(columns=HISTORY_COLUMNS + ['xg', 'xa', 'fdr', 'slot'])
+    frame = pd.DataFrame.from_records(rows)
+    for column in ['expected_goals', 'expected_assists']:
+        if column not in frame:
+            frame[column] = np.nan
+    frame['xg'] = pd.to_numeric(frame['expected_goals'], errors='coerce').fillna(frame['goals_scored'])
+    frame['xa'] = pd.to_numeric(frame['expected_assists'], errors='coerce').fillna(frame['assists'])
+
+    difficulty = {
+        f['id']: (f['team_h_difficulty'], f['team_a_difficulty']) for f in fixtures_data or []
+    }
+    home = frame['was_home'].to_numpy(dtype=bool)
+    known = [difficulty.get(fixture, (3, 3)) for fixture in frame['fixture']]
+    frame['fdr'] = np.where(home, [h for h, _ in known], [a for _, a in known]).astype('float32')
+
+    frame = frame[HISTORY_COLUMNS + ['xg', 'xa', 'fdr']].sort_values(['round', 'fixture'], kind='stable')
+    frame['slot'] = frame.groupby(['element', 'round']).cumcount()
+    return frame.reset_index(drop=True)
+
+
+def finished_rounds(fixtures_data, history_rounds):
+    """Kola, ve kterých jsou dohrané všechny zápasy (jen ta se smí učit)"""
+    if not fixtures_data:
+        # Bez fixtures bereme jako hotová všechna kola kromě posledního v historii
+        return set(sorted(set(history_rounds))[:-1])
+    pending = {f['event'] for f in fixtures_data if f['event'] and not f['finished']}
+    return {gw for gw in set(history_rounds) if gw not in pending}
+
+
+def season_of(fixtures_data):
+    """Rok začátku sezóny podle prvního výkopu (None bez fixtures)"""
+    kickoffs = [f['kickoff_time'] for f in fixtures_data or [] if f.get('kickoff_time')]
+    return min(kickoffs)[:4] if kickoffs else None
+
+
+class XPModel:
+    """Inkrementálně trénovaná hřebenová regrese očekávaných bodů za zápas"""
+
+    def __init__(self, season=None):
+        self.season = season
+        n_features = len(FEATURES)
+        self.xtx = np.zeros((n_features, n_features))
+        self.xty = np.zeros(n_features)
+        self.weights = np.zeros(n_features)
+        self.state = {field: np.zeros(0, dtype='float64') for field in STATE_FIELDS + ['count']}
+        self.learned_rounds = set()
+        self.rows = 0
+        # Průběžná chyba: predikce kola vahami naučenými jen na předchozích kolech
+        self.squared_error = 0.0
+        self.scored_rows = 0
+
+    @property
+    def trained(self):
+        return self.rows > 0
+
+    @property
+    def trained_through(self):
+        """Nejvyšší naučené kolo (0 = žádné)"""
+        return max(self.learned_rounds, default=0)
+
+    @property
+    def rmse(self):
+        return float(np.sqrt(self.squared_error / self.scored_rows)) if self.scored_rows else None
+
+    def _sized_state(self, max_id):
+        """Stavy hráčů s místem pro id až max_id
+
+        Zvětšené stavy jsou nová pole - predikce nad sdíleným modelem z cache
+        tak jeho stav nemění, do modelu je přiřadí jen update.
+        """
+        size = len(self.state['count'])
+        if max_id < size:
+            return self.state
+        return {field: np.concatenate([values, np.zeros(max_id + 1 - size)]) for field, values in self.state.items()}
+
+    def _player_features(self, ids, positions, price):
+        """Příznaky hráče nezávislé na zápase, pole [hráč, příznak] (bez fdr a home)"""
+        state = self._sized_state(int(ids.max(initial=0)))
+        count = state['count'][ids]
+        # Korekce klouzavého průměru na počet zápasů (jako u Adamu)
+        norm = np.where(count > 0, 1 - DECAY ** count, 1.0)
+        mean = {field: state[field][ids] / norm for field in STATE_FIELDS}
+        codes = np.asarray(positions)
+        goal_value = np.array([GOAL_POINTS.get(p, 4) for p in codes], dtype='float64')
+        cs_value = np.array([CLEAN_SHEET_POINTS.get(p, 0) for p in codes], dtype='float64')
+        return np.column_stack([
+            np.ones(len(ids)),
+            codes == 'Defender',
+            codes == 'Midfielder',
+            codes == 'Forward',
+            mean['minutes'] / 90,
+            mean['starts'],
+            mean['points'],
+            mean['goals'] * goal_value,
+            mean['assists'] * ASSIST_POINTS,
+            mean['clean_sheets'] * cs_value,
+            mean['bonus'],
+            np.asarray(price, dtype='float64'),
+            count == 0
+        ]).astype('float64')
+
+    @staticmethod
+    def _with_fixture(player_features, fdr, home):
+        """Doplní příznaky zápasu; fdr a home se broadcastují proti hráčům"""
+        starts = player_features[..., FEATURES.index('starts')]
+        fdr = np.asarray(fdr, dtype='float64') - 3
+        home = np.asarray(home, dtype='float64') - 0.5
+        fixture = np.stack(np.broadcast_arrays(fdr, fdr * starts, home, home * starts), axis=-1)
+        return np.concatenate([np.broadcast_to(player_features, fixture.shape[:-1] + player_features.shape[-1:]),
+                               fixture], axis=-1)
+
+    def _update_state(self, rounds_rows):
+        for _, rows in rounds_rows.groupby('slot', sort=True):
+            ids = rows['element'].to_numpy(dtype='int64')
+            minutes = rows['minutes'].to_numpy(dtype='float64')
+            values = {
+                'minutes': minutes,
+                'starts': minutes >= 60,
+                'points': rows['total_points'].to_numpy(dtype='float64'),
+                'goals': rows['xg'].to_numpy(dtype='float64'),
+                'assists': rows['xa'].to_numpy(dtype='float64'),
+                'clean_sheets': rows['clean_sheets'].to_numpy(dtype='float64'),
+                'bonus': rows['bonus'].to_numpy(dtype='float64')
+            }
+            for field, value in values.items():
+                self.state[field][ids] = DECAY * self.state[field][ids] + (1 - DECAY) * value
+            self.state['count'][ids] += 1
+
+    def update(self, frame, positions_by_id, rounds):
+        """Doučí kola z `rounds`, která model ještě neviděl; vrací počet nových kol
+
+        `frame` je výstup history_frame, `positions_by_id` mapuje id hráče
+        na pozici (hráči mimo něj se přeskočí).
+        """
+        new_rounds = sorted(set(rounds) - self.learned_rounds)
+        if not new_rounds:
+            return 0
+        frame = frame[frame['round'].isin(new_rounds) & frame['element'].isin(positions_by_id.index)]
+        self.state = self._sized_state(int(frame['element'].max()) if len(frame) else 0)
+        regularizer = RIDGE * np.eye(len(FEATURES))
+        regularizer[0, 0] = 0
+
+        for gw in new_rounds:
+            rows = frame[frame['round'] == gw]
+            if len(rows):
+                ids = rows['element'].to_numpy(dtype='int64')
+                player = self._player_features(ids, positions_by_id.loc[ids].to_numpy(), rows['value'].to_numpy() / 10)
+                x = self._with_fixture(player, rows['fdr'].to_numpy(), rows['was_home'].to_numpy(dtype=bool))
+                y = rows['total_points'].to_numpy(dtype='float64')
+                if self.trained:
+                    self.squared_error += float(((x @ self.weights - y) ** 2).sum())
+                    self.scored_rows += len(y)
+                self.xtx = FORGET * self.xtx + x.T @ x
+                self.xty = FORGET * self.xty + x.T @ y
+                self.rows += len(y)
+                self.weights = np.linalg.solve(self.xtx + regularizer, self.xty)
+                self._update_state(rows)
+            self.learned_rounds.add(gw)
+        return len(new_rounds)
+
+    def predict_match(self, players_df, fdr=3, home=0.5):
+        """Očekávané body každého hráče za jeden zápas (výchozí je průměrný soupeř)"""
+        player = self._player_features(
+            players_df['id'].to_numpy(dtype='int64'), players_df['position'].astype(str).to_numpy(),
+            players_df['price'].to_numpy()
+        )
+        return np.maximum(self._with_fixture(player, fdr, home) @ self.weights, 0).astype('float32')
+
+    def project(self, players_df, fixture_matrix, from_gw, horizon=6):
+        """Očekávané body všech hráčů v kolech from_gw .. from_gw + horizon - 1
+
+        Stejné rozhraní jako projection.project_points - vrací (pole [hráč,
+        GW], seznam GW). Blank GW dává 0, double GW součet obou zápasů.
+        """
+        window = gameweek_window(fixture_matrix, from_gw, horizon)
+        gameweeks = list(range(window.start, window.stop))
+        player = self._player_features(
+            players_df['id'].to_numpy(dtype='int64'), players_df['position'].astype(str).to_numpy(),
+            players_df['price'].to_numpy()
+        )
+        if not fixture_matrix['count'].any():
+            return np.repeat(self.predict_match(players_df)[:, None], len(gameweeks), axis=1), gameweeks
+
+        team_ids = players_df['team_id'].to_numpy(dtype='int64')
+        fdr = fixture_matrix['fdr'][team_ids, window, :]
+        home = fixture_matrix['is_home'][team_ids, window, :]
+        # [hráč, GW, zápas, příznak] @ váhy - jedno násobení pro všechny
+        x = self._with_fixture(player[:, None, None, :], fdr, home)
+        points = np.maximum(x @ self.weights, 0) * (fdr > 0)
+        return points.sum(axis=2).astype('float32'), gameweeks
+
+    def coefficients(self):
+        return dict(zip(FEATURES, self.weights.round(4).tolist()))
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp_path, version=MODEL_VERSION, season=str(self.season), xtx=self.xtx, xty=self.xty,
+            weights=self.weights, learned_rounds=np.array(sorted(self.learned_rounds), dtype='int64'), rows=self.rows,
+            squared_error=self.squared_error, scored_rows=self.scored_rows,
+            **{f"state_{field}": values for field, values in self.state.items()}
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Uložený model, nebo None, pokud soubor není nebo má jinou verzi"""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as saved:
+            if int(saved['version']) != MODEL_VERSION or saved['xtx'].shape != (len(FEATURES), len(FEATURES)):
+                return None
+            model = cls(None if str(saved['season']) == 'None' else str(saved['season']))
+            model.xtx, model.xty, model.weights = saved['xtx'], saved['xty'], saved['weights']
+            model.learned_rounds = {int(gw) for gw in saved['learned_rounds']}
+            model.rows = int(saved['rows'])
+            model.squared_error = float(saved['squared_error'])
+            model.scored_rows = int(saved['scored_rows'])
+            model.state = {field: saved[f"state_{field}"] for field in STATE_FIELDS + ['count']}
+        return model
+
+
+def train_xp_model(history, fixtures_data, players_df, model_path=None):
+    """Model natrénovaný na dohraných kolech historie (None bez historie)
+
+    S `model_path` se načte dříve uložený model a doučí se jen nová kola.
+    Od začátku se trénuje, když soubor chybí, je z jiné sezóny nebo už
+    viděl kola, která tu dohraná nejsou (přehrávání starého snapshotu) -
+    takový model se pak neukládá přes novější.
+    """
+    if not history:
+        return None
+    frame = history_frame(history, fixtures_data)
+    rounds = finished_rounds(fixtures_data, frame['round'])
+    if not rounds:
+        return None
+
+    season = season_of(fixtures_data)
+    saved = XPModel.load(model_path) if model_path else None
+    fresh = saved is None or saved.season != season or not saved.learned_rounds <= rounds
+    model = XPModel(season) if fresh else saved
+
+    positions_by_id = players_df.set_index('id')['position'].astype(str)
+    learned = model.update(frame, positions_by_id, rounds)
+    replaces_newer = saved is not None and saved.season == season and not saved.learned_rounds <= model.learned_rounds
+    if model_path and learned and not replaces_newer:
+        model.save(model_path)
+    return model if model.trained else None
+
+
+def apply_xp_model(players_df, model):
+    """Hráči s predikcí za zápas z modelu místo formy a ceny (beze změny bez modelu)"""
+    if model is None:
+        return players_df
+    return players_df.assign(predicted_points=model.predict_match(players_df))
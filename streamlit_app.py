@@ -1,1157 +1,962 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import requests
-import json
-from datetime import datetime
-
-# Konfigurace stránky
-st.set_page_config(
-    page_title="FPL Predictor - Live Data",
-    page_icon="⚽",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Custom CSS pro lepší vzhled
-st.markdown("""
-<style>
-    .main {
-        padding-top: 2rem;
-    }
-    .stSelectbox > div > div > div {
-        background-color: #1e293b;
-    }
-    .metric-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 1rem;
-        border-radius: 10px;
-        color: white;
-        text-align: center;
-        margin: 0.5rem 0;
-    }
-    .player-card {
-        background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-        color: white;
-    }
-    .formation-field {
-        background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-        padding: 2rem;
-        border-radius: 15px;
-        margin: 1rem 0;
-    }
-    .live-indicator {
-        background: linear-gradient(45deg, #ff6b6b, #ee5a24);
-        color: white;
-        padding: 0.5rem 1rem;
-        border-radius: 20px;
-        font-weight: bold;
-        display: inline-block;
-        margin: 0.5rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# API funkce pro načítání dat z FPL
-@st.cache_data(ttl=300)
-def fetch_fpl_data():
-    """Načte základní data z FPL API"""
-    try:
-        base_url = "https://fantasy.premierleague.com/api/"
-        response = requests.get(f"{base_url}bootstrap-static/", timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        st.error(f"Chyba při načítání dat z FPL API: {e}")
-        return None
-
-@st.cache_data(ttl=300)
-def fetch_fixtures_data():
-    """Načte data o zápasech"""
-    try:
-        base_url = "https://fantasy.premierleague.com/api/"
-        response = requests.get(f"{base_url}fixtures/", timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        st.error(f"Chyba při načítání fixtures z FPL API: {e}")
-        return None
-
-def process_players_data(fpl_data):
-    """Zpracuje data hráčů z FPL API - zaměřeno na novou sezónu 2025/26"""
-    if not fpl_data:
-        return pd.DataFrame()
-    
-    players = []
-    teams = {team['id']: team['name'] for team in fpl_data['teams']}
-    positions = {pos['id']: pos['singular_name'] for pos in fpl_data['element_types']}
-    
-    for player in fpl_data['elements']:
-        # Pro novou sezónu se zaměřujeme na aktuální formu a očekávání
-        form_score = float(player['form']) if player['form'] else 0
-        
-        # Predikce založená na formě a ceně (vyšší cena = vyšší očekávání)
-        price_factor = (player['now_cost'] / 10.0) / 15.0
-        predicted_points = form_score + (price_factor * 3)
-        
-        players.append({
-            'id': player['id'],
-            'name': f"{player['first_name']} {player['second_name']}",
-            'web_name': player['web_name'],
-            'team': teams.get(player['team'], 'Unknown'),
-            'team_code': player['team_code'],
-            'position': positions.get(player['element_type'], 'Unknown'),
-            'price': player['now_cost'] / 10.0,
-            'form': form_score,
-            'selected_by_percent': float(player['selected_by_percent']),
-            'predicted_points': predicted_points,
-            'minutes': player['minutes'],
-            'news': player['news'] if player['news'] else '',
-            'chance_of_playing_this_round': player['chance_of_playing_this_round'],
-            'chance_of_playing_next_round': player['chance_of_playing_next_round'],
-            'transfers_in': player['transfers_in'],
-            'transfers_out': player['transfers_out'],
-            'status': player['status'],
-            'goals_scored': player['goals_scored'],
-            'assists': player['assists'],
-            'clean_sheets': player['clean_sheets'],
-            'bonus': player['bonus'],
-            'total_points': player['total_points']
-        })
-    
-    return pd.DataFrame(players)
-
-def process_fixtures_data(fixtures_data, teams_dict):
-    """Zpracuje data o zápasech"""
-    if not fixtures_data:
-        return pd.DataFrame()
-    
-    fixtures = []
-    for fixture in fixtures_data[:20]:
-        if fixture['finished']:
-            continue
-            
-        home_team = teams_dict.get(fixture['team_h'], 'Unknown')
-        away_team = teams_dict.get(fixture['team_a'], 'Unknown')
-        
-        home_difficulty = fixture['team_h_difficulty']
-        away_difficulty = fixture['team_a_difficulty']  
-        avg_difficulty = (home_difficulty + away_difficulty) / 2
-        
-        fixtures.append({
-            'id': fixture['id'],
-            'gameweek': fixture['event'],
-            'home_team': home_team,
-            'away_team': away_team,
-            'home_team_id': fixture['team_h'],
-            'away_team_id': fixture['team_a'],
-            'difficulty': round(avg_difficulty),
-            'home_difficulty': home_difficulty,
-            'away_difficulty': away_difficulty,
-            'kickoff_time': fixture['kickoff_time'],
-            'finished': fixture['finished'],
-            'started': fixture['started']
-        })
-    
-    return pd.DataFrame(fixtures)
-
-def get_current_gameweek(fpl_data):
-    """Najde aktuální gameweek"""
-    if not fpl_data:
-        return 1
-    
-    current_gw = 1
-    for event in fpl_data['events']:
-        if event['is_current']:
-            current_gw = event['id']
-            break
-        elif event['is_next']:
-            current_gw = event['id']
-            break
-    
-    return current_gw
-
-def create_ai_team(players_df, fixtures_df, current_gw, budget=100.0):
-    """Vytvoří AI doporučený tým podle oficiálních FPL pravidel 2025/26"""
-    
-    # Oficiální FPL pravidla:
-    # - £100m budget
-    # - 15 hráčů: 2 GK, 5 DEF, 5 MID, 3 FWD
-    # - Max 3 z jednoho týmu
-    # - Starting XI: 1 GK, min 3 DEF, min 2 MID, min 1 FWD, max 11 celkem
-    
-    # Filtrace dostupných hráčů (bez zraněných a suspendovaných)
-    available_players = players_df[
-        (players_df['status'] == 'a') &  # Pouze available hráči
-        (players_df['chance_of_playing_this_round'].isna() | (players_df['chance_of_playing_this_round'] >= 75))
-    ].copy()
-    
-    if available_players.empty:
-        # Fallback pokud nejsou dostupní hráči
-        available_players = players_df.copy()
-    
-    # AI skóring pro optimální výběr
-    available_players['ai_score'] = (
-        available_players['predicted_points'] * 0.35 +  # Predikovaná výkonnost
-        available_players['form'] * 0.25 +               # Aktuální forma
-        (available_players['price'] * 0.15) +            # Prémiové hráči bonus
-        ((100 - available_players['selected_by_percent']) / 100 * 0.15) + # Differential bonus
-        (available_players['transfers_in'] / 50000 * 0.1)  # Transfer trend
-    )
-    
-    team = {
-        'GK': [],
-        'DEF': [],
-        'MID': [],
-        'FWD': []
-    }
-    
-    used_budget = 0.0
-    team_counts = {}  # Počítadlo hráčů z každého týmu (max 3)
-    
-    def can_add_player(player, position, max_count):
-        """Kontrola, zda lze přidat hráče podle FPL pravidel"""
-        # Kontrola rozpočtu
-        if used_budget + player['price'] > budget:
-            return False
-        
-        # Kontrola max hráčů z týmu (max 3)
-        current_from_team = team_counts.get(player['team'], 0)
-        if current_from_team >= 3:
-            return False
-            
-        # Kontrola max hráčů na pozici
-        if len(team[position]) >= max_count:
-            return False
-            
-        return True
-    
-    # 1. BRANKÁŘI (2 hráči: 1 premium + 1 budget)
-    goalkeepers = available_players[available_players['position'] == 'Goalkeeper'].sort_values('ai_score', ascending=False)
-    
-    # Premium GK (£4.5-6.0m)
-    premium_gks = goalkeepers[(goalkeepers['price'] >= 4.5) & (goalkeepers['price'] <= 6.0)]
-    if not premium_gks.empty:
-        for _, gk in premium_gks.iterrows():
-            if can_add_player(gk, 'GK', 2):
-                team['GK'].append(gk)
-                used_budget += gk['price']
-                team_counts[gk['team']] = team_counts.get(gk['team'], 0) + 1
-                break
-    
-    # Budget GK (£4.0-4.5m)
-    budget_gks = goalkeepers[(goalkeepers['price'] <= 4.5) & (~goalkeepers['team'].isin([p['team'] for p in team['GK']]))]
-    if not budget_gks.empty:
-        for _, gk in budget_gks.iterrows():
-            if can_add_player(gk, 'GK', 2):
-                team['GK'].append(gk)
-                used_budget += gk['price']
-                team_counts[gk['team']] = team_counts.get(gk['team'], 0) + 1
-                break
-    
-    # 2. OBRÁNCI (5 hráčů: mix cen)
-    defenders = available_players[available_players['position'] == 'Defender'].sort_values('ai_score', ascending=False)
-    
-    target_def_budget = 25.0  # Cílový rozpočet na obránce
-    for _, defender in defenders.iterrows():
-        if len(team['DEF']) >= 5:
-            break
-        if can_add_player(defender, 'DEF', 5):
-            # Kontrola, aby nepřekročili rozpočet na obránce
-            if sum(p['price'] for p in team['DEF']) + defender['price'] <= target_def_budget:
-                team['DEF'].append(defender)
-                used_budget += defender['price']
-                team_counts[defender['team']] = team_counts.get(defender['team'], 0) + 1
-    
-    # 3. ZÁLOŽNÍCI (5 hráčů: focus na prémiové)
-    midfielders = available_players[available_players['position'] == 'Midfielder'].sort_values('ai_score', ascending=False)
-    
-    target_mid_budget = 50.0  # Nejvíc peněz jde do záložníků
-    for _, midfielder in midfielders.iterrows():
-        if len(team['MID']) >= 5:
-            break
-        if can_add_player(midfielder, 'MID', 5):
-            remaining_budget = budget - used_budget - 15.0  # Nechej 15m na útočníky
-            if midfielder['price'] <= remaining_budget:
-                team['MID'].append(midfielder)
-                used_budget += midfielder['price']
-                team_counts[midfielder['team']] = team_counts.get(midfielder['team'], 0) + 1
-    
-    # 4. ÚTOČNÍCI (3 hráči)
-    forwards = available_players[available_players['position'] == 'Forward'].sort_values('ai_score', ascending=False)
-    
-    for _, forward in forwards.iterrows():
-        if len(team['FWD']) >= 3:
-            break
-        if can_add_player(forward, 'FWD', 3):
-            remaining_budget = budget - used_budget + 0.5  # Tolerance 0.5m
-            if forward['price'] <= remaining_budget:
-                team['FWD'].append(forward)
-                used_budget += forward['price']
-                team_counts[forward['team']] = team_counts.get(forward['team'], 0) + 1
-    
-    # Kontrola kompletnosti týmu podle FPL pravidel
-    if len(team['GK']) < 2 or len(team['DEF']) < 5 or len(team['MID']) < 5 or len(team['FWD']) < 3:
-        st.error("⚠️ Nepodařilo se vytvořit kompletní tým podle FPL pravidel. Zkuste to znovu.")
-    
-    return team, used_budget
-
-def get_optimal_formation(team):
-    """Určí optimální formaci pro starting XI podle AI skóre"""
-    all_outfield = []
-    
-    # Seřaď všechny hráče mimo brankáře podle AI skóre
-    for pos in ['DEF', 'MID', 'FWD']:
-        for player in team.get(pos, []):
-            all_outfield.append((player, pos))
-    
-    all_outfield.sort(key=lambda x: x[0]['ai_score'], reverse=True)
-    
-    # FPL pravidla pro starting XI: min 3 DEF, min 2 MID, min 1 FWD
-    formation = {
-        'GK': team['GK'][:1],  # Nejlepší brankář
-        'DEF': [],
-        'MID': [],
-        'FWD': []
-    }
-    
-    # Postupně přidávej nejlepší hráče respektujíc minimální požadavky
-    def_count = mid_count = fwd_count = 0
-    
-    for player, pos in all_outfield:
-        total_selected = def_count + mid_count + fwd_count
-        
-        if total_selected >= 10:  # Max 10 outfield hráčů
-            break
-            
-        if pos == 'DEF' and def_count < 5:
-            formation['DEF'].append(player)
-            def_count += 1
-        elif pos == 'MID' and mid_count < 5:
-            formation['MID'].append(player)
-            mid_count += 1
-        elif pos == 'FWD' and fwd_count < 3:
-            formation['FWD'].append(player)
-            fwd_count += 1
-    
-    # Zajisti minimální požadavky (3 DEF, 2 MID, 1 FWD)
-    if def_count < 3 or mid_count < 2 or fwd_count < 1:
-        st.warning("⚠️ Formace nesplňuje FPL minimální požadavky")
-    
-    return formation
-
-def get_player_next_fixtures(player_team, fixtures_df, current_gw, count=4):
-    """Získá následující fixtures pro hráče"""
-    team_fixtures = fixtures_df[
-        ((fixtures_df['home_team'] == player_team) | (fixtures_df['away_team'] == player_team)) &
-        (fixtures_df['gameweek'] >= current_gw) &
-        (fixtures_df['gameweek'] <= current_gw + count - 1)
-    ].sort_values('gameweek')
-    
-    fixtures_info = []
-    for _, fixture in team_fixtures.iterrows():
-        is_home = fixture['home_team'] == player_team
-        opponent = fixture['away_team'] if is_home else fixture['home_team']
-        difficulty = fixture['home_difficulty'] if is_home else fixture['away_difficulty']
-        
-        fixtures_info.append({
-            'gw': fixture['gameweek'],
-            'opponent': opponent[:3].upper(),
-            'is_home': is_home,
-            'difficulty': difficulty
-        })
-    
-    return fixtures_info
-
-def create_transfer_strategy(current_gw, team, fixtures_df):
-    """Vytvoří transfer strategii pro následující gameweeks"""
-    
-    # FPL 2025/26 pravidla:
-    # - 1 free transfer každý GW
-    # - Můžeš "bankovat" max 5 FT
-    # - Extra transfery = -4 body každý
-    # - 2x Wildcard (do 29.12 a po 29.12)
-    # - 2x každý chip v každé půlce sezóny
-    # - GW16: Bonus 5 FT kvůli AFCON
-    
-    strategies = []
-    
-    for i in range(4):
-        gw = current_gw + i
-        
-        if gw == current_gw:
-            # Aktuální GW
-            strategies.append({
-                'gw': gw,
-                'title': 'ZAČÁTEK SEZÓNY',
-                'transfers': '0 FT - Hodnocení výkonnosti',
-                'captain_logic': 'Nejlepší fixture + forma',
-                'strategy': 'Sleduj výkonnost všech hráčů, injury news a rotace. Žádné panické změny!',
-                'risk': '🟢 Bezpečný',
-                'focus': 'Stabilita a pozorování',
-                'chips': 'Žádné - šetři na později',
-                'key_moves': ['Kapitán na nejlepší fixture', 'Sleduj injury news', 'Žádné transfery']
-            })
-            
-        elif gw == current_gw + 1:
-            # GW2
-            strategies.append({
-                'gw': gw,
-                'title': 'PRVNÍ REAKCE',
-                'transfers': '1 FT - Výměna neúspěšného',
-                'captain_logic': 'Stejný kapitán pokud dobře, jinak change',
-                'strategy': 'Jeden transfer na výměnu hráče, který nedostal minuty nebo má injury. Zatím žádné větší změny.',
-                'risk': '🟡 Opatrný',
-                'focus': 'Drobné opravy',
-                'chips': 'Možná Bench Boost pokud máš silnou lavičku',
-                'key_moves': ['OUT: Non-starter nebo injured', 'IN: Nailed starter', 'Kapitán podle fixtures']
-            })
-            
-        elif gw == current_gw + 2:
-            # GW3
-            strategies.append({
-                'gw': gw,
-                'title': 'FIXTURE SWING',
-                'transfers': '1-2 FT - Fixture optimalizace',
-                'captain_logic': 'Premium vs slabý opponent',
-                'strategy': 'Zaměř se na týmy s nejlepšími fixtures pro GW3-6. Možná double transfer pokud máš 2 FT.',
-                'risk': '🟡 Střední',
-                'focus': 'Fixture exploitation',
-                'chips': 'Možná Triple Captain na premium vs promoted team',
-                'key_moves': ['IN: Dobré fixtures', 'OUT: Těžké fixtures', 'Kapitán na diferenciál']
-            })
-            
-        elif gw == current_gw + 3:
-            # GW4
-            strategies.append({
-                'gw': gw,
-                'title': 'STRATEGICKÉ ROZHODNUTÍ',
-                'transfers': 'Wildcard NEBO bank transfer',
-                'captain_logic': 'Konzistentní performer',
-                'strategy': 'Pokud máš 4+ problémových hráčů, aktivuj první Wildcard. Jinak bank transfer pro GW5.',
-                'risk': '🔴 Kritický',
-                'focus': 'Dlouhodobé plánování',
-                'chips': 'První Wildcard pokud je potřeba major restructure',
-                'key_moves': ['Rozhodnutí o WC', 'Nebo bank FT', 'Příprava na fixture swing']
-            })
-    
-    return strategies
-
-def get_position_color(position):
-    colors = {
-        'Goalkeeper': '#eab308',
-        'Defender': '#3b82f6', 
-        'Midfielder': '#22c55e',
-        'Forward': '#ef4444'
-    }
-    return colors.get(position, '#6b7280')
-
-def get_difficulty_color(difficulty):
-    if difficulty <= 2:
-        return '#22c55e'
-    elif difficulty == 3:
-        return '#eab308'
-    elif difficulty == 4:
-        return '#f97316'
-    else:
-        return '#ef4444'
-
-def format_price(price):
-    """Formátuje cenu hráče"""
-    return f"£{price:.1f}m"
-
-def main():
-    # Header s live indikátorem
-    st.markdown("""
-    <div style='background: linear-gradient(90deg, #667eea 0%, #764ba2 100%); padding: 2rem; border-radius: 10px; margin-bottom: 2rem;'>
-        <h1 style='color: white; text-align: center; margin: 0;'>⚽ FPL Predictor</h1>
-        <p style='color: #e2e8f0; text-align: center; margin: 0.5rem 0 0 0;'>Sezóna 2025/26 - Čerstvý start!</p>
-        <div style='text-align: center;'>
-            <span class='live-indicator'>🔴 LIVE DATA</span>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # Načtení dat
-    with st.spinner('Načítám aktuální data z FPL API...'):
-        fpl_data = fetch_fpl_data()
-        fixtures_raw = fetch_fixtures_data()
-        
-    if not fpl_data:
-        st.error("Nepodařilo se načíst data z FPL API. Zkuste to později.")
-        return
-    
-    # Zpracování dat
-    players_df = process_players_data(fpl_data)
-    teams_dict = {team['id']: team['name'] for team in fpl_data['teams']}
-    fixtures_df = process_fixtures_data(fixtures_raw, teams_dict) if fixtures_raw else pd.DataFrame()
-    current_gw = get_current_gameweek(fpl_data)
-    
-    # Info panel s aktuálními statistikami pro novou sezónu
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.metric("Aktuální GW", current_gw)
-    with col2:
-        st.metric("Celkem hráčů", len(players_df))
-    with col3:
-        avg_price = players_df['price'].mean()
-        st.metric("Průměrná cena", f"£{avg_price:.1f}m")
-    with col4:
-        last_update = datetime.now().strftime("%H:%M")
-        st.metric("Poslední update", last_update)
-    
-    # Info o nové sezóně
-    st.info("🆕 **Nová sezóna 2025/26** - Všichni hráči začínají s čistým štítem! Predikce jsou založené na formě z předsezóny a ceně hráčů.")
-
-    # Sidebar s navigací
-    st.sidebar.title("📊 Navigace")
-    selected_tab = st.sidebar.selectbox(
-        "Vyberte sekci:",
-        ["Predikce bodů", "AI Doporučený tým", "Top hráči podle ceny", "Fixture analýza", "Transfer trendy", "Týmová analýza"]
-    )
-
-    # Tab: Predikce bodů
-    if selected_tab == "Predikce bodů":
-        st.header("🎯 Nejlepší hráči pro start sezóny 2025/26")
-        st.markdown(f"**Gameweek {current_gw}** - Seřazeno podle formy a ceny (vyšší cena = vyšší očekávání)")
-
-        # Filtry
-        col1, col2, col3 = st.columns([2, 1, 1])
-        with col1:
-            search_term = st.text_input("🔍 Hledat hráče:", placeholder="Zadejte jméno hráče...")
-        with col2:
-            position_filter = st.selectbox(
-                "Pozice:",
-                ["Všechny pozice", "Goalkeeper", "Defender", "Midfielder", "Forward"]
-            )
-        with col3:
-            max_price = st.number_input("Max cena (£m):", min_value=3.0, max_value=15.0, value=15.0, step=0.5)
-
-        # Filtrování dat
-        filtered_df = players_df.copy()
-        if search_term:
-            filtered_df = filtered_df[
-                filtered_df['name'].str.contains(search_term, case=False) | 
-                filtered_df['web_name'].str.contains(search_term, case=False)
-            ]
-        if position_filter != "Všechny pozice":
-            filtered_df = filtered_df[filtered_df['position'] == position_filter]
-        
-        filtered_df = filtered_df[filtered_df['price'] <= max_price]
-        filtered_df = filtered_df.sort_values('predicted_points', ascending=False)
-
-        # Zobrazení top hráčů
-        st.subheader(f"📈 Top {min(20, len(filtered_df))} hráčů pro novou sezónu")
-        
-        for idx, (_, player) in enumerate(filtered_df.head(20).iterrows()):
-            with st.container():
-                col1, col2, col3, col4, col5, col6 = st.columns([3, 1, 1, 1, 1, 1])
-                
-                with col1:
-                    news_indicator = "🚨" if player['news'] else ""
-                    injury_risk = ""
-                    if player['chance_of_playing_this_round'] and player['chance_of_playing_this_round'] < 100:
-                        injury_risk = f" ⚠️ {player['chance_of_playing_this_round']}%"
-                    
-                    status_icon = ""
-                    if player['status'] == 'd':
-                        status_icon = " 🤕"
-                    elif player['status'] == 'i':
-                        status_icon = " 🚑"
-                    elif player['status'] == 's':
-                        status_icon = " ⛔"
-                    
-                    st.markdown(f"""
-                    <div style='background: linear-gradient(135deg, {get_position_color(player['position'])}22 0%, {get_position_color(player['position'])}44 100%); 
-                                padding: 1rem; border-radius: 8px; border-left: 4px solid {get_position_color(player['position'])};'>
-                        <h4 style='margin: 0; color: white;'>{news_indicator} {player['name']} {injury_risk} {status_icon}</h4>
-                        <p style='margin: 0; color: #cbd5e1;'>{player['team']} • {player['position']}</p>
-                        {f"<small style='color: #fbbf24;'>📰 {player['news']}</small>" if player['news'] else ""}
-                    </div>
-                    """, unsafe_allow_html=True)
-
-                with col2:
-                    st.metric("Predikce", f"{player['predicted_points']:.1f}")
-                with col3:
-                    st.metric("Forma", f"{player['form']:.1f}")
-                with col4:
-                    st.metric("Cena", format_price(player['price']))
-                with col5:
-                    st.metric("Vlastnictví", f"{player['selected_by_percent']:.1f}%")
-                with col6:
-                    net_transfers = player['transfers_in'] - player['transfers_out']
-                    st.metric("Transfer trend", f"{net_transfers:,}")
-
-                if player['total_points'] > 0 or player['goals_scored'] > 0 or player['assists'] > 0:
-                    col7, col8, col9, col10 = st.columns(4)
-                    with col7:
-                        st.caption(f"⚽ Góly: {player['goals_scored']}")
-                    with col8:
-                        st.caption(f"🎯 Asistence: {player['assists']}")
-                    with col9:
-                        st.caption(f"🛡️ Clean sheets: {player['clean_sheets']}")
-                    with col10:
-                        st.caption(f"📊 Body: {player['total_points']}")
-                else:
-                    st.caption("📋 Nová sezóna - statistiky se budou aktualizovat po prvních zápasech")
-                
-                st.divider()
-
-        # Value analysis chart pro novou sezónu
-        if not filtered_df.empty:
-            st.subheader("📊 Analýza hodnoty za peníze - Start sezóny 2025/26")
-            
-            filtered_df['value_per_million'] = filtered_df['predicted_points'] / filtered_df['price']
-            top_value = filtered_df.nlargest(15, 'value_per_million')
-            
-            fig = px.scatter(
-                top_value,
-                x='price',
-                y='predicted_points',
-                size='selected_by_percent',
-                color='position',
-                hover_name='name',
-                hover_data={'team': True, 'form': True, 'transfers_in': True},
-                title="Cena vs Predikované body - Nová sezóna (velikost = vlastnictví %)",
-                labels={'price': 'Cena (£m)', 'predicted_points': 'Predikované body'}
-            )
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='white')
-            )
-            st.plotly_chart(fig, use_container_width=True)
-
-    # Tab: AI Doporučený tým
-    elif selected_tab == "AI Doporučený tým":
-        st.header("🤖 AI Doporučený tým - FPL pravidla 2025/26")
-        st.markdown("**Oficiální pravidla:** £100m budget • 15 hráčů (2-5-5-3) • Max 3 z týmu • Starting XI respektuje FPL formaci")
-        
-        # Vytvoření AI týmu podle pravidel
-        ai_team, total_cost = create_ai_team(players_df, fixtures_df, current_gw)
-        
-        # Kontrola pravidel
-        team_summary = {
-            'GK': len(ai_team.get('GK', [])),
-            'DEF': len(ai_team.get('DEF', [])), 
-            'MID': len(ai_team.get('MID', [])),
-            'FWD': len(ai_team.get('FWD', []))
-        }
-        
-        total_players = sum(team_summary.values())
-        remaining_budget = 100.0 - total_cost
-        
-        # Status check
-        if total_players == 15 and remaining_budget >= 0:
-            status_color = "success"
-            status_text = f"✅ Tým splňuje FPL pravidla!"
-        else:
-            status_color = "error" 
-            status_text = f"⚠️ Problém s týmem: {total_players}/15 hráčů"
-        
-        # Info metriky
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric("💰 Rozpočet", f"£{total_cost:.1f}m")
-        with col2:
-            st.metric("💸 Zbývá", f"£{remaining_budget:.1f}m") 
-        with col3:
-            st.metric("👥 Hráči", f"{total_players}/15")
-        with col4:
-            st.metric("⚽ Formace", f"{team_summary['DEF']}-{team_summary['MID']}-{team_summary['FWD']}")
-        
-        if status_color == "success":
-            st.success(status_text)
-        else:
-            st.error(status_text)
-        
-        # FPL pravidla reminder
-        st.info("📋 **FPL 2025/26 Novinky:** 2x všechny chipy • Obránci body za 10 CBIT • GW16 bonus 5 FT (AFCON) • Defensive contributions")
-        
-        # Optimální starting XI podle FPL pravidel
-        optimal_xi = get_optimal_formation(ai_team)
-        
-        st.subheader("🏟️ Starting XI (Optimální formace)")
-        st.markdown("*Vybráno podle AI skóre s respektováním FPL minimálních požadavků*")
-        
-        # Zobrazení starting XI
-        xi_positions = [
-            ('🥅 Brankář', optimal_xi.get('GK', [])),
-            ('🛡️ Obránci', optimal_xi.get('DEF', [])),
-            ('⚡ Záložníci', optimal_xi.get('MID', [])),
-            ('🎯 Útočníci', optimal_xi.get('FWD', []))
-        ]
-        
-        for pos_name, players in xi_positions:
-            if players:
-                st.write(f"**{pos_name} ({len(players)})**")
-                
-                if len(players) <= 4:
-                    cols = st.columns(len(players))
-                else:
-                    # Pro 5 záložníků - rozdělení
-                    cols = st.columns(3) + st.columns(2) if len(players) == 5 else st.columns(len(players))
-                
-                for i, player in enumerate(players):
-                    col_index = i if len(players) <= 4 else (i if i < 3 else i - 3)
-                    with cols[col_index]:
-                        # Fixtures preview
-                        fixtures = get_player_next_fixtures(player['team'], fixtures_df, current_gw, 4)
-                        
-                        st.write(f"**{player['web_name']}** ⭐")
-                        st.write(f"{player['team']} • £{player['price']:.1f}m")
-                        st.write(f"AI skóre: {player['ai_score']:.1f}")
-                        
-                        # Fixtures s obtížností
-                        if fixtures:
-                            fixture_text = "**Fixtures:** "
-                            for fix in fixtures[:3]:  # Prvních 3
-                                home_away = "🏠" if fix['is_home'] else "✈️"  
-                                difficulty_emoji = "🟢" if fix['difficulty'] <= 2 else "🟡" if fix['difficulty'] == 3 else "🔴"
-                                fixture_text += f"GW{fix['gw']}: {fix['opponent']} {home_away}{difficulty_emoji} "
-                            st.write(fixture_text)
-                st.divider()
-        
-        # Lavička (zbývající hráči)
-        st.subheader("🪑 Lavička")
-        
-        bench_players = []
-        starting_players = set()
-        
-        # Vytvoř set starting hráčů
-        for pos_players in optimal_xi.values():
-            for player in pos_players:
-                starting_players.add(player['id'])
-        
-        # Najdi hráče na lavičce
-        for pos in ['GK', 'DEF', 'MID', 'FWD']:
-            for player in ai_team.get(pos, []):
-                if player['id'] not in starting_players:
-                    bench_players.append((player, pos))
-        
-        if bench_players:
-            bench_cols = st.columns(len(bench_players))
-            for i, (player, pos) in enumerate(bench_players):
-                with bench_cols[i]:
-                    pos_emoji = {'GK': '🥅', 'DEF': '🛡️', 'MID': '⚡', 'FWD': '🎯'}[pos]
-                    st.write(f"**{player['web_name']}** {pos_emoji}")
-                    st.write(f"{player['team']} • £{player['price']:.1f}m")
-                    st.caption("Lavička")
-        
-        # Kapitán doporučení
-        st.subheader("👑 Kapitán & Vice-kapitán")
-        
-        # Najdi nejlepší kapitány ze starting XI
-        starting_players_list = []
-        for pos_players in optimal_xi.values():
-            starting_players_list.extend(pos_players)
-        
-        captain_candidates = sorted(starting_players_list, key=lambda x: x['predicted_points'], reverse=True)[:3]
-        
-        col1, col2, col3 = st.columns(3)
-        roles = ["👑 Kapitán", "🔸 Vice-kapitán", "🔹 3. volba"]
-        
-        for i, candidate in enumerate(captain_candidates):
-            with [col1, col2, col3][i]:
-                st.write(f"**{roles[i]}**")
-                st.write(f"**{candidate['web_name']}**")
-                st.write(f"{candidate['team']} • £{candidate['price']:.1f}m")
-                st.write(f"**Predikce (C): {candidate['predicted_points']*2:.1f} bodů**")
-                
-                # Reason for captaincy
-                if i == 0:
-                    st.success("Nejvyšší predikce + forma")
-                elif i == 1:
-                    st.info("Backup v případě rotace")
-                else:
-                    st.warning("Differential pick")
-        
-        # Transfer strategie pro 4 GW
-        st.subheader("🔄 Transfer plán na 4 gameweeks (FPL pravidla)")
-        
-        strategies = create_transfer_strategy(current_gw, ai_team, fixtures_df)
-        
-        for i, strategy in enumerate(strategies):
-            with st.expander(f"GW{strategy['gw']}: {strategy['title']} {strategy['risk']}", expanded=(i==0)):
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.write(f"**🔄 Transfery:** {strategy['transfers']}")
-                    st.write(f"**👑 Kapitán:** {strategy['captain_logic']}")
-                    st.write(f"**🎯 Zaměření:** {strategy['focus']}")
-                
-                with col2:
-                    st.write(f"**💎 Chipy:** {strategy['chips']}")
-                    st.write(f"**⚠️ Riziko:** {strategy['risk']}")
-                
-                st.write("**📋 Strategie:**")
-                st.write(strategy['strategy'])
-                
-                if 'key_moves' in strategy:
-                    st.write("**🎯 Klíčové kroky:**")
-                    for move in strategy['key_moves']:
-                        st.write(f"• {move}")
-        
-        # FPL pravidla a čipy pro 2025/26
-        st.subheader("💎 Chip strategie - Nová pravidla 2025/26")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("**🔥 První polovina sezóny (GW1-19):**")
-            st.write("• **Wildcard 1:** GW4-8 (pokud potřebuješ major changes)")
-            st.write("• **Bench Boost:** GW2-3 (když máš silnou lavičku)")  
-            st.write("• **Triple Captain:** vs nováčci (GW1-5)")
-            st.write("• **Free Hit:** proti bad fixtures (GW6-10)")
-            
-        with col2:
-            st.markdown("**❄️ Druhá polovina sezóny (GW20-38):**")
-            st.write("• **Wildcard 2:** GW20-25 (po AFCON chaos)")
-            st.write("• **Bench Boost:** Double gameweek (GW28-32)")
-            st.write("• **Triple Captain:** DGW premium (GW30-35)")
-            st.write("• **Free Hit:** Blank gameweek (GW25-30)")
-        
-        # AFCON warning
-        st.warning("🚨 **AFCON Alert:** GW16 = 5 Free Transfers! Salah, Mbeumo, Sarr a další odjedou 21.12.-18.1.")
-        
-        # Team value breakdown
-        st.subheader("💰 Analýza rozpočtu podle FPL pozic")
-        
-        if ai_team:
-            position_costs = {}
-            position_counts = {}
-            
-            for pos, players in ai_team.items():
-                if players:
-                    pos_names = {'GK': 'Brankáři', 'DEF': 'Obránci', 'MID': 'Záložníci', 'FWD': 'Útočníci'}
-                    pos_name = pos_names[pos]
-                    position_costs[pos_name] = sum(p['price'] for p in players)
-                    position_counts[pos_name] = len(players)
-            
-            # Pie chart
-            if position_costs:
-                cost_df = pd.DataFrame([
-                    {'Pozice': k, 'Cena': v, 'Počet': position_counts[k]} 
-                    for k, v in position_costs.items()
-                ])
-                
-                fig = px.pie(
-                    cost_df,
-                    values='Cena',
-                    names='Pozice', 
-                    title="Rozdělení £100m rozpočtu podle pozic",
-                    color_discrete_sequence=['#eab308', '#3b82f6', '#22c55e', '#ef4444'],
-                    hover_data=['Počet']
-                )
-                fig.update_traces(textposition='inside', textinfo='percent+label')
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='white')
-                )
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Tabulka s detaily
-                cost_df['Průměr na hráče'] = cost_df['Cena'] / cost_df['Počet']
-                cost_df['Cena'] = cost_df['Cena'].round(1)
-                cost_df['Průměr na hráče'] = cost_df['Průměr na hráče'].round(1)
-                
-                st.dataframe(cost_df, use_container_width=True)
-        
-        # FPL pravidla reminder
-        st.subheader("📋 Připomenutí FPL pravidel 2025/26")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.success("**✅ Základní pravidla**")
-            st.write("""
-            • £100m budget celkem  
-            • 15 hráčů: 2 GK, 5 DEF, 5 MID, 3 FWD  
-            • Max 3 hráči z jednoho týmu  
-            • Starting XI: min 3 DEF, 2 MID, 1 FWD  
-            • 1 Free Transfer každý GW  
-            • Max 5 FT v bance  
-            """)
-            
-        with col2:
-            st.info("**🆕 Novinky 2025/26**")
-            st.write("""
-            • 2x každý chip v každé půlce  
-            • Defensive contributions body  
-            • Lepší Fantasy assist definice  
-            • GW16: Bonus 5 FT (AFCON)  
-            • Elite global ligy (Top 1% a 10%)  
-            • Adobe AI team badges  
-            """)
-
-    # Tab: Top hráči podle ceny
-    elif selected_tab == "Top hráči podle ceny":
-        st.header("💰 Nejlepší value za peníze - Nový start!")
-        st.markdown("Založeno na ceně, formě a transferové aktivitě pro sezónu 2025/26")
-        
-        price_ranges = [
-            ("Budget (£3.5-5.5m)", 3.5, 5.5),
-            ("Mid-range (£5.5-8.0m)", 5.5, 8.0),
-            ("Premium (£8.0-12.0m)", 8.0, 12.0),
-            ("Super premium (£12.0+)", 12.0, 20.0)
-        ]
-        
-        for category, min_price, max_price in price_ranges:
-            st.subheader(category)
-            
-            category_players = players_df[
-                (players_df['price'] >= min_price) & 
-                (players_df['price'] < max_price)
-            ].copy()
-            
-            if not category_players.empty:
-                category_players['value_score'] = (
-                    category_players['predicted_points'] * 0.5 +
-                    category_players['form'] * 0.3 +
-                    (100 - category_players['selected_by_percent']) / 100 * 0.2
-                )
-                
-                top_category = category_players.nlargest(5, 'value_score')
-                
-                for _, player in top_category.iterrows():
-                    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
-                    
-                    with col1:
-                        st.markdown(f"""
-                        <div style='background: linear-gradient(135deg, #10b981 0%, #059669 100%); 
-                                    padding: 0.8rem; border-radius: 8px; color: white;'>
-                            <strong>{player['name']}</strong><br>
-                            <small>{player['team']} • {player['position']}</small>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col2:
-                        st.metric("Cena", format_price(player['price']))
-                    with col3:
-                        st.metric("Predikce", f"{player['predicted_points']:.1f}")
-                    with col4:
-                        st.metric("Vlastnictví", f"{player['selected_by_percent']:.1f}%")
-            else:
-                st.info("Žádní hráči v této kategorii.")
-
-    # Tab: Fixture analýza
-    elif selected_tab == "Fixture analýza":
-        st.header("📅 Analýza nadcházejících zápasů")
-        
-        if fixtures_df.empty:
-            st.warning("Data o zápasech nejsou k dispozici.")
-            return
-        
-        current_fixtures = fixtures_df[fixtures_df['gameweek'] == current_gw]
-        
-        if not current_fixtures.empty:
-            st.subheader(f"⚽ Zápasy Gameweek {current_gw}")
-            
-            for _, fixture in current_fixtures.iterrows():
-                col1, col2, col3 = st.columns([3, 1, 1])
-                
-                difficulty_color = get_difficulty_color(fixture['difficulty'])
-                
-                with col1:
-                    kickoff = fixture['kickoff_time']
-                    if kickoff:
-                        kickoff_time = datetime.fromisoformat(kickoff.replace('Z', '+00:00')).strftime('%d.%m %H:%M')
-                    else:
-                        kickoff_time = "TBD"
-                    
-                    st.markdown(f"""
-                    <div style='background: linear-gradient(135deg, #1e293b 0%, #334155 100%); 
-                                padding: 1rem; border-radius: 8px; border-left: 4px solid {difficulty_color};'>
-                        <h4 style='color: white; margin: 0;'>{fixture['home_team']} vs {fixture['away_team']}</h4>
-                        <p style='color: #cbd5e1; margin: 0.5rem 0 0 0;'>
-                            {kickoff_time} • Obtížnost: {fixture['difficulty']}/5
-                        </p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col2:
-                    if fixture['difficulty'] <= 2:
-                        st.success("✅ Snadný")
-                    elif fixture['difficulty'] >= 4:
-                        st.error("❌ Těžký")
-                    else:
-                        st.info("➖ Střední")
-                
-                with col3:
-                    st.caption(f"🏠 Doma: {fixture['home_difficulty']}")
-                    st.caption(f"✈️ Venku: {fixture['away_difficulty']}")
-
-        # Team fixture difficulty
-        st.subheader("📊 Obtížnost fixtures podle týmů")
-        
-        if not fixtures_df.empty:
-            team_difficulty = []
-            next_5_fixtures = fixtures_df[fixtures_df['gameweek'].between(current_gw, current_gw + 4)]
-            
-            for team_id, team_name in teams_dict.items():
-                home_fixtures = next_5_fixtures[next_5_fixtures['home_team_id'] == team_id]
-                away_fixtures = next_5_fixtures[next_5_fixtures['away_team_id'] == team_id]
-                
-                home_diff = home_fixtures['home_difficulty'].mean() if not home_fixtures.empty else 0
-                away_diff = away_fixtures['away_difficulty'].mean() if not away_fixtures.empty else 0
-                
-                avg_difficulty = (home_diff + away_diff) / 2 if (home_diff > 0 or away_diff > 0) else 0
-                
-                if avg_difficulty > 0:
-                    team_difficulty.append({
-                        'team': team_name,
-                        'avg_difficulty': avg_difficulty,
-                        'fixtures_count': len(home_fixtures) + len(away_fixtures)
-                    })
-            
-            if team_difficulty:
-                difficulty_df = pd.DataFrame(team_difficulty)
-                difficulty_df = difficulty_df.sort_values('avg_difficulty')
-                
-                fig = px.bar(
-                    difficulty_df.head(10),
-                    x='avg_difficulty',
-                    y='team',
-                    orientation='h',
-                    title=f"Nejsnadnější fixtures pro GW {current_gw}-{current_gw + 4}",
-                    color='avg_difficulty',
-                    color_continuous_scale='RdYlGn_r'
-                )
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='white')
-                )
-                st.plotly_chart(fig, use_container_width=True)
-
-    # Tab: Transfer trendy
-    elif selected_tab == "Transfer trendy":
-        st.header("🔄 Transfer trendy a vlastnictví")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("📈 Nejvíce přiváděni")
-            most_transferred_in = players_df.nlargest(10, 'transfers_in')
-            
-            for _, player in most_transferred_in.iterrows():
-                st.metric(
-                    f"{player['name']} ({player['team']})",
-                    f"{player['transfers_in']:,}",
-                    delta=f"£{player['price']:.1f}m"
-                )
-        
-        with col2:
-            st.subheader("📉 Nejvíce odváděni")
-            most_transferred_out = players_df.nlargest(10, 'transfers_out')
-            
-            for _, player in most_transferred_out.iterrows():
-                st.metric(
-                    f"{player['name']} ({player['team']})",
-                    f"-{player['transfers_out']:,}",
-                    delta=f"£{player['price']:.1f}m"
-                )
-
-        # Transfer trends visualization  
-        st.subheader("📊 Transfer aktivita")
-        
-        active_transfers = players_df[
-            (players_df['transfers_in'] > 50000) | (players_df['transfers_out'] > 50000)
-        ].copy()
-        
-        if not active_transfers.empty:
-            active_transfers['net_transfers'] = active_transfers['transfers_in'] - active_transfers['transfers_out']
-            
-            fig = px.bar(
-                active_transfers.nlargest(15, 'net_transfers', keep='all'),
-                x='net_transfers',
-                y='name',
-                orientation='h',
-                title="Čisté transfery (IN - OUT)",
-                color='net_transfers',
-                color_continuous_scale='RdYlGn'
-            )
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='white')
-            )
-            st.plotly_chart(fig, use_container_width=True)
-
-    # Tab: Týmová analýza
-    elif selected_tab == "Týmová analýza":
-        st.header("🏟️ Analýza podle týmů")
-        
-        team_stats = []
-        for team_id, team_name in teams_dict.items():
-            team_players = players_df[players_df['team'] == team_name]
-            
-            if not team_players.empty:
-                total_value = team_players['price'].sum()
-                avg_prediction = team_players['predicted_points'].mean()
-                top_player = team_players.loc[team_players['predicted_points'].idxmax()]
-                most_selected = team_players.loc[team_players['selected_by_percent'].idxmax()]
-                
-                team_stats.append({
-                    'team': team_name,
-                    'total_value': total_value,
-                    'avg_prediction': avg_prediction,
-                    'players_count': len(team_players),
-                    'top_player': top_player['name'],
-                    'top_prediction': top_player['predicted_points'],
-                    'most_selected': most_selected['name'],
-                    'highest_selection': most_selected['selected_by_percent']
-                })
-        
-        if team_stats:
-            team_df = pd.DataFrame(team_stats)
-            team_df = team_df.sort_values('avg_prediction', ascending=False)
-            
-            st.subheader("🏆 Nejslibněji vypadající týmy pro sezónu 2025/26")
-            
-            fig = px.bar(
-                team_df.head(10),
-                x='team',
-                y='avg_prediction',
-                title="Průměrná predikce bodů všech hráčů týmu",
-                color='avg_prediction',
-                color_continuous_scale='viridis'
-            )
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='white'),
-                xaxis_tickangle=-45
-            )
-            st.plotly_chart(fig, use_container_width=True)
-            
-            st.subheader("📋 Detaily týmů - Potenciál pro novou sezónu")
-            
-            display_df = team_df[['team', 'avg_prediction', 'total_value', 'top_player', 'top_prediction', 'most_selected', 'highest_selection']].copy()
-            display_df.columns = ['Tým', 'Průměrná predikce', 'Celková hodnota (£m)', 'Nejslibněji', 'Predikce top hráče', 'Nejvíc vlastněný', 'Vlastnictví %']
-            display_df['Průměrná predikce'] = display_df['Průměrná predikce'].round(1)
-            display_df['Celková hodnota (£m)'] = display_df['Celková hodnota (£m)'].round(1)
-            display_df['Predikce top hráče'] = display_df['Predikce top hráče'].round(1)
-            display_df['Vlastnictví %'] = display_df['Vlastnictví %'].round(1)
-            
-            st.dataframe(display_df, use_container_width=True)
-
-    # Footer
-    st.markdown("---")
-    st.markdown(f"""
-    <div style='text-align: center; color: #64748b; padding: 2rem;'>
-        <p>🏆 FPL Predictor - Sezóna 2025/26</p>
-        <p>🆕 Čerstvý start! Všichni hráči začínají s nulou</p>
-        <p>Poslední update: {datetime.now().strftime('%d.%m.%Y %H:%M:%S')} • Data se aktualizují každých 5 minut</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-if __name__ == "__main__":
-    main()
-                    st.
+import os
+
+# Profil studeného startu musí začít měřit dřív, než se načtou knihovny
+if os.environ.get('FPL_PROFILE_STARTUP'):
+    from fpl_predictor.startup import profile_imports
+    profile_imports()
+
+import streamlit as st
+import pandas as pd
+from contextlib import contextmanager
+from datetime import datetime
+
+from fpl_predictor.artifacts import ArtifactCache
+from fpl_predictor.charts import (
+    budget_pie_figure, budget_split, difficulty_bar_figure, net_transfers_figure, score_distribution_figure,
+    team_prediction_figure, value_scatter_figure
+)
+from fpl_predictor.chips import CHIP_NAMES, WILDCARD_HORIZON, remaining_chips, season_half
+from fpl_predictor import core
+from fpl_predictor.core import create_transfer_strategy
+from fpl_predictor.fixtures import fixture_ticker, gameweek_fixtures
+from fpl_predictor.planner import HIT_COST, MAX_FREE_TRANSFERS
+from fpl_predictor.search import PlayerSearchIndex
+from fpl_predictor.tables import PRICE_CATEGORIES, paginate, player_table
+from fpl_predictor.snapshots import SnapshotStore, KIND_BOOTSTRAP, KIND_FIXTURES, KIND_ELEMENT_SUMMARY
+from fpl_predictor.startup import startup_report
+from fpl_predictor.timing import PerformanceLog, StageTimer
+from fpl_predictor.weights import load_score_weights, tuned_weights, weights_path
+from fpl_predictor.xp_model import model_path
+
+# Plotly, SciPy a requests se importují až tam, kde jsou potřeba
+
+CACHE_TTL = 300
+# Historie hráčů se mění jen po odehraném kole, stačí ji stahovat párkrát denně
+HISTORY_INTERVAL = 6 * 3600
+# Velikosti stránky tabulek hráčů (None = všichni)
+PAGE_SIZES = {'20': 20, '50': 50, '100': 100, 'Vše': None}
+
+# Konfigurace stránky
+st.set_page_config(
+    page_title="FPL Predictor - Live Data",
+    page_icon="⚽",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom CSS pro lepší vzhled
+st.markdown("""
+<style>
+    .main {
+        padding-top: 2rem;
+    }
+    .stSelectbox > div > div > div {
+        background-color: #1e293b;
+    }
+    .metric-card {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 1rem;
+        border-radius: 10px;
+        color: white;
+        text-align: center;
+        margin: 0.5rem 0;
+    }
+    .player-card {
+        background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
+        padding: 1rem;
+        border-radius: 10px;
+        margin: 0.5rem 0;
+        color: white;
+    }
+    .formation-field {
+        background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
+        padding: 2rem;
+        border-radius: 15px;
+        margin: 1rem 0;
+    }
+    .live-indicator {
+        background: linear-gradient(45deg, #ff6b6b, #ee5a24);
+        color: white;
+        padding: 0.5rem 1rem;
+        border-radius: 20px;
+        font-weight: bold;
+        display: inline-block;
+        margin: 0.5rem 0;
+    }
+</style>
+""", unsafe_allow_html=True)
+
+# API funkce pro načítání dat z FPL
+@st.cache_resource
+def get_snapshot_store():
+    """Sdílené úložiště snapshotů na disku"""
+    return SnapshotStore()
+
+def get_refresher():
+    """Jediný refresher na proces - obnovuje data na pozadí, všechny session sdílí jeho data"""
+    from fpl_predictor.fetch import shared_refresher
+    
+    return shared_refresher(get_snapshot_store(), interval=CACHE_TTL, history_interval=HISTORY_INTERVAL)
+
+def find_snapshot_entry(kind, replay):
+    """Najde snapshot pro přehrávání - 'latest' nebo id bootstrap snapshotu"""
+    return core.find_snapshot_entry(get_snapshot_store(), kind, replay)
+
+@st.cache_resource(max_entries=8)
+def load_snapshot_data(kind, snapshot_id):
+    """Načte data ze snapshotu bez HTTP (obsah je podle id neměnný, sdílí se mezi session)"""
+    return get_snapshot_store().load(kind, snapshot_id)
+
+def fetch_snapshot(kind, replay=None):
+    """Záznam {'id', 'fetched_at', 'data'} - živě z refresheru, při přehrávání z disku"""
+    if replay:
+        entry = find_snapshot_entry(kind, replay)
+        if not entry:
+            return None
+        return dict(entry, data=load_snapshot_data(kind, entry['id']))
+    
+    # Vždy poslední dobrý payload, obnova běží na pozadí
+    return get_refresher().get(kind)
+
+def fetch_player_history(replay=None):
+    """Historie hráčů z element-summary ({id: {'history', 'history_past'}}), pokud už je stažená"""
+    record = fetch_snapshot(KIND_ELEMENT_SUMMARY, replay)
+    return record['data'] if record else None
+
+def show_fetch_timings():
+    """Časy posledních požadavků na FPL API podle endpointu"""
+    timings = get_refresher().last_timings
+    if not timings:
+        return
+    
+    from fpl_predictor.fetch import summarize_timings
+    
+    with st.sidebar.expander("📡 Stahování dat"):
+        timings_df = pd.DataFrame(summarize_timings(timings))
+        timings_df = timings_df[['endpoint', 'requests', 'errors', 'p50_s', 'max_s']]
+        timings_df.columns = ['Endpoint', 'Požadavky', 'Chyby', 'Medián (s)', 'Max (s)']
+        st.dataframe(timings_df.round(3), hide_index=True)
+
+def show_data_freshness(replay):
+    """Zobrazí v sidebaru stáří dat a případnou chybu obnovy"""
+    if replay:
+        entry = find_snapshot_entry(KIND_BOOTSTRAP, replay)
+        if entry:
+            st.sidebar.caption(f"📼 Snapshot {entry['id']} z {entry['fetched_at']}")
+        return
+    
+    refresher = get_refresher()
+    record = refresher.get(KIND_BOOTSTRAP)
+    if record:
+        st.sidebar.caption(f"🔄 Data z {record['fetched_at']} • ověřeno {record['checked_at']}")
+    if refresher.last_error:
+        st.sidebar.warning("⚠️ Obnova dat selhala, zobrazuji poslední uložená data")
+    show_fetch_timings()
+
+@st.cache_resource
+def get_performance_log():
+    """Sdílený záznam časů rerunů (JSON log a Prometheus textfile podle env)"""
+    return PerformanceLog(
+        log_path=os.environ.get('FPL_PERF_LOG'),
+        textfile_path=os.environ.get('FPL_PROMETHEUS_TEXTFILE')
+    )
+
+def show_performance_panel(timer, selected_tab):
+    """Uloží časy rerunu a volitelně je zobrazí v sidebaru"""
+    stages = get_performance_log().record(timer, tab=selected_tab)
+    
+    if not st.sidebar.checkbox("⏱️ Výkon aplikace", value=bool(os.environ.get('FPL_DEBUG'))):
+        return
+    
+    with st.sidebar.expander("⏱️ Časy fází", expanded=True):
+        current_df = pd.DataFrame({'Fáze': list(stages), 'Tento rerun (ms)': [v * 1000 for v in stages.values()]})
+        st.dataframe(current_df.round(1), hide_index=True)
+        
+        summary_df = pd.DataFrame(get_performance_log().summary())
+        summary_df[['p50_s', 'p95_s']] = summary_df[['p50_s', 'p95_s']] * 1000
+        summary_df.columns = ['Fáze', 'Rerunů', 'p50 (ms)', 'p95 (ms)']
+        st.dataframe(summary_df.round(1), hide_index=True)
+        
+        stats = get_artifact_cache().stats()
+        st.caption(
+            f"🗄️ Cache: {stats['items']} položek • {stats['bytes'] / 2**20:.1f}/{stats['max_bytes'] / 2**20:.0f} MB • "
+            f"zásahy {stats['hits']} • výpočty {stats['misses']} • vyřazeno {stats['evictions']}"
+        )
+
+def show_startup_profile():
+    """Výsledek profilu studeného startu (FPL_PROFILE_STARTUP=1) v sidebaru"""
+    report = startup_report()
+    if not report:
+        return
+    
+    with st.sidebar.expander("🚀 Profil startu", expanded=True):
+        st.caption(f"První vykreslení {report['first_render_s'] * 1000:.0f} ms od startu skriptu")
+        imports_df = pd.DataFrame(report['imports'], columns=['Modul', 'Import (ms)'])
+        imports_df['Import (ms)'] = imports_df['Import (ms)'] * 1000
+        st.dataframe(imports_df.round(1), hide_index=True)
+
+@contextmanager
+def timed_fragment(name):
+    """Změří samostatný rerun fragmentu a uloží ho vedle rerunů celé stránky"""
+    timer = StageTimer(total_stage=f"fragment:{name}")
+    yield timer
+    get_performance_log().record(timer, fragment=name)
+
+def show_chart(name, fig, timer):
+    """Odešle hotovou figuru; čas serializace a odeslání jako fáze send:<name>
+
+    Stavba figury se měří zvlášť (node:<name> v pipeline, build:<name> u grafů podle filtru).
+    """
+    with timer.span(f"send:{name}"):
+        st.plotly_chart(fig, use_container_width=True)
+
+def select_replay_mode():
+    """Výběr mezi živými daty a přehráním uloženého snapshotu v sidebaru"""
+    # Každý obsah jen jednou, u opakovaně staženého bereme poslední čas
+    snapshots = {}
+    for entry in get_snapshot_store().entries(KIND_BOOTSTRAP):
+        snapshots[entry['id']] = entry['fetched_at']
+    
+    options = ['', 'latest'] + sorted(snapshots, key=snapshots.get, reverse=True)
+    labels = {'': '🔴 Live data', 'latest': '📼 Poslední snapshot'}
+    
+    default = os.environ.get('FPL_REPLAY', '')
+    if default and default not in options:
+        entry = get_snapshot_store().find(KIND_BOOTSTRAP, default)
+        default = entry['id'] if entry else ''
+    
+    return st.sidebar.selectbox(
+        "📼 Zdroj dat:",
+        options,
+        index=options.index(default),
+        format_func=lambda option: labels.get(option, f"{snapshots.get(option, '')} • {option}")
+    )
+
+@st.cache_resource
+def get_artifact_cache():
+    """Sdílená cache odvozených dat s omezenou pamětí (FPL_CACHE_MB, výchozí 256 MB)"""
+    return ArtifactCache(int(os.environ.get('FPL_CACHE_MB', 256)) * 2**20)
+
+def cached(name, key, compute):
+    """Odvozená data podle názvu, id snapshotů a parametrů - počítají se jen při změně klíče"""
+    return get_artifact_cache().get((name,) + tuple(key), compute)
+
+def build_pipeline(bootstrap, fixtures_snapshot, history_snapshot=None, timer=None):
+    """Graf odvozených dat - každá záložka si vyžádá jen to, co zobrazuje"""
+    # Datové uzly (hráči, zápasy, AI tým) jsou v jádru, tady jen to, co potřebuje UI
+    # Vyladěné váhy AI a value skóre (python -m fpl_predictor.tuning --save), jinak výchozí
+    root = get_snapshot_store().root
+    pipeline = core.build_pipeline(
+        bootstrap, fixtures_snapshot, get_artifact_cache(), timer,
+        history_snapshot, model_path(root), load_score_weights(weights_path(root))
+    )
+    
+    pipeline.node('player_table', ['players'], player_table)
+    # Vyhledávání podle jména bez diakritiky, index se staví jednou pro snapshot
+    pipeline.node('search_index', ['players'], lambda players_df: PlayerSearchIndex(players_df['id'], players_df['name'], players_df['web_name']))
+    pipeline.node(
+        'fixture_ticker', ['fixture_matrix', 'teams', 'current_gw'],
+        lambda matrix, teams_dict, gw: fixture_ticker(matrix, teams_dict, gw, 6)
+    )
+    pipeline.node('gameweek_fixtures', ['fixture_matrix', 'teams', 'current_gw'], gameweek_fixtures)
+    pipeline.node(
+        'team_ranking', ['team_aggregates'],
+        lambda aggregates: aggregates[aggregates['players_count'] > 0].sort_values('avg_prediction', ascending=False)
+    )
+    
+    # Grafy závislé jen na snapshotu se staví jednou a při rerunu se jen odešlou
+    pipeline.node('difficulty_chart', ['team_aggregates', 'current_gw'], difficulty_bar_figure)
+    pipeline.node('transfers_chart', ['players'], net_transfers_figure)
+    pipeline.node('team_chart', ['team_ranking'], team_prediction_figure)
+    pipeline.node('budget_split', ['ai_team'], lambda ai_team: budget_split(ai_team[0]))
+    pipeline.node('budget_chart', ['budget_split'], budget_pie_figure)
+    pipeline.node('simulation_chart', ['squad_simulation'], score_distribution_figure)
+    return pipeline
+
+def get_difficulty_color(difficulty):
+    if difficulty <= 2:
+        return '#22c55e'
+    elif difficulty == 3:
+        return '#eab308'
+    elif difficulty == 4:
+        return '#f97316'
+    else:
+        return '#ef4444'
+
+def table_column_config():
+    """Formát číselných sloupců tabulek hráčů"""
+    number = st.column_config.NumberColumn
+    return {
+        'Cena': number(format="£%.1fm"),
+        'Predikce': number(format="%.1f"),
+        'Forma': number(format="%.1f"),
+        'Vlastnictví': number(format="%.1f%%"),
+        'Value skóre': number(format="%.2f"),
+        'Body/£m': number(format="%.2f"),
+        'Transfery IN': number(format="%d"),
+        'Transfery OUT': number(format="%d"),
+        'Čisté transfery': number(format="%+d")
+    }
+
+def render_table(table, key, columns, default_sort, ascending=False):
+    """Tabulka s řazením a stránkováním na serveru - prohlížeč dostane jen jednu stránku"""
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    with col1:
+        sort_by = st.selectbox("Řadit podle:", columns, index=columns.index(default_sort), key=f"{key}_sort")
+    with col2:
+        ascending = st.toggle("Vzestupně", value=ascending, key=f"{key}_ascending")
+    with col3:
+        page_size = PAGE_SIZES[st.selectbox("Řádků na stránku:", list(PAGE_SIZES), key=f"{key}_page_size")]
+    
+    # Stránka mimo rozsah (po zúžení filtru) se vrátí na poslední platnou
+    n_pages = max(1, -(-len(table) // page_size)) if page_size else 1
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = n_pages
+    with col4:
+        page = st.number_input(f"Stránka (z {n_pages}):", min_value=1, max_value=n_pages, key=page_key)
+    
+    page_df, _, page = paginate(table[columns], sort_by, ascending, page, page_size)
+    st.dataframe(page_df, hide_index=True, use_container_width=True, column_config=table_column_config())
+    
+    if page_df.empty:
+        st.caption("Žádní hráči neodpovídají filtru")
+    else:
+        first = (page - 1) * (page_size or 0) + 1
+        st.caption(f"Zobrazeno {first}-{first + len(page_df) - 1} z {len(table)} hráčů")
+
+@st.fragment
+def render_table_fragment(table, key, columns, default_sort):
+    """Samostatně se překreslující tabulka (řazení a stránkování nespouští celou stránku)"""
+    render_table(table, key, columns, default_sort)
+
+@st.fragment
+def render_value_table(player_table):
+    """Nejlepší hodnota za peníze podle cenových kategorií v jedné tabulce"""
+    categories = ["Všechny kategorie"] + [label for label, _, _ in PRICE_CATEGORIES]
+    category = st.selectbox("Cenová kategorie:", categories)
+    table = player_table if category == categories[0] else player_table[player_table['Kategorie'] == category]
+    render_table(
+        table, 'value',
+        ['Hráč', 'Tým', 'Pozice', 'Kategorie', 'Cena', 'Predikce', 'Forma', 'Vlastnictví', 'Value skóre', 'Body/£m'],
+        'Value skóre'
+    )
+
+@st.fragment
+def render_player_predictions(data_key, players_df, player_table, search_index):
+    """Filtry a seznam hráčů v Predikci bodů - při změně filtru se překreslí jen tato část"""
+    with timed_fragment("Predikce bodů") as timer:
+        # Filtry
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            search_term = st.text_input("🔍 Hledat hráče:", placeholder="Zadejte jméno hráče...")
+        with col2:
+            position_filter = st.selectbox(
+                "Pozice:",
+                ["Všechny pozice", "Goalkeeper", "Defender", "Midfielder", "Forward"]
+            )
+        with col3:
+            max_price = st.number_input("Max cena (£m):", min_value=3.0, max_value=15.0, value=15.0, step=0.5)
+
+        # Filtrování dat
+        filtered_df = players_df
+        if search_term:
+            filtered_df = filtered_df[filtered_df['id'].isin(search_index.search(search_term))]
+        if position_filter != "Všechny pozice":
+            filtered_df = filtered_df[filtered_df['position'] == position_filter]
+        
+        filtered_df = filtered_df[filtered_df['price'] <= max_price]
+
+        # Všichni vyfiltrovaní hráči v jedné tabulce, posílá se jen aktuální stránka
+        st.subheader(f"📈 {len(filtered_df)} hráčů pro novou sezónu")
+        render_table(
+            player_table.loc[filtered_df.index], 'predictions',
+            ['Hráč', 'Stav', 'Tým', 'Pozice', 'Predikce', 'Forma', 'Cena', 'Vlastnictví', 'Čisté transfery',
+             'Góly', 'Asistence', 'Clean sheets', 'Body', 'Novinky'],
+            'Predikce'
+        )
+
+        # Value analysis chart pro novou sezónu
+        if not filtered_df.empty:
+            st.subheader("📊 Analýza hodnoty za peníze - Start sezóny 2025/26")
+            
+            top_value = filtered_df.nlargest(15, 'value_per_million')
+            
+            # Graf se staví znovu jen při jiném výběru hráčů, ne při každém stisku klávesy
+            def build():
+                with timer.span('build:value_scatter'):
+                    return value_scatter_figure(top_value)
+            
+            fig = cached('value_scatter', data_key + tuple(top_value['id'].tolist()), build)
+            show_chart('value_scatter', fig, timer)
+
+@st.fragment
+def render_transfer_plan(data_key, planning_gw, ai_team, total_cost, players_df, fixture_matrix):
+    """Nastavení a výsledek transfer plánu - změna vstupů přepočítá jen plán"""
+    with timed_fragment("Transfer plán") as timer:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            plan_bank = st.number_input("💰 V bance (£m)", 0.0, 100.0, round(max(100.0 - total_cost, 0.0), 1), 0.1)
+        with col2:
+            plan_free_transfers = st.number_input("🔄 Free transfery", 1, MAX_FREE_TRANSFERS, 1)
+        with col3:
+            plan_horizon = st.slider("📅 Horizont (GW)", 2, 8, 6)
+        
+        squad_ids = tuple(sorted(int(player['id']) for players in ai_team.values() for player in players))
+        if len(squad_ids) == 15:
+            plan_params = (planning_gw, squad_ids, round(plan_bank, 1), plan_free_transfers, plan_horizon)
+            with timer.span('optimize'):
+                plan = cached('transfer_plan', data_key + plan_params, lambda: create_transfer_strategy(
+                    *plan_params, players_df, fixture_matrix
+                ))
+            names = players_df.set_index('id')['web_name']
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("📈 Očekávané body plánu", f"{plan['total']:.1f}",
+                          f"{plan['total'] - plan['baseline']:+.1f} vs. bez transferů")
+            with col2:
+                st.metric("🔁 Transferů celkem", sum(len(step['transfers']) for step in plan['steps']))
+            with col3:
+                st.metric("➖ Hity", f"{-HIT_COST * sum(step['hits'] for step in plan['steps'])} b.")
+            st.caption(f"🔎 Beam search přes {len(plan['steps'])} GW za {plan['solve_time']:.2f} s")
+            
+            for i, step in enumerate(plan['steps']):
+                if step['transfers']:
+                    title = f"{len(step['transfers'])} transfer(y)"
+                else:
+                    title = "Bez transferu - bank FT"
+                risk = "🔴" if step['hits'] else "🟢"
+                with st.expander(f"GW{step['gw']}: {title} {risk}", expanded=(i == 0)):
+                    
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        st.write(f"**🔄 Free transfery:** {step['free_transfers']}")
+                        st.write(f"**👑 Kapitán:** {names.get(step['captain'], '?')}")
+                        st.write(f"**💰 Banka po transferech:** £{step['bank']:.1f}m")
+                    
+                    with col2:
+                        st.write(f"**📈 Očekávané body:** {step['expected_points']:.1f}")
+                        st.write(f"**⚠️ Hity:** {step['hits']} ({-HIT_COST * step['hits']} b.)")
+                    
+                    if step['transfers']:
+                        st.write("**🎯 Klíčové kroky:**")
+                        for out_id, in_id in step['transfers']:
+                            st.write(f"• OUT: {names.get(out_id, '?')} ➜ IN: {names.get(in_id, '?')}")
+
+@st.fragment
+def render_chip_plan(data_key, planning_gw, ai_team, total_cost, players_df, fixture_matrix):
+    """Rozvrh chipů do konce sezóny - změna zahraných chipů přepočítá jen DP bez řešiče"""
+    with timed_fragment("Chip plán") as timer:
+        squad_ids = tuple(sorted(int(player['id']) for players in ai_team.values() for player in players))
+        if len(squad_ids) != 15:
+            st.warning("Kádr není kompletní - plán chipů se nepočítá")
+            return
+        
+        remaining = remaining_chips(planning_gw)
+        labels = {
+            (chip, half): f"{CHIP_NAMES[chip]} {'GW1-19' if half == 0 else 'GW20-38'}" for chip, half in remaining
+        }
+        played = st.multiselect("✅ Už zahrané chipy", remaining, format_func=labels.get)
+        
+        bank = round(max(100.0 - total_cost, 0.0), 1)
+        with timer.span('optimize'):
+            # Kádry pro Wildcard/Free Hit se hledají jednou, jiné zahrané chipy přepočítá jen DP
+            full_plan = cached('chip_plan', data_key + (planning_gw, squad_ids, bank), lambda: core.create_chip_plan(
+                planning_gw, squad_ids, bank, players_df, fixture_matrix
+            ))
+            if full_plan is None:
+                st.info("Sezóna skončila - žádné chipy k naplánování")
+                return
+            available = tuple(key for key in remaining if key not in played)
+            plan = full_plan if not played else cached(
+                'chip_plan', data_key + (planning_gw, squad_ids, bank, available),
+                lambda: core.create_chip_plan(
+                    planning_gw, squad_ids, bank, players_df, fixture_matrix, available, full_plan['squads']
+                )
+            )
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("📈 Očekávané body s chipy", f"{plan['total']:.1f}",
+                      f"{plan['total'] - plan['baseline']:+.1f} vs. bez chipů")
+        with col2:
+            st.metric("💎 Naplánované chipy", len(plan['chips']))
+        
+        if plan['chips']:
+            schedule = pd.DataFrame([
+                {
+                    'Polovina': 'GW1-19' if season_half(step['gw']) == 0 else 'GW20-38',
+                    'GW': step['gw'],
+                    'Chip': CHIP_NAMES[step['chip']],
+                    'Zisk (b.)': round(step['gain'], 1)
+                }
+                for step in plan['chips']
+            ])
+            st.dataframe(schedule, use_container_width=True, hide_index=True)
+        st.caption(
+            f"🧮 DP přes všechna GW do konce sezóny za {plan['solve_time']:.2f} s • blank a double GW podle "
+            f"projekce bodů • Wildcard počítá s novým kádrem na {WILDCARD_HORIZON} GW"
+        )
+
+def main():
+    timer = StageTimer()
+    
+    # Zdroj dat - živé API nebo přehrání snapshotu
+    replay = select_replay_mode()
+    data_label = "🔴 LIVE DATA" if not replay else f"📼 REPLAY {replay}"
+    
+    # Header s live indikátorem
+    st.markdown(f"""
+    <div style='background: linear-gradient(90deg, #667eea 0%, #764ba2 100%); padding: 2rem; border-radius: 10px; margin-bottom: 2rem;'>
+        <h1 style='color: white; text-align: center; margin: 0;'>⚽ FPL Predictor</h1>
+        <p style='color: #e2e8f0; text-align: center; margin: 0.5rem 0 0 0;'>Sezóna 2025/26 - Čerstvý start!</p>
+        <div style='text-align: center;'>
+            <span class='live-indicator'>{data_label}</span>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Načtení dat
+    with st.spinner('Načítám aktuální data z FPL API...'), timer.span('fetch'):
+        bootstrap = fetch_snapshot(KIND_BOOTSTRAP, replay)
+        fixtures_snapshot = fetch_snapshot(KIND_FIXTURES, replay)
+        # Historie hráčů pro model očekávaných bodů - bez ní predikce z formy a ceny
+        history_snapshot = fetch_snapshot(KIND_ELEMENT_SUMMARY, replay)
+    show_data_freshness(replay)
+        
+    if not bootstrap:
+        error = get_refresher().last_error.get(KIND_BOOTSTRAP) if not replay else "snapshot nenalezen"
+        st.error(f"Nepodařilo se načíst data z FPL API ({error}). Zkuste to později.")
+        return
+    if not fixtures_snapshot and not replay:
+        st.error(f"Chyba při načítání fixtures z FPL API: {get_refresher().last_error.get(KIND_FIXTURES)}")
+    
+    # Zpracování dat - záložky si další odvozená data berou z pipeline samy
+    timer.begin('process')
+    pipeline = build_pipeline(bootstrap, fixtures_snapshot, history_snapshot, timer)
+    # Klíč parametrizovaných výpočtů (transfer plán, grafy) nad stejnými snapshoty
+    data_key = (
+        bootstrap['id'], fixtures_snapshot['id'] if fixtures_snapshot else None,
+        history_snapshot['id'] if history_snapshot else None
+    )
+    players_df = pipeline['players']
+    current_gw = pipeline['current_gw']
+    # Plány začínají v nejbližším GW před deadlinem, aktuální bývá už rozehraný
+    planning_gw = pipeline['planning_gw']
+    timer.end('process')
+    
+    # Info panel s aktuálními statistikami pro novou sezónu
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Aktuální GW", current_gw)
+    with col2:
+        st.metric("Celkem hráčů", len(players_df))
+    with col3:
+        avg_price = players_df['price'].mean()
+        st.metric("Průměrná cena", f"£{avg_price:.1f}m")
+    with col4:
+        last_update = datetime.now().strftime("%H:%M")
+        st.metric("Poslední update", last_update)
+    
+    # Info o nové sezóně
+    xp_model = pipeline['xp_model']
+    if xp_model is None:
+        st.info("🆕 **Nová sezóna 2025/26** - Všichni hráči začínají s čistým štítem! Predikce jsou založené na formě z předsezóny a ceně hráčů.")
+    else:
+        error = f" • průběžná chyba {xp_model.rmse:.2f} b. na zápas" if xp_model.rmse is not None else ""
+        st.info(f"🧠 **Predikce z modelu očekávaných bodů** - minuty, xG/xA, soupeř a domácí prostředí z historie GW1-{xp_model.trained_through}{error}")
+
+    # Sidebar s navigací
+    st.sidebar.title("📊 Navigace")
+    selected_tab = st.sidebar.selectbox(
+        "Vyberte sekci:",
+        ["Predikce bodů", "AI Doporučený tým", "Top hráči podle ceny", "Fixture analýza", "Transfer trendy", "Týmová analýza"]
+    )
+    # Vykreslení záložky včetně optimalizace, ta se měří ještě zvlášť
+    timer.begin(f"render:{selected_tab}")
+
+    # Tab: Predikce bodů
+    if selected_tab == "Predikce bodů":
+        st.header("🎯 Nejlepší hráči pro start sezóny 2025/26")
+        st.markdown(f"**Gameweek {current_gw}** - Seřazeno podle formy a ceny (vyšší cena = vyšší očekávání)")
+
+        render_player_predictions(data_key, players_df, pipeline['player_table'], pipeline['search_index'])
+
+    # Tab: AI Doporučený tým
+    elif selected_tab == "AI Doporučený tým":
+        st.header("🤖 AI Doporučený tým - FPL pravidla 2025/26")
+        st.markdown("**Oficiální pravidla:** £100m budget • 15 hráčů (2-5-5-3) • Max 3 z týmu • Starting XI respektuje FPL formaci")
+        
+        # Vytvoření AI týmu podle pravidel
+        with timer.span('optimize'):
+            ai_team, total_cost, solution = pipeline['ai_team']
+        
+        # Kontrola kompletnosti týmu podle FPL pravidel
+        if len(solution['squad']) < 15:
+            st.error("⚠️ Nepodařilo se vytvořit kompletní tým podle FPL pravidel. Zkuste to znovu.")
+        
+        # Kontrola pravidel
+        team_summary = {
+            'GK': len(ai_team.get('GK', [])),
+            'DEF': len(ai_team.get('DEF', [])), 
+            'MID': len(ai_team.get('MID', [])),
+            'FWD': len(ai_team.get('FWD', []))
+        }
+        
+        total_players = sum(team_summary.values())
+        remaining_budget = 100.0 - total_cost
+        
+        # Status check
+        if total_players == 15 and remaining_budget >= 0:
+            status_color = "success"
+            status_text = f"✅ Tým splňuje FPL pravidla!"
+        else:
+            status_color = "error" 
+            status_text = f"⚠️ Problém s týmem: {total_players}/15 hráčů"
+        
+        # Info metriky
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("💰 Rozpočet", f"£{total_cost:.1f}m")
+        with col2:
+            st.metric("💸 Zbývá", f"£{remaining_budget:.1f}m") 
+        with col3:
+            st.metric("👥 Hráči", f"{total_players}/15")
+        with col4:
+            st.metric("⚽ Formace", f"{team_summary['DEF']}-{team_summary['MID']}-{team_summary['FWD']}")
+        
+        if status_color == "success":
+            st.success(status_text)
+        else:
+            st.error(status_text)
+        
+        if solution['objective'] is not None:
+            proof = "optimum prokázáno" if solution['optimal'] else "časový limit vypršel"
+            st.caption(
+                f"🧮 Přesný řešič (MILP): {proof} za {solution['solve_time']:.2f} s • "
+                f"mezera optimality {solution['gap'] * 100:.2f} % • "
+                f"hodnota účelové funkce: {solution['objective']:.1f}"
+            )
+        
+        # FPL pravidla reminder
+        st.info("📋 **FPL 2025/26 Novinky:** 2x všechny chipy • Obránci body za 10 CBIT • GW16 bonus 5 FT (AFCON) • Defensive contributions")
+        
+        # Optimální starting XI podle FPL pravidel
+        optimal_xi = pipeline['optimal_xi']
+        
+        # Zajisti minimální požadavky (3 DEF, 2 MID, 1 FWD)
+        if (len(optimal_xi['GK']) != 1 or len(optimal_xi['DEF']) < 3 or
+                len(optimal_xi['MID']) < 2 or len(optimal_xi['FWD']) < 1):
+            st.warning("⚠️ Formace nesplňuje FPL minimální požadavky")
+        
+        st.subheader("🏟️ Starting XI (Optimální formace)")
+        st.markdown("*Vybráno přesným řešičem podle očekávaných bodů s respektováním FPL minimálních požadavků*")
+        
+        # Zobrazení starting XI
+        xi_positions = [
+            ('🥅 Brankář', optimal_xi.get('GK', [])),
+            ('🛡️ Obránci', optimal_xi.get('DEF', [])),
+            ('⚡ Záložníci', optimal_xi.get('MID', [])),
+            ('🎯 Útočníci', optimal_xi.get('FWD', []))
+        ]
+        
+        # Fixtures celé základní sestavy najednou
+        xi_fixtures = pipeline['xi_fixtures']
+        
+        for pos_name, players in xi_positions:
+            if players:
+                st.write(f"**{pos_name} ({len(players)})**")
+                
+                if len(players) <= 4:
+                    cols = st.columns(len(players))
+                else:
+                    # Pro 5 záložníků - rozdělení
+                    cols = st.columns(3) + st.columns(2) if len(players) == 5 else st.columns(len(players))
+                
+                for i, player in enumerate(players):
+                    col_index = i if len(players) <= 4 else (i if i < 3 else i - 3)
+                    with cols[col_index]:
+                        # Fixtures preview
+                        fixtures = xi_fixtures.get(player['id'], [])
+                        
+                        st.write(f"**{player['web_name']}** ⭐")
+                        st.write(f"{player['team']} • £{player['price']:.1f}m")
+                        st.write(f"AI skóre: {player['ai_score']:.1f}")
+                        
+                        # Fixtures s obtížností
+                        if fixtures:
+                            fixture_text = "**Fixtures:** "
+                            for fix in fixtures[:3]:  # Prvních 3
+                                home_away = "🏠" if fix['is_home'] else "✈️"  
+                                difficulty_emoji = "🟢" if fix['difficulty'] <= 2 else "🟡" if fix['difficulty'] == 3 else "🔴"
+                                fixture_text += f"GW{fix['gw']}: {fix['opponent']} {home_away}{difficulty_emoji} "
+                            st.write(fixture_text)
+                st.divider()
+        
+        # Lavička (zbývající hráči)
+        st.subheader("🪑 Lavička")
+        
+        bench_players = []
+        starting_players = set()
+        
+        # Vytvoř set starting hráčů
+        for pos_players in optimal_xi.values():
+            for player in pos_players:
+                starting_players.add(player['id'])
+        
+        # Najdi hráče na lavičce
+        for pos in ['GK', 'DEF', 'MID', 'FWD']:
+            for player in ai_team.get(pos, []):
+                if player['id'] not in starting_players:
+                    bench_players.append((player, pos))
+        
+        if bench_players:
+            bench_cols = st.columns(len(bench_players))
+            for i, (player, pos) in enumerate(bench_players):
+                with bench_cols[i]:
+                    pos_emoji = {'GK': '🥅', 'DEF': '🛡️', 'MID': '⚡', 'FWD': '🎯'}[pos]
+                    st.write(f"**{player['web_name']}** {pos_emoji}")
+                    st.write(f"{player['team']} • £{player['price']:.1f}m")
+                    st.caption("Lavička")
+        
+        # Kapitán doporučení
+        st.subheader("👑 Kapitán & Vice-kapitán")
+        
+        # Kapitáni podle simulace - skóre celého týmu s danou volbou, ne jen dvojnásobek predikce
+        simulation = pipeline['squad_simulation']
+        
+        if simulation is None:
+            st.warning("Kádr není kompletní - simulace kapitána se nepočítá")
+        elif simulation['captains'].empty:
+            st.warning(f"V GW {simulation['gameweek']} kádr nehraje - simulace kapitána se nepočítá")
+        else:
+            captain_candidates = simulation['captains'].head(3)
+            
+            col1, col2, col3 = st.columns(3)
+            roles = ["👑 Kapitán", "🔸 Vice-kapitán", "🔹 3. volba"]
+            
+            for i, candidate in enumerate(captain_candidates.itertuples()):
+                with [col1, col2, col3][i]:
+                    st.write(f"**{roles[i]}**")
+                    st.write(f"**{candidate.web_name}**")
+                    st.write(f"{candidate.team} • £{candidate.price:.1f}m")
+                    st.write(f"**Body kapitána (C): {candidate.captain_mean:.1f}**")
+                    st.write(f"Tým: ⌀ {candidate.team_mean:.1f} b. (P10-P90: {candidate.team_p10:.0f}-{candidate.team_p90:.0f})")
+                    
+                    # Jak často je volba nejlepší a jak často kapitán přinese aspoň 12 bodů
+                    if i == 0:
+                        st.success(f"Nejvyšší očekávané skóre týmu • nejlepší volba v {candidate.p_best:.0%} simulací")
+                    elif i == 1:
+                        st.info(f"Backup v případě rotace • nejlepší volba v {candidate.p_best:.0%} simulací")
+                    else:
+                        st.warning(f"Differential pick • 12+ bodů v {candidate.p_haul:.0%} simulací")
+            
+            summary = simulation['squad']
+            show_chart('simulation_chart', pipeline['simulation_chart'], timer)
+            st.caption(
+                f"🎲 {simulation['sims']:,} simulací GW {simulation['gameweek']} (minuty, góly, asistence, "
+                f"čistá konta, bonus, automatická střídání) • kádr ⌀ {summary['mean']:.1f} b., "
+                f"medián {summary['p50']:.0f}, 90 % scénářů mezi {summary['p5']:.0f} a {summary['p95']:.0f} b."
+            )
+        
+        # Transfer plán pro AI kádr
+        st.subheader("🔄 Transfer plán (FPL pravidla)")
+        
+        render_transfer_plan(data_key, planning_gw, ai_team, total_cost, players_df, pipeline['fixture_matrix'])
+        
+        # FPL pravidla a čipy pro 2025/26
+        st.subheader("💎 Chip strategie - Nová pravidla 2025/26")
+        
+        render_chip_plan(data_key, planning_gw, ai_team, total_cost, players_df, pipeline['fixture_matrix'])
+        
+        # AFCON warning
+        st.warning("🚨 **AFCON Alert:** GW16 = 5 Free Transfers! Salah, Mbeumo, Sarr a další odjedou 21.12.-18.1.")
+        
+        # Team value breakdown
+        st.subheader("💰 Analýza rozpočtu podle FPL pozic")
+        
+        cost_df = pipeline['budget_split']
+        if not cost_df.empty:
+            show_chart('budget_chart', pipeline['budget_chart'], timer)
+            
+            # Tabulka s detaily (kopie, cache sdílí všechny session)
+            cost_df = cost_df.copy()
+            cost_df['Průměr na hráče'] = cost_df['Cena'] / cost_df['Počet']
+            cost_df['Cena'] = cost_df['Cena'].round(1)
+            cost_df['Průměr na hráče'] = cost_df['Průměr na hráče'].round(1)
+            
+            st.dataframe(cost_df, use_container_width=True)
+        
+        # FPL pravidla reminder
+        st.subheader("📋 Připomenutí FPL pravidel 2025/26")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.success("**✅ Základní pravidla**")
+            st.write("""
+            • £100m budget celkem  
+            • 15 hráčů: 2 GK, 5 DEF, 5 MID, 3 FWD  
+            • Max 3 hráči z jednoho týmu  
+            • Starting XI: min 3 DEF, 2 MID, 1 FWD  
+            • 1 Free Transfer každý GW  
+            • Max 5 FT v bance  
+            """)
+            
+        with col2:
+            st.info("**🆕 Novinky 2025/26**")
+            st.write("""
+            • 2x každý chip v každé půlce  
+            • Defensive contributions body  
+            • Lepší Fantasy assist definice  
+            • GW16: Bonus 5 FT (AFCON)  
+            • Elite global ligy (Top 1% a 10%)  
+            • Adobe AI team badges  
+            """)
+
+    # Tab: Top hráči podle ceny
+    elif selected_tab == "Top hráči podle ceny":
+        st.header("💰 Nejlepší value za peníze - Nový start!")
+        st.markdown("Založeno na ceně, formě a transferové aktivitě pro sezónu 2025/26")
+        score_weights = pipeline['score_weights']
+        value_weights = tuned_weights(score_weights, 'value_score')
+        if value_weights:
+            weights_text = ", ".join(f"{name} {weight:.2f}" for name, weight in value_weights.items())
+            st.caption(f"⚖️ Váhy value skóre vyladěné na historii (verze {score_weights['version']} z {score_weights['created_at'][:10]}): {weights_text}")
+        
+        render_value_table(pipeline['player_table'])
+
+    # Tab: Fixture analýza
+    elif selected_tab == "Fixture analýza":
+        st.header("📅 Analýza nadcházejících zápasů")
+        
+        teams_dict = pipeline['teams']
+        fixture_matrix = pipeline['fixture_matrix']
+        if not fixture_matrix['count'].any():
+            st.warning("Data o zápasech nejsou k dispozici.")
+            return
+        
+        current_fixtures = pipeline['gameweek_fixtures']
+        
+        if not current_fixtures.empty:
+            st.subheader(f"⚽ Zápasy Gameweek {current_gw}")
+            
+            for fixture in current_fixtures.to_dict('records'):
+                col1, col2, col3 = st.columns([3, 1, 1])
+                
+                difficulty_color = get_difficulty_color(fixture['difficulty'])
+                
+                with col1:
+                    kickoff = fixture['kickoff']
+                    if pd.notna(kickoff):
+                        kickoff_time = kickoff.strftime('%d.%m %H:%M')
+                    else:
+                        kickoff_time = "TBD"
+                    
+                    st.markdown(f"""
+                    <div style='background: linear-gradient(135deg, #1e293b 0%, #334155 100%); 
+                                padding: 1rem; border-radius: 8px; border-left: 4px solid {difficulty_color};'>
+                        <h4 style='color: white; margin: 0;'>{fixture['home_team']} vs {fixture['away_team']}</h4>
+                        <p style='color: #cbd5e1; margin: 0.5rem 0 0 0;'>
+                            {kickoff_time} • Obtížnost: {fixture['difficulty']}/5
+                        </p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                
+                with col2:
+                    if fixture['difficulty'] <= 2:
+                        st.success("✅ Snadný")
+                    elif fixture['difficulty'] >= 4:
+                        st.error("❌ Těžký")
+                    else:
+                        st.info("➖ Střední")
+                
+                with col3:
+                    st.caption(f"🏠 Doma: {fixture['home_difficulty']}")
+                    st.caption(f"✈️ Venku: {fixture['away_difficulty']}")
+
+        # Team fixture difficulty
+        st.subheader("📊 Obtížnost fixtures podle týmů")
+        
+        fig = pipeline['difficulty_chart']
+        if fig is not None:
+            show_chart('difficulty_chart', fig, timer)
+        
+        # Přehled soupeřů na dalších 6 kol
+        st.subheader("🗓️ Fixture ticker (soupeř, H/A, FDR)")
+        st.dataframe(pipeline['fixture_ticker'], use_container_width=True)
+        
+        # Blank a double gameweeks ze zbytku sezóny
+        st.subheader("⚠️ Blank a double gameweeks")
+        special_gws = pipeline['special_gws']
+        if special_gws:
+            for gw, teams in special_gws.items():
+                parts = []
+                if teams['double']:
+                    parts.append("🟢 Double: " + ", ".join(teams_dict.get(t, '?') for t in teams['double']))
+                if teams['blank']:
+                    parts.append("🔴 Blank: " + ", ".join(teams_dict.get(t, '?') for t in teams['blank']))
+                st.write(f"**GW{gw}** • " + " • ".join(parts))
+        else:
+            st.info("Do konce sezóny zatím žádné blank ani double gameweeks.")
+        
+        if fixture_matrix['unscheduled']:
+            st.caption(f"📌 Odložené zápasy bez termínu: {len(fixture_matrix['unscheduled'])}")
+
+    # Tab: Transfer trendy
+    elif selected_tab == "Transfer trendy":
+        st.header("🔄 Transfer trendy a vlastnictví")
+        
+        st.subheader("📈 Přestupy hráčů")
+        render_table_fragment(
+            pipeline['player_table'], 'transfers',
+            ['Hráč', 'Tým', 'Pozice', 'Cena', 'Transfery IN', 'Transfery OUT', 'Čisté transfery', 'Vlastnictví'],
+            'Transfery IN'
+        )
+
+        # Transfer trends visualization  
+        st.subheader("📊 Transfer aktivita")
+        
+        fig = pipeline['transfers_chart']
+        if fig is not None:
+            show_chart('transfers_chart', fig, timer)
+
+    # Tab: Týmová analýza
+    elif selected_tab == "Týmová analýza":
+        st.header("🏟️ Analýza podle týmů")
+        
+        team_df = pipeline['team_ranking']
+        
+        if not team_df.empty:
+            st.subheader("🏆 Nejslibněji vypadající týmy pro sezónu 2025/26")
+            show_chart('team_chart', pipeline['team_chart'], timer)
+            
+            st.subheader("📋 Detaily týmů - Potenciál pro novou sezónu")
+            
+            display_df = team_df[['team', 'avg_prediction', 'total_value', 'top_player', 'top_prediction', 'most_selected', 'highest_selection']].copy()
+            display_df.columns = ['Tým', 'Průměrná predikce', 'Celková hodnota (£m)', 'Nejslibněji', 'Predikce top hráče', 'Nejvíc vlastněný', 'Vlastnictví %']
+            display_df['Průměrná predikce'] = display_df['Průměrná predikce'].round(1)
+            display_df['Celková hodnota (£m)'] = display_df['Celková hodnota (£m)'].round(1)
+            display_df['Predikce top hráče'] = display_df['Predikce top hráče'].round(1)
+            display_df['Vlastnictví %'] = display_df['Vlastnictví %'].round(1)
+            
+            st.dataframe(display_df, use_container_width=True)
+
+    timer.end(f"render:{selected_tab}")
+    show_performance_panel(timer, selected_tab)
+    show_startup_profile()
+    
+    # Footer
+    st.markdown("---")
+    st.markdown(f"""
+    <div style='text-align: center; color: #64748b; padding: 2rem;'>
+        <p>🏆 FPL Predictor - Sezóna 2025/26</p>
+        <p>🆕 Čerstvý start! Všichni hráči začínají s nulou</p>
+        <p>Poslední update: {datetime.now().strftime('%d.%m.%Y %H:%M:%S')} • Data se aktualizují každých 5 minut</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Společné pomůcky testů - falešné FPL API a malá syntetická data"""
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+import requests
+
+from fpl_predictor.players import process_players_data
+from fpl_predictor.snapshots import SnapshotStore, TIMESTAMP_FORMAT, KIND_BOOTSTRAP, KIND_FIXTURES
+
+
+def make_response(status, payload=None, headers=None):
+    """requests.Response bez sítě; payload se serializuje do JSON"""
+    response = requests.Response()
+    response.status_code = status
+    response._content = b'' if payload is None else json.dumps(payload).encode('utf-8')
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeSession:
+    """Session, která místo HTTP volá handler(endpoint, hlavičky) a eviduje požadavky"""
+
+    def __init__(self, handler, base_url='http://fpl.test/'):
+        self.handler = handler
+        self.base_url = base_url
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        endpoint = url[len(self.base_url):]
+        self.requests.append((endpoint, dict(headers or {})))
+        return self.handler(endpoint, headers or {})
+
+    def count(self, prefix):
+        return sum(1 for endpoint, _ in self.requests if endpoint.startswith(prefix))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(str(tmp_path / 'snapshots'))
+
+
+# Hráčů na tým podle element_type: 2 GK, 6 DEF, 6 MID, 4 FWD
+SQUAD_SHAPE = {1: 2, 2: 6, 3: 6, 4: 4}
+N_TEAMS = 20
+SEASON_START = datetime(2025, 8, 16, 10, 0)
+
+
+def deadline(gw):
+    """Deadline GW - sobota každý týden od 16. 8. 2025"""
+    return (SEASON_START + timedelta(weeks=gw - 1)).strftime(TIMESTAMP_FORMAT)
+
+
+def synthetic_bootstrap(current_gw=1, seed=0):
+    """Malý bootstrap-static se strukturou FPL API - 20 týmů po 18 hráčích"""
+    rng = np.random.default_rng(seed)
+    elements = []
+    for team in range(1, N_TEAMS + 1):
+        for element_type, count in SQUAD_SHAPE.items():
+            for _ in range(count):
+                pid = len(elements) + 1
+                elements.append({
+                    'id': pid, 'first_name': f"First{pid}", 'second_name': f"Second{pid}",
+                    'web_name': f"Player{pid}", 'team': team, 'team_code': 100 + team,
+                    'element_type': element_type, 'now_cost': int(rng.integers(40, 130)),
+                    'form': f"{rng.random() * 8:.1f}", 'selected_by_percent': f"{rng.random() * 40:.1f}",
+                    'news': '', 'status': 'a',
+                    'chance_of_playing_this_round': None, 'chance_of_playing_next_round': None,
+                    'minutes': int(rng.integers(0, 900)), 'transfers_in': int(rng.integers(0, 100000)),
+                    'transfers_out': int(rng.integers(0, 100000)), 'goals_scored': int(rng.integers(0, 8)),
+                    'assists': int(rng.integers(0, 6)), 'clean_sheets': int(rng.integers(0, 5)),
+                    'bonus': int(rng.integers(0, 10)), 'total_points': int(rng.integers(0, 80))
+                })
+    events = [
+        {
+            'id': gw, 'is_current': gw == current_gw, 'is_next': gw == current_gw + 1,
+            'finished': gw <= current_gw, 'deadline_time': deadline(gw),
+            'average_entry_score': 45 + gw % 7 if gw <= current_gw else 0,
+            'highest_score': 110 + gw % 13 if gw <= current_gw else None
+        }
+        for gw in range(1, 39)
+    ]
+    return {
+        'teams': [{'id': i, 'name': f"Team {i}", 'code': 100 + i} for i in range(1, N_TEAMS + 1)],
+        'element_types': [
+            {'id': 1, 'singular_name': 'Goalkeeper'}, {'id': 2, 'singular_name': 'Defender'},
+            {'id': 3, 'singular_name': 'Midfielder'}, {'id': 4, 'singular_name': 'Forward'}
+        ],
+        'elements': elements,
+        'events': events
+    }
+
+
+def synthetic_fixtures(finished_through=1, seed=0):
+    """Celá sezóna - každý tým jeden zápas v kole, náhodné FDR"""
+    rng = np.random.default_rng(seed)
+    fixtures = []
+    for gw in range(1, 39):
+        teams = rng.permutation(N_TEAMS) + 1
+        for home, away in zip(teams[::2], teams[1::2]):
+            fixtures.append({
+                'id': len(fixtures) + 1, 'event': gw, 'team_h': int(home), 'team_a': int(away),
+                'team_h_difficulty': int(rng.integers(2, 6)), 'team_a_difficulty': int(rng.integers(2, 6)),
+                'finished': gw <= finished_through, 'started': gw <= finished_through,
+                'kickoff_time': deadline(gw).replace('T10:', 'T15:')
+            })
+    return fixtures
+
+
+def synthetic_history(bootstrap, fixtures, seed=0):
+    """element-summary všech hráčů pro dohrané zápasy"""
+    rng = np.random.default_rng(seed)
+    history = {}
+    for player in bootstrap['elements']:
+        rows = []
+        for f in fixtures:
+            if not f['finished'] or player['team'] not in (f['team_h'], f['team_a']):
+                continue
+            minutes = int(rng.choice([0, 30, 90]))
+            rows.append({
+                'element': player['id'], 'fixture': f['id'], 'round': f['event'], 'minutes': minutes,
+                'total_points': int(rng.integers(0, 10)) if minutes else 0,
+                'goals_scored': int(rng.poisson(0.2)), 'assists': int(rng.poisson(0.1)),
+                'clean_sheets': int(rng.random() < 0.3), 'bonus': int(rng.integers(0, 3)),
+                'was_home': player['team'] == f['team_h'], 'value': player['now_cost']
+            })
+        history[str(player['id'])] = {'history': rows}
+    return history
+
+
+@pytest.fixture
+def bootstrap_data():
+    return synthetic_bootstrap()
+
+
+@pytest.fixture(scope='session')
+def players_df():
+    """Hráči syntetického bootstrapu po zpracování - sdílení, testy je nesmí měnit"""
+    return process_players_data(synthetic_bootstrap())
+
+
+@pytest.fixture
+def fixtures_data():
+    return synthetic_fixtures()
+
+
+@pytest.fixture
+def snapshot_store(store, bootstrap_data, fixtures_data):
+    """Úložiště s jedním snapshotem bootstrapu a fixtures"""
+    store.save(KIND_BOOTSTRAP, json.dumps(bootstrap_data).encode('utf-8'))
+    store.save(KIND_FIXTURES, json.dumps(fixtures_data).encode('utf-8'))
+    return store
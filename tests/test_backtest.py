@@ -0,0 +1,82 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import deadline, synthetic_bootstrap, synthetic_fixtures, synthetic_history
+from fpl_predictor import backtest, core
+from fpl_predictor.snapshots import TIMESTAMP_FORMAT, KIND_BOOTSTRAP, KIND_FIXTURES, KIND_ELEMENT_SUMMARY
+
+N_GAMEWEEKS = 3
+PARAMS = {'use_model': False, 'horizon': 2, 'budget': 200.0}
+
+
+def save(store, kind, data, fetched_at):
+    store.save(kind, json.dumps(data).encode('utf-8'), fetched_at=fetched_at)
+
+
+def day_before(gw):
+    return (datetime.strptime(deadline(gw), TIMESTAMP_FORMAT) - timedelta(days=1)).strftime(TIMESTAMP_FORMAT)
+
+
+@pytest.fixture
+def season_root(store):
+    """Snapshot den před deadlinem GW1-3, na konci bootstrap a historie po GW3"""
+    def build(drop_from_gw2=()):
+        for gw in range(1, N_GAMEWEEKS + 1):
+            bootstrap = synthetic_bootstrap(gw - 1)
+            if gw >= 2:
+                bootstrap['elements'] = [p for p in bootstrap['elements'] if p['id'] not in drop_from_gw2]
+            save(store, KIND_BOOTSTRAP, bootstrap, day_before(gw))
+            save(store, KIND_FIXTURES, synthetic_fixtures(gw - 1), day_before(gw))
+        final, fixtures = synthetic_bootstrap(N_GAMEWEEKS), synthetic_fixtures(N_GAMEWEEKS)
+        save(store, KIND_BOOTSTRAP, final, deadline(N_GAMEWEEKS + 1))
+        save(store, KIND_ELEMENT_SUMMARY, synthetic_history(final, fixtures), deadline(N_GAMEWEEKS + 1))
+        return store.root
+    return build
+
+
+def fixed_squad(ids, incomplete_in=()):
+    """Náhrada core.create_ai_team se známým kádrem (v GW z incomplete_in neúplným)"""
+    def create_ai_team(players_df, fixture_matrix, gw, *args, **kwargs):
+        squad = players_df[players_df['id'].isin(ids[:10] if gw in incomplete_in else ids)]
+        return {}, float(squad['price'].sum()), {'squad': squad, 'message': 'pevný kádr'}
+    return create_ai_team
+
+
+def first_of_each_position(n_per_position=(2, 5, 5, 3)):
+    elements = synthetic_bootstrap()['elements']
+    ids = []
+    for element_type, count in zip(range(1, 5), n_per_position):
+        ids.extend([p['id'] for p in elements if p['element_type'] == element_type][::3][:count])
+    return ids
+
+
+def test_replays_every_finished_gameweek(season_root):
+    result = backtest.backtest_season(season_root(), PARAMS)
+
+    table = result['gameweeks']
+    assert table['gw'].tolist() == [1, 2, 3]
+    assert result['skipped'] == {}
+    assert table['total'].iloc[-1] == table['points'].sum()
+    assert result['summary']['gameweeks'] == 3
+
+
+def test_incomplete_initial_squad_is_retried_next_gameweek(season_root, monkeypatch):
+    monkeypatch.setattr(core, 'create_ai_team', fixed_squad(first_of_each_position(), incomplete_in={1}))
+    result = backtest.backtest_season(season_root(), PARAMS)
+
+    assert list(result['skipped']) == [1]
+    assert result['gameweeks']['gw'].tolist() == [2, 3]
+
+
+def test_squad_player_missing_from_bootstrap_keeps_last_lineup(season_root, monkeypatch):
+    ids = first_of_each_position()
+    monkeypatch.setattr(core, 'create_ai_team', fixed_squad(ids))
+    result = backtest.backtest_season(season_root(drop_from_gw2={ids[0]}), PARAMS)
+
+    assert sorted(result['skipped']) == [2, 3]
+    table = result['gameweeks']
+    assert table['gw'].tolist() == [1, 2, 3]
+    assert table.loc[1:, 'transfers'].tolist() == [0, 0]
+    assert result['summary']['skipped'] == 2
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from fpl_predictor.chips import (
+    BENCH_BOOST, FREE_HIT, TRIPLE_CAPTAIN, WILDCARD, WILDCARD_HORIZON, plan_chips, remaining_chips, season_half
+)
+from fpl_predictor.optimizer import SQUAD_POSITIONS
+from fpl_predictor.planner import lineup_points, squad_slots
+
+GAMEWEEKS = list(range(15, 25))
+
+
+def pick_squad(players_df, skip=0):
+    """Kádr 2-5-5-3 z hráčů v pořadí tabulky (`skip` hráčů každé pozice vynechá)"""
+    ids = []
+    for position, count in SQUAD_POSITIONS.items():
+        ids += players_df.loc[players_df['position'] == position, 'id'].iloc[skip:skip + count].tolist()
+    return tuple(sorted(int(i) for i in ids))
+
+
+@pytest.fixture(scope='module')
+def points(players_df):
+    rng = np.random.default_rng(3)
+    return rng.uniform(0, 8, size=(len(players_df), len(GAMEWEEKS))).astype('float32')
+
+
+def test_remaining_chips_by_season_half():
+    assert len(remaining_chips(1)) == 8
+    assert {half for _, half in remaining_chips(20)} == {1}
+    assert remaining_chips(39) == []
+
+
+def test_each_chip_once_per_half_and_one_chip_per_gameweek(players_df, points):
+    squad = pick_squad(players_df)
+    plan = plan_chips(players_df, squad, points, GAMEWEEKS, 100.0, squads={})
+
+    played = [(chip['chip'], season_half(chip['gw'])) for chip in plan['chips']]
+    assert len(played) == len(set(played))
+    assert len({chip['gw'] for chip in plan['chips']}) == len(plan['chips'])
+    # Bez kádrů pro Wildcard a Free Hit zbývá Bench Boost a Triple Captain v obou polovinách
+    assert sorted(played) == sorted((chip, half) for chip in (BENCH_BOOST, TRIPLE_CAPTAIN) for half in (0, 1))
+    assert plan['total'] == pytest.approx(plan['baseline'] + sum(chip['gain'] for chip in plan['chips']), rel=1e-5)
+
+    # Triple Captain padne na kolo s nejvíc body kapitána v dané polovině
+    captain = points[squad_slots(players_df, squad)].max(axis=0)
+    for chip in plan['chips']:
+        if chip['chip'] == TRIPLE_CAPTAIN:
+            half_steps = [step for step, gw in enumerate(GAMEWEEKS) if season_half(gw) == season_half(chip['gw'])]
+            assert captain[GAMEWEEKS.index(chip['gw'])] == captain[half_steps].max()
+
+
+def test_played_chips_are_not_offered(players_df, points):
+    plan = plan_chips(players_df, pick_squad(players_df), points, GAMEWEEKS, 100.0,
+                      available=[(TRIPLE_CAPTAIN, 1)], squads={})
+    assert [(chip['chip'], season_half(chip['gw'])) for chip in plan['chips']] == [(TRIPLE_CAPTAIN, 1)]
+
+
+def test_free_hit_and_wildcard_use_given_squads(players_df, points):
+    squad, better = pick_squad(players_df), pick_squad(players_df, skip=5)
+    boosted = points.copy()
+    # Druhý kádr exceluje v GW17 (Free Hit) a od GW21 dál (Wildcard)
+    rows = squad_slots(players_df, better)
+    boosted[rows, GAMEWEEKS.index(17)] += 20
+    boosted[rows, GAMEWEEKS.index(21):] += 10
+    squads = {(FREE_HIT, 17): better, (WILDCARD, 21): better}
+
+    plan = plan_chips(players_df, squad, boosted, GAMEWEEKS, 100.0, available=[(FREE_HIT, 0), (WILDCARD, 1)],
+                      squads=squads)
+    chips = {chip['chip']: chip for chip in plan['chips']}
+    assert chips[FREE_HIT]['gw'] == 17 and chips[WILDCARD]['gw'] == 21
+
+    base, new = lineup_points(boosted[squad_slots(players_df, squad)]), lineup_points(boosted[rows])
+    step = GAMEWEEKS.index(17)
+    assert chips[FREE_HIT]['gain'] == pytest.approx(new[step] - base[step], rel=1e-5)
+    window = slice(GAMEWEEKS.index(21), GAMEWEEKS.index(21) + WILDCARD_HORIZON)
+    assert chips[WILDCARD]['gain'] == pytest.approx((new[window] - base[window]).sum(), rel=1e-5)
+    assert plan['squads'] is squads
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from conftest import synthetic_bootstrap, synthetic_fixtures
+from fpl_predictor import core
+from fpl_predictor.artifacts import ArtifactCache
+from fpl_predictor.core import get_current_gameweek, get_planning_gameweek
+
+
+def events(current, next_gw, finished_through):
+    return {'events': [
+        {'id': gw, 'is_current': gw == current, 'is_next': gw == next_gw, 'finished': gw <= finished_through}
+        for gw in range(1, 39)
+    ]}
+
+
+def test_planning_starts_after_played_current_gameweek():
+    # Mezi deadliny - GW5 je aktuální a dohraný, plánuje se od GW6
+    data = events(5, 6, 5)
+    assert get_current_gameweek(data) == 5
+    assert get_planning_gameweek(data) == 6
+
+
+def test_planning_before_season_and_at_season_end():
+    assert get_planning_gameweek(events(None, 1, 0)) == 1
+    assert get_planning_gameweek(events(38, None, 37)) == 38
+    assert get_planning_gameweek(None) == 1
+
+
+def test_new_weights_version_rescores_without_resolving_ai_team(monkeypatch):
+    solved = []
+    solve = core.create_ai_team
+
+    def counting_create_ai_team(*args, **kwargs):
+        solved.append(args[2])
+        return solve(*args, time_limit=5.0, **kwargs)
+
+    monkeypatch.setattr(core, 'create_ai_team', counting_create_ai_team)
+    cache = ArtifactCache()
+    bootstrap = {'id': 'b1', 'data': synthetic_bootstrap(current_gw=1)}
+    fixtures = {'id': 'f1', 'data': synthetic_fixtures(finished_through=1)}
+    weights = {'value_score': {'weights': {'form': 1.0}}}
+
+    first = core.build_pipeline(bootstrap, fixtures, cache, score_weights=None)
+    second = core.build_pipeline(bootstrap, fixtures, cache, score_weights=dict(weights, version=2))
+    assert first['ai_team'][2]['squad']['id'].tolist() == second['ai_team'][2]['squad']['id'].tolist()
+    assert solved == [2]
+
+    # Vyladěné váhy se projeví ve value skóre
+    predictions = second['player_predictions']
+    assert second['players']['value_score'].to_numpy() == pytest.approx(predictions['form'].to_numpy())
+    assert not np.allclose(first['players']['value_score'].to_numpy(), second['players']['value_score'].to_numpy())
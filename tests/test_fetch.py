@@ -0,0 +1,169 @@
+import json
+import threading
+import time
+
+from conftest import FakeSession, make_response
+from fpl_predictor import fetch
+from fpl_predictor.fetch import (
+    ENDPOINTS, BackgroundRefresher, RateLimiter, element_summary_endpoint, fetch_all, summarize_timings
+)
+from fpl_predictor.snapshots import SnapshotStore, KIND_BOOTSTRAP, KIND_ELEMENT_SUMMARY, KIND_FIXTURES
+
+BOOTSTRAP = {'elements': [{'id': 1}, {'id': 2}], 'events': []}
+SUMMARY = {'history': [{'round': 1, 'total_points': 2}], 'history_past': []}
+
+
+def history_raw(data):
+    return json.dumps(data, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+def make_refresher(store, handler, **options):
+    session = FakeSession(handler)
+    refresher = BackgroundRefresher(
+        store, session=session, base_url=session.base_url, limiter=RateLimiter(1000.0), **options
+    )
+    refresher.load_snapshots()
+    return refresher, session
+
+
+def test_conditional_request_reuses_payload_on_304(store):
+    def handler(endpoint, headers):
+        if headers.get('If-None-Match') == '"v1"':
+            return make_response(304)
+        return make_response(200, BOOTSTRAP, {'ETag': '"v1"'})
+
+    refresher, session = make_refresher(store, handler)
+    assert refresher.refresh(KIND_BOOTSTRAP)
+    first = refresher.get(KIND_BOOTSTRAP)
+
+    assert not refresher.refresh(KIND_BOOTSTRAP)
+    assert session.requests[-1][1]['If-None-Match'] == '"v1"'
+    assert refresher.get(KIND_BOOTSTRAP)['id'] == first['id']
+    assert len(store.entries(KIND_BOOTSTRAP)) == 1
+
+
+def test_validators_survive_restart(store):
+    refresher, _ = make_refresher(store, lambda endpoint, headers: make_response(200, BOOTSTRAP, {'ETag': '"v1"'}))
+    refresher.refresh(KIND_BOOTSTRAP)
+
+    restarted, session = make_refresher(store, lambda endpoint, headers: make_response(304))
+    assert not restarted.refresh(KIND_BOOTSTRAP)
+    assert session.requests[0][1]['If-None-Match'] == '"v1"'
+    assert restarted.get(KIND_BOOTSTRAP)['data'] == BOOTSTRAP
+
+
+def test_unchanged_history_is_not_refetched_every_cycle(store):
+    store.save(KIND_BOOTSTRAP, json.dumps(BOOTSTRAP).encode('utf-8'))
+    history = {'1': SUMMARY, '2': SUMMARY}
+    store.save(KIND_ELEMENT_SUMMARY, history_raw(history), fetched_at='2020-01-01T00:00:00Z')
+
+    refresher, session = make_refresher(store, lambda endpoint, headers: make_response(200, SUMMARY),
+                                        history_interval=3600)
+    assert refresher.history_due()
+    assert not refresher.refresh_history()
+    assert session.count('element-summary/') == 2
+
+    # Historie se nezměnila, fetched_at zůstává staré - další cyklus ji přesto stahovat nesmí
+    assert refresher.get(KIND_ELEMENT_SUMMARY)['fetched_at'] == '2020-01-01T00:00:00Z'
+    assert not refresher.history_due()
+
+
+def test_failed_history_refresh_waits_for_next_interval(store):
+    store.save(KIND_BOOTSTRAP, json.dumps(BOOTSTRAP).encode('utf-8'))
+    refresher, session = make_refresher(store, lambda endpoint, headers: make_response(500), history_interval=3600)
+
+    assert refresher.history_due()
+    assert not refresher.refresh_history()
+    assert refresher.last_error[KIND_ELEMENT_SUMMARY]
+    assert not refresher.history_due()
+
+
+def test_changed_history_is_stored(store):
+    store.save(KIND_BOOTSTRAP, json.dumps(BOOTSTRAP).encode('utf-8'))
+    refresher, _ = make_refresher(store, lambda endpoint, headers: make_response(200, SUMMARY), history_interval=3600)
+
+    assert refresher.refresh_history()
+    entry = store.latest(KIND_ELEMENT_SUMMARY)
+    assert store.load(KIND_ELEMENT_SUMMARY, entry['id']) == {'1': SUMMARY, '2': SUMMARY}
+
+
+def test_concurrent_refreshes_share_one_request(store):
+    started, release = threading.Event(), threading.Event()
+
+    def handler(endpoint, headers):
+        started.set()
+        release.wait(5)
+        return make_response(200, BOOTSTRAP, {'ETag': '"v1"'})
+
+    refresher, session = make_refresher(store, handler)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(refresher.refresh(KIND_BOOTSTRAP))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    assert started.wait(5)
+    # Ostatní vlákna mezitím čekají na běžící obnovu
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert session.count(ENDPOINTS[KIND_BOOTSTRAP]) == 1
+    assert results == [True] * 4
+    assert len(store.entries(KIND_BOOTSTRAP)) == 1
+
+
+def test_shared_refresher_is_one_per_store(store, monkeypatch):
+    monkeypatch.setattr(fetch, '_shared_refreshers', {})
+    session = FakeSession(lambda endpoint, headers: make_response(200, BOOTSTRAP))
+    options = {'interval': 3600, 'session': session, 'base_url': session.base_url, 'limiter': RateLimiter(1000.0)}
+
+    first = fetch.shared_refresher(store, **options)
+    try:
+        again = fetch.shared_refresher(SnapshotStore(store.root), history_interval=600, **options)
+        assert again is first
+        # Pozdější volání s historií ji u existujícího refresheru zapne
+        assert first.history_interval == 600
+    finally:
+        first.stop()
+
+
+def html_response(headers=None):
+    """200 s HTML stránkou místo JSON (chybová stránka proxy)"""
+    response = make_response(200, headers=headers)
+    response._content = b'<html>Service Unavailable</html>'
+    return response
+
+
+def test_malformed_summary_does_not_discard_the_refresh():
+    def handler(endpoint, headers):
+        if endpoint == element_summary_endpoint(2):
+            return html_response()
+        if endpoint.startswith('element-summary/'):
+            return make_response(200, SUMMARY)
+        return make_response(200, BOOTSTRAP if endpoint == ENDPOINTS[KIND_BOOTSTRAP] else [])
+
+    session = FakeSession(handler)
+    result = fetch_all(session, session.base_url, max_workers=4, limiter=RateLimiter(1000.0))
+
+    assert result[KIND_BOOTSTRAP] == BOOTSTRAP
+    assert result[KIND_FIXTURES] == []
+    assert list(result[KIND_ELEMENT_SUMMARY]) == [1]
+    errors = [t for t in result['timings'] if t.get('error')]
+    assert [t['endpoint'] for t in errors] == [element_summary_endpoint(2)]
+    assert summarize_timings(result['timings'])[-1]['errors'] == 1
+
+
+def test_malformed_payload_keeps_last_good_data(store):
+    responses = iter([
+        make_response(200, BOOTSTRAP, {'ETag': '"v1"'}), html_response({'ETag': '"broken"'}), make_response(304)
+    ])
+    refresher, session = make_refresher(store, lambda endpoint, headers: next(responses))
+    assert refresher.refresh(KIND_BOOTSTRAP)
+
+    assert not refresher.refresh(KIND_BOOTSTRAP)
+    assert refresher.last_error[KIND_BOOTSTRAP].startswith('Neplatný JSON')
+    assert refresher.get(KIND_BOOTSTRAP)['data'] == BOOTSTRAP
+    assert len(store.entries(KIND_BOOTSTRAP)) == 1
+    # ETag neplatného těla se nepřevezme - další dotaz se ptá na poslední dobrá data
+    refresher.refresh(KIND_BOOTSTRAP)
+    assert session.requests[-1][1]['If-None-Match'] == '"v1"'
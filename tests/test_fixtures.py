@@ -0,0 +1,73 @@
+from fpl_predictor.fixtures import (
+    blank_and_double_gameweeks, build_fixture_index, build_fixture_matrix, fixture_strips, gameweek_fixtures,
+    next_fixtures
+)
+
+
+def fixture(fixture_id, gw, home, away, finished=False, fdr=(2, 3)):
+    return {
+        'id': fixture_id, 'event': gw, 'team_h': home, 'team_a': away,
+        'team_h_difficulty': fdr[0], 'team_a_difficulty': fdr[1], 'finished': finished
+    }
+
+
+# GW1 odehraný, v GW2 má tým 1 double a tým 4 blank, jeden zápas je odložený bez GW
+FIXTURES = [
+    fixture(1, 1, 1, 2, finished=True),
+    fixture(2, 1, 3, 4, finished=True),
+    fixture(3, 2, 2, 1),
+    fixture(4, 2, 1, 3, fdr=(4, 5)),
+    fixture(5, 3, 4, 1),
+    fixture(6, 3, 2, 3),
+    fixture(7, None, 4, 2)
+]
+
+
+def test_matrix_marks_blank_double_and_unscheduled():
+    matrix = build_fixture_matrix(FIXTURES, n_teams=4, n_gameweeks=3)
+
+    assert matrix['count'][1, 2] == 2
+    assert matrix['count'][4, 2] == 0
+    assert matrix['opponent'][1, 2].tolist() == [2, 3, 0]
+    assert matrix['is_home'][1, 2].tolist() == [False, True, False]
+    assert matrix['fdr'][1, 2, 1] == 4 and matrix['fdr'][3, 2, 0] == 5
+    assert matrix['unscheduled'] == [(4, 2)]
+    assert blank_and_double_gameweeks(matrix, 2)[2] == {'blank': [4], 'double': [1]}
+
+
+def test_index_skips_finished_fixtures():
+    index = build_fixture_index(build_fixture_matrix(FIXTURES, n_teams=4, n_gameweeks=3))
+
+    # Aktuální GW1 je už dohraný - další zápasy začínají GW2
+    assert [(f['gw'], f['opponent_id']) for f in next_fixtures(index, 1, 1)] == [(2, 2), (2, 3), (3, 4)]
+    assert [f['gw'] for f in next_fixtures(index, 4, 1)] == [3]
+    assert next_fixtures(index, 4, 4) == []
+
+
+def test_strips_match_single_team_lookup():
+    index = build_fixture_index(build_fixture_matrix(FIXTURES, n_teams=4, n_gameweeks=3))
+    strips = fixture_strips(index, [1, 2, 3, 4], 1, n=3)
+
+    for row, team_id in enumerate([1, 2, 3, 4]):
+        expected = next_fixtures(index, team_id, 1, 3)
+        assert strips['valid'][row].sum() == len(expected)
+        assert strips['gw'][row, :len(expected)].tolist() == [f['gw'] for f in expected]
+        assert strips['fdr'][row, :len(expected)].tolist() == [f['difficulty'] for f in expected]
+    assert not strips['valid'][strips['gw'] == 1].any()
+
+
+def test_gameweek_fixtures_from_matrix():
+    fixtures = [dict(f) for f in FIXTURES]
+    fixtures[3]['kickoff_time'] = '2024-08-17T11:30:00Z'
+    matrix = build_fixture_matrix(fixtures, n_teams=4, n_gameweeks=3)
+    teams = {1: 'ARS', 2: 'AVL', 3: 'BOU', 4: 'BRE'}
+    table = gameweek_fixtures(matrix, teams, 2)
+
+    # Zápas se známým výkopem první, bez výkopu (TBD) na konci
+    assert table[['home_team', 'away_team']].values.tolist() == [['ARS', 'BOU'], ['AVL', 'ARS']]
+    assert table['home_difficulty'].tolist() == [4, 2]
+    assert table['away_difficulty'].tolist() == [5, 3]
+    assert table['difficulty'].tolist() == [4, 2]
+    assert table['kickoff'][0].strftime('%d.%m %H:%M') == '17.08 11:30'
+    assert table['kickoff'].isna().tolist() == [False, True]
+    assert gameweek_fixtures(matrix, teams, 4).empty
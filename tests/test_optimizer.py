@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from fpl_predictor.optimizer import SQUAD_POSITIONS, XI_LIMITS, XI_SIZE, dominated_players, solve_squad
+
+
+@pytest.mark.parametrize('budget, max_per_club', [(100.0, 3), (85.0, 2)])
+def test_squad_respects_fpl_rules(players_df, budget, max_per_club):
+    solution = solve_squad(players_df, budget, 'predicted_points', time_limit=5.0, max_per_club=max_per_club)
+    squad = solution['squad']
+
+    assert solution['optimal']
+    assert squad['position'].astype(str).value_counts().to_dict() == SQUAD_POSITIONS
+    assert solution['cost'] <= budget
+    assert solution['cost'] == pytest.approx(squad['price'].sum(), abs=0.05)
+    assert squad['team_id'].value_counts().max() <= max_per_club
+
+    starters = squad[squad['starter']]
+    assert len(starters) == XI_SIZE
+    for position, (low, high) in XI_LIMITS.items():
+        assert low <= (starters['position'] == position).sum() <= high
+    captain = squad[squad['captain']]
+    assert len(captain) == 1 and captain['starter'].all()
+    assert captain['predicted_points'].iloc[0] == starters['predicted_points'].max()
+
+
+def test_tighter_budget_never_scores_more(players_df):
+    rich = solve_squad(players_df, 100.0, time_limit=5.0)
+    poor = solve_squad(players_df, 80.0, time_limit=5.0)
+    assert poor['cost'] <= 80.0
+    assert poor['objective'] <= rich['objective'] + 1e-6
+
+
+def test_infeasible_budget_returns_empty_squad(players_df):
+    solution = solve_squad(players_df, 10.0, time_limit=5.0)
+    assert solution['squad'].empty
+    assert solution['objective'] is None
+    assert not solution['optimal']
+
+
+def test_dominated_needs_enough_dominating_clubs(players_df):
+    forwards = players_df[players_df['position'] == 'Forward'].reset_index(drop=True)
+    score = forwards['predicted_points'].to_numpy(dtype='float64')
+    price = np.rint(forwards['price'].to_numpy(dtype='float64') * 10)
+    # Nejdražší útočník s nejhorším skóre - dominuje ho každý ostatní
+    worst = int(np.argmax(price - score))
+    score[worst], price[worst] = score.min() - 1, price.max() + 1
+    assert dominated_players(forwards, score, price)[worst]
+    # Nejlepší útočník nemá nikoho lepšího
+    assert not dominated_players(forwards, score, price)[int(np.argmax(score))]
+    # Dominující ze dvou klubů nestačí - mohly by být plné
+    few = forwards[forwards['team_id'].isin([1, 2])].index.tolist() + [worst]
+    subset = forwards.loc[few].reset_index(drop=True)
+    assert not dominated_players(subset, score[few], price[few])[-1]
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from fpl_predictor.optimizer import MAX_PER_CLUB, SQUAD_POSITIONS, solve_squad
+from fpl_predictor.planner import HIT_COST, lineup_points, next_free_transfers, plan_transfers, squad_slots
+
+
+@pytest.fixture(scope='module')
+def squad_ids(players_df):
+    # Levný kádr, aby v bance zbylo na posily
+    solution = solve_squad(players_df, 85.0, time_limit=5.0)
+    return sorted(int(i) for i in solution['squad']['id'])
+
+
+def test_lineup_takes_best_valid_xi_and_doubles_captain():
+    # Sloty: 2 GK, 5 DEF, 5 MID, 3 FWD
+    points = np.array([5, 1, 4, 3, 2, 1, 0, 6, 5, 4, 3, 2, 7, 1, 0], dtype='float32')[:, None]
+    # GK 5 + DEF 4+3+2 + MID 6+5 + FWD 7 + nejlepší zbylí 4+3+2+1 + kapitán 7
+    assert lineup_points(points)[0] == 49
+
+
+def test_free_transfers_roll_over_up_to_the_cap():
+    assert next_free_transfers(1, 0, 5) == 2
+    assert next_free_transfers(5, 0, 5) == 5
+    assert next_free_transfers(2, 3, 5) == 1
+    # Před GW16 se kvůli AFCON doplní na 5
+    assert next_free_transfers(1, 1, 16) == 5
+
+
+def test_squad_slots_rejects_wrong_position_mix(players_df, squad_ids):
+    goalkeepers = players_df.loc[players_df['position'] == 'Goalkeeper', 'id']
+    extra_gk = int(goalkeepers[~goalkeepers.isin(squad_ids)].iloc[0])
+    forward = int(players_df.loc[players_df['id'].isin(squad_ids) & (players_df['position'] == 'Forward'), 'id'].iloc[0])
+    with pytest.raises(ValueError):
+        squad_slots(players_df, [i for i in squad_ids if i != forward] + [extra_gk])
+
+
+def replay(players_df, squad_ids, bank, free_transfers, plan):
+    """Projde kroky plánu a ověří pravidla FPL po každém GW"""
+    by_id = players_df.set_index('id')
+    squad, bank, ft = set(squad_ids), round(bank * 10), free_transfers
+    for step in plan['steps']:
+        assert step['free_transfers'] == ft
+        assert step['hits'] == max(len(step['transfers']) - ft, 0)
+        for out_id, in_id in step['transfers']:
+            assert out_id in squad and in_id not in squad
+            bank += round(by_id.loc[out_id, 'price'] * 10) - round(by_id.loc[in_id, 'price'] * 10)
+            squad = (squad - {out_id}) | {in_id}
+        assert bank >= 0 and step['bank'] == pytest.approx(bank / 10)
+        players = by_id.loc[sorted(squad)]
+        assert players['position'].astype(str).value_counts().to_dict() == SQUAD_POSITIONS
+        assert players['team_id'].value_counts().max() <= MAX_PER_CLUB
+        ft = next_free_transfers(ft, len(step['transfers']), step['gw'] + 1)
+    return squad
+
+
+def test_plan_keeps_squad_valid_and_beats_baseline(players_df, squad_ids):
+    gameweeks = [3, 4, 5, 6]
+    rng = np.random.default_rng(1)
+    points = rng.uniform(0, 6, size=(len(players_df), len(gameweeks))).astype('float32')
+
+    plan = plan_transfers(players_df, squad_ids, points, gameweeks, bank=15.0, free_transfers=1)
+
+    assert [step['gw'] for step in plan['steps']] == gameweeks
+    assert plan['total'] == pytest.approx(sum(step['expected_points'] for step in plan['steps']), abs=1e-3)
+    assert plan['total'] >= plan['baseline']
+    replay(players_df, squad_ids, 15.0, 1, plan)
+
+
+def test_hit_is_taken_only_when_it_pays(players_df, squad_ids):
+    gameweeks = [5]
+    points = np.zeros((len(players_df), 1), dtype='float32')
+    in_squad = players_df['id'].isin(squad_ids)
+    club_counts = players_df.loc[in_squad, 'team_id'].value_counts()
+    # Dvě levné posily z klubů s nejvýš jedním hráčem v kádru, každá za 20 bodů
+    open_club = ~players_df['team_id'].isin(club_counts[club_counts >= 2].index)
+    targets = [
+        players_df[~in_squad & open_club & (players_df['position'] == position)].sort_values('price').index[0]
+        for position in ['Midfielder', 'Forward']
+    ]
+    points[targets] = 20.0
+
+    plan = plan_transfers(players_df, squad_ids, points, gameweeks, bank=20.0, free_transfers=1)
+    step = plan['steps'][0]
+    assert sorted(in_id for _, in_id in step['transfers']) == sorted(players_df.loc[targets, 'id'].tolist())
+    assert step['hits'] == 1
+    # 20 + 20 + kapitán 20 - hit
+    assert step['expected_points'] == pytest.approx(60 - HIT_COST)
+    replay(players_df, squad_ids, 20.0, 1, plan)
+
+    # Za 3 body se hit nevyplatí (druhá posila + 3, hit - 4)
+    points[targets] = 3.0
+    step = plan_transfers(players_df, squad_ids, points, gameweeks, bank=20.0, free_transfers=1)['steps'][0]
+    assert len(step['transfers']) == 1 and step['hits'] == 0
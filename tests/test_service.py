@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+import pytest
+
+from fpl_predictor.service import PredictorService
+
+
+@pytest.fixture
+def service(snapshot_store):
+    service = PredictorService(snapshot_store, 'latest')
+    assert service.update_snapshot()
+    return service
+
+
+def get(service, target):
+    status, body = asyncio.run(service.dispatch('GET', target))
+    return status, json.loads(body)
+
+
+async def raw_request(service, request):
+    server = await service.start('127.0.0.1', 0)
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', server.sockets[0].getsockname()[1])
+        writer.write(request)
+        response = await reader.read()
+        writer.close()
+        return response
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def squad_by_shape(bootstrap, shape):
+    """Prvních N hráčů každé pozice z různých týmů"""
+    squad = []
+    for element_type, count in shape.items():
+        players = [p for p in bootstrap['elements'] if p['element_type'] == element_type]
+        squad.extend(p['id'] for p in players[::4][:count])
+    return squad
+
+
+def test_players_and_health(service):
+    status, body = get(service, '/players?position=MID&limit=5&sort=price')
+    assert status == 200
+    assert len(body['players']) == 5 and body['total'] == 120
+    assert {p['position'] for p in body['players']} == {'Midfielder'}
+    prices = [p['price'] for p in body['players']]
+    assert prices == sorted(prices, reverse=True)
+
+    status, body = get(service, '/health')
+    assert body['status'] == 'ok'
+
+
+def test_invalid_parameters_are_client_errors(service):
+    assert get(service, '/players?limit=abc')[0] == 400
+    assert get(service, '/players?sort=nonexistent')[0] == 400
+    assert get(service, '/plan?squad=1,2,3')[0] == 400
+    assert get(service, '/nowhere')[0] == 404
+
+
+def test_plan_rejects_wrong_position_mix(service, bootstrap_data):
+    # 15 platných hráčů, ale 3 GK a 2 FWD
+    squad = squad_by_shape(bootstrap_data, {1: 3, 2: 5, 3: 5, 4: 2})
+    status, body = get(service, '/plan?squad=' + ','.join(map(str, squad)))
+    assert status == 400
+    assert 'Goalkeeper' in body['error']
+
+
+def test_plan_for_valid_squad(service, bootstrap_data):
+    squad = squad_by_shape(bootstrap_data, {1: 2, 2: 5, 3: 5, 4: 3})
+    status, body = get(service, '/plan?squad=' + ','.join(map(str, squad)) + '&horizon=2&bank=1.0')
+    assert status == 200
+    assert body['planning_gameweek'] == 2
+    assert [step['gw'] for step in body['steps']] == [2, 3]
+
+
+def test_malformed_content_length_is_bad_request(service):
+    response = asyncio.run(raw_request(service, b"GET /health HTTP/1.1\r\nContent-Length: abc\r\n\r\n"))
+    assert response.startswith(b"HTTP/1.1 400 ")
+    assert b"Connection: close" in response
@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from conftest import synthetic_fixtures
+from fpl_predictor.fixtures import build_fixture_matrix
+from fpl_predictor.optimizer import solve_squad
+from fpl_predictor.simulation import _integer_percentiles, auto_subs, simulate_squad
+
+N_SIMS = 50_000
+# Sloty: GK 0, DEF 1-3, MID 4-7, FWD 8-10 v sestavě; lavička GK 11, MID 12, DEF 13, FWD 14
+POSITIONS = np.array(
+    ['Goalkeeper'] + ['Defender'] * 3 + ['Midfielder'] * 4 + ['Forward'] * 3
+    + ['Goalkeeper', 'Midfielder', 'Defender', 'Forward']
+)
+STARTERS = np.arange(11)
+BENCH = [11, 12, 13, 14]
+
+
+@pytest.fixture(scope='module')
+def squad(players_df):
+    solution = solve_squad(players_df, 100.0, time_limit=5.0)
+    return solution['squad'].assign(expected_points=solution['squad']['predicted_points'])
+
+
+@pytest.fixture(scope='module')
+def no_fixtures():
+    # Bez fixtures hraje každý tým jeden zápas s FDR 3 (násobitel 1)
+    return build_fixture_matrix([])
+
+
+def lineup(absent, bench_played=()):
+    """Body sestavy v jednom scénáři - hráč `i` má body 10 + i"""
+    points = (10 + np.arange(15))[None, :]
+    played = np.zeros((1, 15), dtype=bool)
+    played[0, STARTERS] = True
+    played[0, list(absent)] = False
+    played[0, list(bench_played)] = True
+    return int(auto_subs(points, played, STARTERS, BENCH, POSITIONS)[0])
+
+
+def test_auto_subs_keep_formation_minimums():
+    full = sum(10 + i for i in STARTERS)
+    # Chybí obránce při minimu 3 - záložník z lavičky nesmí, nastoupí obránce
+    assert lineup([1], [12, 13]) == full - 11 + 23
+    # Chybí záložník - nastoupí první hrající náhradník v poli
+    assert lineup([4], [12, 13]) == full - 14 + 22
+    # Chybí útočník (zbydou 2) - formaci udrží i záložník z lavičky
+    assert lineup([8], [12]) == full - 18 + 22
+    # Nikdo z lavičky nehrál - bez střídání
+    assert lineup([4]) == full - 14
+
+
+def test_goalkeeper_swaps_only_with_goalkeeper():
+    full = sum(10 + i for i in STARTERS)
+    assert lineup([0], [11]) == full - 10 + 21
+    # Brankář z lavičky nenahradí hráče v poli
+    assert lineup([4], [11]) == full - 14
+    # Hráč v poli nenahradí brankáře
+    assert lineup([0], [12]) == full - 10
+
+
+def test_integer_percentiles_match_numpy():
+    values = np.random.default_rng(0).integers(-5, 40, size=(10_001, 3))
+    for q in [5, 10, 25, 50, 75, 90, 95]:
+        expected = np.percentile(values, q, axis=0, method='inverted_cdf')
+        assert _integer_percentiles(values, [q])[0] == pytest.approx(expected)
+
+
+def test_simulated_means_match_projection(squad, no_fixtures):
+    result = simulate_squad(squad, no_fixtures, 6, N_SIMS)
+    # Predikce je nepodmíněná - riziko rotace se nesmí započítat podruhé
+    assert result['players']['mean_points'].to_numpy() == pytest.approx(
+        squad['predicted_points'].to_numpy(), rel=0.03
+    )
+
+
+def test_squad_mean_matches_xi_and_captain_when_everyone_plays(squad, no_fixtures):
+    # Všichni hrají celé zápasy - bez střídání a vice-kapitána je skóre sestava + kapitán
+    fit = squad.assign(chance_of_playing_next_round=100.0, minutes=90 * 5)
+    result = simulate_squad(fit, no_fixtures, 6, N_SIMS)
+
+    starters = fit[fit['starter']]
+    deterministic = starters['expected_points'].sum() + starters.loc[starters['captain'], 'expected_points'].sum()
+    assert result['players']['p_play'].min() == 1.0
+    assert result['squad']['mean'] == pytest.approx(deterministic, rel=0.02)
+
+
+def test_vice_captain_doubles_when_captain_is_out(squad, no_fixtures):
+    starters = squad.index[squad['starter']]
+    captain, vice = starters[0], starters[1]
+    # Kapitán s nejvyšším očekáváním nenastoupí, vice-kapitán je druhý nejlepší
+    injured = squad.copy()
+    injured.loc[captain, 'expected_points'] = 100.0
+    injured.loc[vice, 'expected_points'] = 99.0
+    injured.loc[captain, 'chance_of_playing_next_round'] = 0.0
+    result = simulate_squad(injured, no_fixtures, 6, N_SIMS)
+
+    captains = result['captains'].set_index('id')
+    out, backup = captains.loc[squad.loc[captain, 'id']], captains.loc[squad.loc[vice, 'id']]
+    assert out['captain_mean'] == 0
+    # Za nenastoupivšího kapitána se zdvojí vice-kapitán - stejné skóre jako s ním jako kapitánem
+    assert out['team_mean'] == pytest.approx(backup['team_mean'])
+
+
+def test_blank_gameweek_returns_empty_result(squad):
+    fixtures = [f for f in synthetic_fixtures() if f['event'] != 5]
+    result = simulate_squad(squad, build_fixture_matrix(fixtures), 5, N_SIMS)
+    assert result['squad'] is None and result['histogram'] is None
+    assert result['captains'].empty
+    assert (result['players']['p_play'] == 0).all()
+
+
+def test_fixed_seed_is_reproducible(squad, no_fixtures):
+    first = simulate_squad(squad, no_fixtures, 6, 20_000, seed=7)
+    again = simulate_squad(squad, no_fixtures, 6, 20_000, seed=7)
+    other = simulate_squad(squad, no_fixtures, 6, 20_000, seed=8)
+    assert first['squad'] == again['squad']
+    assert first['captains'].equals(again['captains'])
+    assert first['squad']['mean'] != other['squad']['mean']
@@ -0,0 +1,37 @@
+import os
+
+from fpl_predictor.snapshots import SnapshotStore, content_hash, KIND_BOOTSTRAP, KIND_FIXTURES
+
+
+def test_same_content_is_stored_once_but_logged_per_fetch(store):
+    first = store.save(KIND_BOOTSTRAP, b'{"a": 1}', fetched_at='2025-08-01T10:00:00Z')
+    again = store.save(KIND_BOOTSTRAP, b'{"a": 1}', fetched_at='2025-08-02T10:00:00Z')
+
+    assert first['id'] == again['id'] == content_hash(b'{"a": 1}')
+    assert os.listdir(os.path.join(store.root, KIND_BOOTSTRAP)) == [f"{first['id']}.json.gz"]
+    assert [e['fetched_at'] for e in store.entries(KIND_BOOTSTRAP)] == ['2025-08-01T10:00:00Z', '2025-08-02T10:00:00Z']
+    assert store.load(KIND_BOOTSTRAP, first['id']) == {'a': 1}
+
+
+def test_latest_and_find_replay_past_state(store):
+    old = store.save(KIND_BOOTSTRAP, b'{"gw": 1}', fetched_at='2025-08-01T10:00:00Z')
+    new = store.save(KIND_BOOTSTRAP, b'{"gw": 2}', fetched_at='2025-08-08T10:00:00Z')
+    store.save(KIND_FIXTURES, b'[]', fetched_at='2025-08-09T10:00:00Z', validators={'ETag': '"x"'})
+
+    assert store.latest(KIND_BOOTSTRAP)['id'] == new['id']
+    assert store.latest(KIND_BOOTSTRAP, at='2025-08-05T00:00:00Z')['id'] == old['id']
+    assert store.latest(KIND_BOOTSTRAP, at='2025-07-01T00:00:00Z') is None
+    assert store.find(KIND_BOOTSTRAP, old['id'][:6])['fetched_at'] == old['fetched_at']
+    assert store.find(KIND_FIXTURES, old['id']) is None
+    assert store.latest(KIND_FIXTURES)['validators'] == {'ETag': '"x"'}
+
+
+def test_truncated_manifest_line_is_skipped(store):
+    saved = store.save(KIND_BOOTSTRAP, b'{}', fetched_at='2025-08-01T10:00:00Z')
+    # Pád procesu uprostřed zápisu řádku manifestu
+    with open(os.path.join(store.root, 'manifest.jsonl'), 'a', encoding='utf-8') as f:
+        f.write('{"kind": "bootstrap", "id": "ab')
+
+    reopened = SnapshotStore(store.root)
+    assert [e['id'] for e in reopened.entries()] == [saved['id']]
+    assert reopened.entries(KIND_FIXTURES) == []
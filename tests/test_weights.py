@@ -0,0 +1,50 @@
+import json
+
+from fpl_predictor.weights import (
+    CONFIG_NAME, load_score_weights, save_score_weights, tuned_weights, weights_path
+)
+from fpl_predictor.xp_model import MODEL_DIR
+
+
+def tuning_result(weights):
+    return {
+        'weights': weights, 'weights_ci': {}, 'objective': 1.0, 'objective_ci': [0.9, 1.1], 'baseline': 0.8,
+        'uplift_ci': [0.1, 0.3], 'p_better': 0.9, 'samples': 100, 'gameweeks': 10
+    }
+
+
+def test_each_save_is_a_new_version_and_keeps_untuned_scores(tmp_path):
+    path = weights_path(str(tmp_path))
+    first = save_score_weights(path, {'value_score': tuning_result({'price': 1.0})}, seasons=['2024-25'])
+    second = save_score_weights(path, {'value_score': tuning_result({'form': 0.5})})
+    # value_score se potřetí neladilo - převezme se z verze 2
+    third = save_score_weights(path, {})
+
+    assert (first['version'], second['version'], third['version']) == (1, 2, 3)
+    loaded = load_score_weights(path)
+    assert loaded['version'] == 3
+    assert tuned_weights(loaded, 'value_score') == {'form': 0.5}
+
+    # Starší verze zůstávají vedle pro návrat
+    directory = tmp_path / MODEL_DIR
+    older = load_score_weights(str(directory / f"{CONFIG_NAME}.v1.json"))
+    assert tuned_weights(older, 'value_score') == {'price': 1.0}
+    assert (directory / f"{CONFIG_NAME}.v2.json").exists()
+
+
+def test_scores_no_longer_tuned_are_not_carried_over(tmp_path):
+    path = tmp_path / 'score_weights.json'
+    path.write_text(json.dumps({'format': 1, 'version': 4, 'ai_score': {'weights': {'form': 1.0}}}))
+    config = save_score_weights(str(path), {'value_score': tuning_result({'price': 1.0})})
+    assert config['version'] == 5
+    assert 'ai_score' not in load_score_weights(str(path))
+
+
+def test_missing_or_foreign_config_falls_back_to_defaults(tmp_path):
+    path = tmp_path / 'score_weights.json'
+    assert load_score_weights(str(path)) is None
+    path.write_text(json.dumps({'format': 99, 'version': 3}))
+    assert load_score_weights(str(path)) is None
+    path.write_text('{"format": 1, "vers')
+    assert load_score_weights(str(path)) is None
+    assert tuned_weights(None, 'value_score') is None
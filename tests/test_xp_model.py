@@ -0,0 +1,69 @@
+import numpy as np
+
+from conftest import synthetic_bootstrap, synthetic_fixtures, synthetic_history
+from fpl_predictor.fixtures import build_fixture_matrix
+from fpl_predictor.players import process_players_data
+from fpl_predictor.xp_model import XPModel, history_frame, train_xp_model
+
+
+def season(finished_through, postponed=None):
+    """Bootstrap, fixtures a historie; `postponed` = id zápasu, který ještě není dohraný"""
+    bootstrap = synthetic_bootstrap(finished_through)
+    fixtures = synthetic_fixtures(finished_through)
+    for f in fixtures:
+        if f['id'] == postponed:
+            f['finished'] = False
+    return bootstrap, fixtures, synthetic_history(bootstrap, fixtures)
+
+
+def test_round_pending_on_postponed_match_is_learned_later(tmp_path):
+    path = str(tmp_path / 'xp_model.npz')
+    # GW2 čeká na jeden zápas, GW3 je dohraný
+    bootstrap, fixtures, history = season(3, postponed=11)
+    players_df = process_players_data(bootstrap)
+    model = train_xp_model(history, fixtures, players_df, path)
+    assert model.learned_rounds == {1, 3}
+
+    bootstrap, fixtures, history = season(3)
+    model = train_xp_model(history, fixtures, players_df, path)
+    assert model.learned_rounds == {1, 2, 3}
+    assert XPModel.load(path).learned_rounds == {1, 2, 3}
+
+
+def test_incremental_training_learns_only_new_rounds(tmp_path):
+    path = str(tmp_path / 'xp_model.npz')
+    bootstrap, fixtures, history = season(4)
+    players_df = process_players_data(bootstrap)
+    frame = history_frame(history, fixtures)
+    positions = players_df.set_index('id')['position'].astype(str)
+
+    model = XPModel('2025')
+    assert model.update(frame, positions, {1, 2, 3}) == 3
+    assert model.update(frame, positions, {1, 2, 3}) == 0
+    model.save(path)
+
+    # Po načtení z disku pokračuje jen kolem 4
+    model = XPModel.load(path)
+    assert model.learned_rounds == {1, 2, 3}
+    assert model.update(frame, positions, {1, 2, 3, 4}) == 1
+
+    full = XPModel('2025')
+    full.update(frame, positions, {1, 2, 3, 4})
+    np.testing.assert_allclose(model.weights, full.weights)
+    assert model.trained_through == 4
+
+
+def test_prediction_does_not_grow_shared_state():
+    bootstrap, fixtures, history = season(3)
+    players_df = process_players_data(bootstrap)
+    model = XPModel('2025')
+    model.update(history_frame(history, fixtures), players_df.set_index('id')['position'].astype(str), {1, 2, 3})
+    size = len(model.state['count'])
+
+    # Nový hráč s vyšším id, kterého model ještě neviděl
+    newcomer = players_df.iloc[[0]].assign(id=size + 50)
+    predicted = model.predict_match(newcomer)
+    points, gameweeks = model.project(newcomer, build_fixture_matrix(fixtures), 4, 3)
+
+    assert len(model.state['count']) == size
+    assert predicted.shape == (1,) and points.shape == (1, 3) and gameweeks == [4, 5, 6]